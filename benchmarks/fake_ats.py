@@ -0,0 +1,259 @@
+# benchmarks/fake_ats.py
+"""
+Local HTTP stand-in for the job boards the scrapers talk to.
+
+http_client.set_url_rewrite() maps https://<host>/<path> onto
+http://127.0.0.1:<port>/<host>/<path>, and this server answers by host with
+responses shaped like the real APIs:
+
+  boards-api.greenhouse.io   GET  /v1/boards/<org>/jobs
+  api.lever.co               GET  /v0/postings/<org>?mode=json
+  *.myworkdayjobs.com        POST /wday/cxs/<tenant>/<site>/jobs   (limit <= 20, paged)
+  careers.mheducation.com    GET  /api/jobs?...&page=N              (10 per page)
+  jobs.dayforcehcm.com       GET  /en-US/k12l/...                   (__NEXT_DATA__ page)
+  anything else              GET  careers listing page + /jobs/<i> detail pages (ETag)
+
+Every board has `jobs_per_board` postings. `latency` seconds are added to
+each response, and `error_rate` of requests get a 503 (or 429 with
+Retry-After: 0), so retries show up in the numbers.
+"""
+import html
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+TITLES = [
+    "Senior Data Scientist", "Machine Learning Engineer", "Psychometrician",
+    "Learning Analytics Researcher", "Account Executive", "Product Designer",
+    "Software Engineer, Backend", "Customer Success Manager", "Assessment Specialist",
+    "Quantitative Researcher", "Curriculum Writer", "Data Engineer",
+]
+LOCATIONS = ["Remote, USA", "New York, NY", "Boston, MA", "Austin, TX", "Chicago, IL"]
+PARAGRAPH = ("You will design experiments, build models with Python and SQL, and work "
+             "with product teams to measure learning outcomes for millions of students. ")
+SENTENCES = [
+    "Partner with curriculum teams to evaluate new reading programs.",
+    "Own dashboards that track engagement across districts and schools.",
+    "Build forecasting models for subscription renewals and churn.",
+    "Design item response theory calibrations for adaptive assessments.",
+    "Ship recommendation features used by teachers every morning.",
+    "Run A/B tests on onboarding flows and report the results to leadership.",
+    "Maintain data pipelines in Airflow, dbt and Snowflake.",
+    "Mentor junior analysts and review their SQL and notebooks.",
+    "Present findings to sales, marketing and executive audiences.",
+    "Research fairness of scoring models across student subgroups.",
+    "Write clear documentation and contribute to our style guides.",
+    "Collaborate with engineers to deploy models behind APIs.",
+]
+EEO = ("We are an equal opportunity employer and do not discriminate on the basis of "
+       "race, color, religion, sex, national origin, age, disability or veteran status.")
+
+WORKDAY_MAX_LIMIT = 20
+MCGRAW_PAGE_SIZE = 10
+
+
+def _title(i: int) -> str:
+    return f"{TITLES[i % len(TITLES)]} {i // len(TITLES) + 1}"
+
+
+def _description_html(i: int) -> str:
+    rng = random.Random(i)   # same text for the same posting on every request
+    body = " ".join(rng.sample(SENTENCES, 6))
+    return (f"<h2>About the role</h2><p>{body} {PARAGRAPH}</p><h3>Requirements</h3><ul>"
+            + "".join(f"<li>Skill {k} for posting {i}</li>" for k in range(6))
+            + f"</ul><h3>Our Benefits</h3><ul><li>Health</li><li>401k</li></ul><p>{EEO}</p>")
+
+
+class FakeATS:
+    def __init__(self, jobs_per_board: int = 200, latency: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0):
+        self.jobs_per_board = jobs_per_board
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests: Counter = Counter()   # host -> request count
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    # ---- lifecycle -------------------------------------------------------
+    def start(self) -> "FakeATS":
+        ats = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive, like the real sites
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                ats._handle(self, "GET")
+
+            def do_POST(self):
+                ats._handle(self, "POST")
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    @property
+    def base(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def rewrite(self, url: str) -> str:
+        """https://host/path -> http://127.0.0.1:port/host/path"""
+        parsed = urlparse(url)
+        rest = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+        return f"{self.base}/{parsed.netloc}{rest}"
+
+    def total_requests(self) -> int:
+        with self._lock:
+            return sum(self.requests.values())
+
+    # ---- dispatch --------------------------------------------------------
+    def _handle(self, req: BaseHTTPRequestHandler, method: str) -> None:
+        host, _, rest = req.path.lstrip("/").partition("/")
+        parsed = urlparse("/" + rest)
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        body = b""
+        if method == "POST":
+            body = req.rfile.read(int(req.headers.get("Content-Length") or 0))
+
+        with self._lock:
+            self.requests[host] += 1
+            fail = self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            if self._rng.random() < 0.5:
+                return self._send(req, 429, b"slow down", "text/plain", {"Retry-After": "0"})
+            return self._send(req, 503, b"unavailable", "text/plain")
+
+        status, payload, ctype, headers = self._route(host, parsed.path, query, body, req)
+        self._send(req, status, payload, ctype, headers)
+
+    @staticmethod
+    def _send(req, status: int, payload: bytes, ctype: str,
+              headers: Optional[Dict[str, str]] = None) -> None:
+        req.send_response(status)
+        req.send_header("Content-Type", ctype)
+        req.send_header("Content-Length", str(len(payload)))
+        for k, v in (headers or {}).items():
+            req.send_header(k, v)
+        req.end_headers()
+        req.wfile.write(payload)
+
+    def _route(self, host: str, path: str, query: Dict[str, str], body: bytes,
+               req) -> Tuple[int, bytes, str, Dict[str, str]]:
+        if host == "boards-api.greenhouse.io":
+            return self._json(self.greenhouse(path.split("/")[3]))
+        if host == "api.lever.co":
+            return self._json(self.lever(path.split("/")[3]))
+        if host.endswith("myworkdayjobs.com"):
+            return self.workday(host, json.loads(body or b"{}"))
+        if host == "careers.mheducation.com":
+            return self._json(self.mcgraw(int(query.get("page", 1)), query.get("keywords")))
+        if host == "jobs.dayforcehcm.com":
+            return 200, self.savvas().encode(), "text/html", {}
+        return self.careers(host, path, req.headers.get("If-None-Match"))
+
+    @staticmethod
+    def _json(data: Any) -> Tuple[int, bytes, str, Dict[str, str]]:
+        return 200, json.dumps(data).encode(), "application/json", {}
+
+    # ---- boards ----------------------------------------------------------
+    def greenhouse(self, org: str) -> Dict[str, Any]:
+        return {"jobs": [{
+            "id": 4000000 + i,
+            "title": _title(i),
+            "location": {"name": LOCATIONS[i % len(LOCATIONS)]},
+            "absolute_url": f"https://boards.greenhouse.io/{org}/jobs/{4000000 + i}",
+            "content": html.escape(_description_html(i)),
+        } for i in range(self.jobs_per_board)]}
+
+    def lever(self, org: str) -> List[Dict[str, Any]]:
+        return [{
+            "id": f"{org}-{i:05d}",
+            "text": _title(i),
+            "categories": {"location": LOCATIONS[i % len(LOCATIONS)], "team": "Data",
+                           "commitment": "Full-time"},
+            "hostedUrl": f"https://jobs.lever.co/{org}/{i:05d}",
+            "descriptionPlain": PARAGRAPH * 4 + EEO,
+        } for i in range(self.jobs_per_board)]
+
+    def workday(self, host: str, payload: Dict[str, Any]):
+        limit, offset = int(payload.get("limit", 20)), int(payload.get("offset", 0))
+        if limit > WORKDAY_MAX_LIMIT:
+            return 400, b'{"errorCode":"HTTP_400"}', "application/json", {}
+        ids = range(self.jobs_per_board)
+        text = (payload.get("searchText") or "").lower()
+        if text:
+            ids = [i for i in ids if text in _title(i).lower()]
+        page = list(ids)[offset:offset + limit]
+        return self._json({
+            "total": len(ids),
+            "jobPostings": [{
+                "title": _title(i),
+                "externalPath": f"/job/{LOCATIONS[i % len(LOCATIONS)].split(',')[0]}/R{i:06d}",
+                "locationsText": LOCATIONS[i % len(LOCATIONS)],
+                "postedOn": "Posted 3 Days Ago",
+                "bulletFields": [f"R{i:06d}"],
+            } for i in page],
+            "facets": [{"facetParameter": "locations"}, {"facetParameter": "jobFamilyGroup"}],
+        })
+
+    def mcgraw(self, page: int, keywords: Optional[str]) -> Dict[str, Any]:
+        ids = range(self.jobs_per_board)
+        if keywords:
+            ids = [i for i in ids if keywords.lower() in _title(i).lower()]
+        start = (page - 1) * MCGRAW_PAGE_SIZE
+        return {"jobs": [{"data": {
+            "req_id": f"MH{i:06d}",
+            "title": _title(i),
+            "full_location": LOCATIONS[i % len(LOCATIONS)],
+            "apply_url": f"https://careers.mheducation.com/jobs/{i}",
+            "description": _description_html(i),
+        }} for i in list(ids)[start:start + MCGRAW_PAGE_SIZE]]}
+
+    def savvas(self) -> str:
+        postings = [{"jobPostingId": 9000 + i, "title": _title(i),
+                     "shortLocation": LOCATIONS[i % len(LOCATIONS)],
+                     "canonical_url": f"https://jobs.dayforcehcm.com/en-US/k12l/jobs/{9000 + i}",
+                     "description": _description_html(i)}
+                    for i in range(self.jobs_per_board)]
+        data = {"props": {"pageProps": {"dehydratedState": {"queries": [
+            {"state": {"data": {"jobPostings": postings}}}]}}}}
+        cards = "".join(f'<h2 test-id="job-title">{p["title"]}</h2>' for p in postings)
+        return (f"<html><head><title>Careers</title></head><body>{cards}"
+                f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>'
+                f"</body></html>")
+
+    def careers(self, host: str, path: str, etag: Optional[str]):
+        parts = path.strip("/").split("/")
+        if len(parts) >= 2 and parts[-2] == "jobs" and parts[-1].isdigit():
+            i = int(parts[-1])
+            tag = f'"{host}-{i}"'
+            if etag == tag:
+                return 304, b"", "text/html", {"ETag": tag}
+            page = (f"<html><body><nav>Home | Careers</nav><main><h1>{_title(i)}</h1>"
+                    f"{_description_html(i)}</main><footer>© Example</footer></body></html>")
+            return 200, page.encode(), "text/html", {"ETag": tag}
+        rows = "".join(
+            f'<li><a href="/jobs/{i}">{_title(i)}</a><span>{LOCATIONS[i % len(LOCATIONS)]}</span></li>'
+            for i in range(self.jobs_per_board)
+        )
+        page = f"<html><body><nav><a href='/about'>About</a></nav><ul>{rows}</ul></body></html>"
+        return 200, page.encode(), "text/html", {}
@@ -0,0 +1,94 @@
+# benchmarks/html_parse.py
+"""
+Parse time of the old path (full BeautifulSoup tree, "html.parser") vs. the
+fast path in html_parse.py (lxml + SoupStrainer, regex for __NEXT_DATA__).
+
+    python benchmarks/html_parse.py [saved_page.html ...]
+
+Saved pages are classified by content (a __NEXT_DATA__ script -> Savvas,
+otherwise a generic link listing). With no arguments, synthetic pages of
+realistic size stand in for them.
+"""
+import json
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_parse import LINKS, PARSER, extract_next_data, parse_html  # noqa: E402
+
+FILLER = ('<div class="card"><p>' + "We build learning tools for classrooms. " * 6
+          + '</p><span class="tag">Benefits</span><img src="/x.png" alt=""></div>')
+
+
+def listing_page(n_jobs: int = 600) -> str:
+    rows = "".join(
+        f'<li class="job"><a href="/careers/job/{i}">Data Scientist {i}</a>'
+        f'<div class="loc">Remote</div>{FILLER}</li>'
+        for i in range(n_jobs)
+    )
+    return f"<html><head><title>Careers</title></head><body><ul>{rows}</ul></body></html>"
+
+
+def next_data_page(n_jobs: int = 600) -> str:
+    data = {"props": {"pageProps": {"dehydratedState": {"queries": [{"state": {"data": {
+        "jobPostings": [{"jobPostingId": i, "title": f"Data Scientist {i}",
+                         "shortLocation": "Remote", "description": "Lorem ipsum " * 50}
+                        for i in range(n_jobs)]}}}]}}}}
+    body = "".join(f'<h2 test-id="job-title">Data Scientist {i}</h2>{FILLER}' for i in range(n_jobs))
+    return (f"<html><head><script>var x=1;</script></head><body>{body}"
+            f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(data)}</script>'
+            f"</body></html>")
+
+
+def old_links(text):
+    return len(BeautifulSoup(text, "html.parser").find_all("a", href=True))
+
+
+def new_links(text):
+    return len(parse_html(text, LINKS).find_all("a", href=True))
+
+
+def old_next_data(text):
+    tag = BeautifulSoup(text, "html.parser").find("script", id="__NEXT_DATA__")
+    return len(json.loads(tag.string)["props"])
+
+
+def new_next_data(text):
+    return len(extract_next_data(text)["props"])
+
+
+def bench(fn, text, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def main():
+    if len(sys.argv) > 1:
+        pages = []
+        for path in sys.argv[1:]:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                pages.append((os.path.basename(path), f.read()))
+    else:
+        pages = [("synthetic listing", listing_page()), ("synthetic savvas", next_data_page())]
+
+    print(f"fast path parser: {PARSER}")
+    print(f"{'page':<24} {'size':>8} {'old':>9} {'new':>9} {'speedup':>8}")
+    for label, text in pages:
+        if "__NEXT_DATA__" in text:
+            old, new = bench(old_next_data, text), bench(new_next_data, text)
+        else:
+            old, new = bench(old_links, text), bench(new_links, text)
+        print(f"{label[:24]:<24} {len(text) // 1024:>6}KB {old * 1000:>7.1f}ms "
+              f"{new * 1000:>7.1f}ms {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
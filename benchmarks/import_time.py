@@ -0,0 +1,85 @@
+# benchmarks/import_time.py
+"""
+Startup cost of the CLI, from `python -X importtime`.
+
+    python benchmarks/import_time.py                 # import main
+    python benchmarks/import_time.py --module llm_ranker --top 15
+    python benchmarks/import_time.py --budget-ms 300 # exit 1 when over budget
+
+Each run is a fresh interpreter, so nothing is cached in sys.modules; the
+best of --repeat runs is reported to smooth out disk cache noise. Prints the
+slowest modules by cumulative and by self time, then the total. The total
+is the cumulative time of the top-level import, i.e. what `python main.py
+<command>` spends before any stage starts.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+# import time:     self [us] |  cumulative | imported package
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)")
+
+
+def measure(module: str) -> Tuple[int, Dict[str, Tuple[int, int]]]:
+    """(total µs, {module: (self µs, cumulative µs)}) for one fresh import of `module`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(f"[ERROR] import {module} failed:\n{proc.stderr[-2000:]}")
+    modules: Dict[str, Tuple[int, int]] = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if not m:
+            continue
+        own, cumulative, indent, name = int(m.group(1)), int(m.group(2)), m.group(3), m.group(4)
+        modules[name] = (own, cumulative)
+        if name == module and len(indent) == 1:
+            total = cumulative
+    return total, modules
+
+
+def top(modules: Dict[str, Tuple[int, int]], key: int, n: int) -> List[Tuple[str, int]]:
+    ranked = sorted(modules.items(), key=lambda kv: kv[1][key], reverse=True)
+    return [(name, times[key]) for name, times in ranked[:n]]
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--module", default="main", help="module to import (default: main)")
+    ap.add_argument("--repeat", type=int, default=3, help="fresh interpreters to run; best one is reported")
+    ap.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    ap.add_argument("--budget-ms", type=float, help="fail when the import takes longer than this")
+    return ap.parse_args()
+
+
+def main_cli() -> None:
+    args = parse_args()
+    total, modules = min((measure(args.module) for _ in range(max(1, args.repeat))),
+                         key=lambda r: r[0])
+
+    print(f"Slowest imports under `import {args.module}` (cumulative ms):")
+    for name, us in top(modules, 1, args.top):
+        print(f"  {us / 1000:8.1f}  {name}")
+    print("Slowest modules on their own (self ms):")
+    for name, us in top(modules, 0, args.top):
+        print(f"  {us / 1000:8.1f}  {name}")
+    print(f"import {args.module}: {total / 1000:.1f} ms ({len(modules)} modules)")
+
+    if args.budget_ms is not None:
+        if total / 1000 > args.budget_ms:
+            print(f"[ERROR] over the {args.budget_ms:g} ms budget")
+            sys.exit(1)
+        print(f"[INFO] within the {args.budget_ms:g} ms budget")
+
+
+if __name__ == "__main__":
+    main_cli()
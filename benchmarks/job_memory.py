@@ -0,0 +1,94 @@
+# benchmarks/job_memory.py
+"""
+Memory held by scraped jobs: the old dataclass Job (full raw payload kept)
+vs. the slotted models.Job in each raw mode, on a synthetic Workday board.
+
+    python benchmarks/job_memory.py [n_jobs]
+
+Each variant builds n_jobs postings the way workday_scraper does (a fresh
+JSON-decoded payload per posting, fresh company/location strings) and
+reports tracemalloc's retained and peak size while the list is alive.
+"""
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import models  # noqa: E402
+
+
+@dataclass
+class LegacyJob:
+    company: str
+    title: str
+    location: Optional[str]
+    url: str
+    description: str
+    raw: Dict[str, Any]
+    source_id: str = ""
+
+
+LOCATIONS = ["Remote, USA", "New York, NY", "Boston, MA", "Chicago, IL", "Austin, TX"]
+
+
+def payloads(n: int):
+    """JSON text shaped like a Workday cxs jobPostings entry (decoded per use)."""
+    for i in range(n):
+        yield json.dumps({
+            "title": f"Senior Data Scientist {i}",
+            "externalPath": f"/job/Remote-USA/Senior-Data-Scientist_R{i:06d}",
+            "locationsText": LOCATIONS[i % len(LOCATIONS)],
+            "postedOn": "Posted 3 Days Ago",
+            "bulletFields": [f"R{i:06d}"],
+            "jobDescription": {"text": "Lorem ipsum dolor sit amet. " * 40},
+            "remoteType": "Remote",
+            "timeType": "Full time",
+            "additionalLocations": LOCATIONS[:3],
+        })
+
+
+def build(factory, n: int):
+    jobs = []
+    for text in payloads(n):
+        p = json.loads(text)
+        jobs.append(factory(
+            "".join(["Example", " Learning"]),   # a new str per posting, as from JSON
+            p["title"],
+            "".join(p["locationsText"]),
+            "https://example.wd1.myworkdayjobs.com/en-US/careers" + p["externalPath"],
+            "",
+            p,
+            source_id=p["bulletFields"][0],
+        ))
+    return jobs
+
+
+def measure(label: str, factory, n: int):
+    gc.collect()
+    tracemalloc.start()
+    jobs = build(factory, n)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<22} {current / 2**20:9.1f} MiB {peak / 2**20:9.1f} MiB "
+          f"{current / n:9.0f} B")
+    del jobs
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"{n} synthetic Workday postings")
+    print(f"{'variant':<22} {'retained':>13} {'peak':>13} {'per job':>11}")
+    measure("dataclass + raw", LegacyJob, n)
+    for mode in ("keep", "spill", "drop"):
+        models.set_raw_mode(mode)
+        measure(f"slots, raw={mode}", models.Job, n)
+    models.set_raw_mode("drop")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+# benchmarks/run_bench.py
+"""
+Offline benchmark of the scrapers and the full main() run.
+
+All HTTP goes to a local FakeATS server (see fake_ats.py), so numbers are
+repeatable and no live site is touched:
+
+    python benchmarks/run_bench.py --jobs 500 --boards 3 --latency 0.02 --error-rate 0.02
+
+Part 1 runs each scrape_* function on its own; part 2 runs main() in a
+scratch directory (fresh .cache/ and output/) against generated boards.yaml
+and reports each stage; ranking uses the fake LLM backend (llm_backends.py). For every row: wall time, jobs in/out, throughput,
+HTTP requests and tracemalloc peak (tracing itself slows Python code down,
+so compare runs with each other rather than with production timings).
+"""
+import argparse
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+from typing import Any, Callable, Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from fake_ats import FakeATS  # noqa: E402
+
+
+class Report:
+    def __init__(self, ats: FakeATS):
+        self.ats = ats
+        self.rows: List[Dict[str, Any]] = []
+        self._open: List[List[int]] = []   # peaks of finished inner stages, per open stage
+
+    @contextmanager
+    def measure(self, label: str, jobs_in: int = 0):
+        """Time a block; the block sets result["jobs"] to the number of jobs it produced."""
+        result: Dict[str, Any] = {"jobs": 0}
+        requests_before = self.ats.total_requests()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        self._open.append([base])
+        start = time.perf_counter()
+        try:
+            yield result
+        finally:
+            wall = time.perf_counter() - start
+            # inner stages reset the peak, so fold theirs back in
+            peak = max(tracemalloc.get_traced_memory()[1], *self._open.pop())
+            if self._open:
+                self._open[-1].append(peak)
+            self.rows.append({
+                "stage": label, "in": jobs_in, "out": result["jobs"], "wall": wall,
+                "requests": self.ats.total_requests() - requests_before,
+                "peak_mib": (peak - base) / 2**20,
+            })
+
+    def print(self, title: str) -> None:
+        print(f"\n{title}")
+        print(f"{'stage':<26} {'in':>7} {'out':>7} {'wall s':>8} {'jobs/s':>9} "
+              f"{'requests':>9} {'peak MiB':>9}")
+        for r in self.rows:
+            rate = (r["out"] or r["in"]) / r["wall"] if r["wall"] else 0
+            print(f"{r['stage']:<26} {r['in']:>7} {r['out']:>7} {r['wall']:>8.3f} {rate:>9.0f} "
+                  f"{r['requests']:>9} {r['peak_mib']:>9.1f}")
+        self.rows = []
+
+
+def board_config(n_boards: int) -> List[Dict[str, Any]]:
+    boards = []
+    for b in range(n_boards):
+        boards += [
+            {"name": f"Greenhouse {b}", "type": "greenhouse", "org": f"gh{b}"},
+            {"name": f"Lever {b}", "type": "lever", "org": f"lever{b}"},
+            {"name": f"Workday {b}", "type": "workday",
+             "url": f"https://tenant{b}.wd1.myworkdayjobs.com/en-US/Careers"},
+            {"name": f"Careers {b}", "type": "html", "url": f"https://careers{b}.example.com/"},
+        ]
+    boards += [
+        {"name": "McGraw Hill", "type": "mcgrawhill",
+         "url_api": "https://careers.mheducation.com/api/jobs?sortBy=relevance&descending=false"},
+        {"name": "Savvas Learning", "type": "savvas",
+         "url": "https://jobs.dayforcehcm.com/en-US/k12l/CANDIDATEPORTAL"},
+    ]
+    return boards
+
+
+def bench_scrapers(report: Report, boards: List[Dict[str, Any]]) -> None:
+    import main
+    seen = set()
+    for b in boards:
+        if b["type"] in seen:
+            continue
+        seen.add(b["type"])
+        with report.measure(f"scrape {b['type']}") as result:
+            result["jobs"] = len(main.scrape_board(b))
+
+
+def instrument(report: Report, owner: Any, name: str, label: str,
+               count_in: Callable, count_out: Callable) -> Callable[[], None]:
+    """Wrap owner.name so each call is measured as a stage; returns an undo function."""
+    original = getattr(owner, name)
+
+    def wrapper(*args, **kwargs):
+        with report.measure(label, count_in(args)) as result:
+            out = original(*args, **kwargs)
+            result["jobs"] = count_out(out)
+        return out
+
+    setattr(owner, name, wrapper)
+    return lambda: setattr(owner, name, original)
+
+
+def bench_main(report: Report, boards: List[Dict[str, Any]]) -> None:
+    import yaml
+    import main
+    import title_filter
+    import dedup
+    import enrich
+    import normalize
+    import prerank
+    import llm_ranker
+
+    first_len = lambda args: len(args[0])  # noqa: E731
+    # main imports stage functions when the stage runs, so patch them where they live
+    undo = [
+        instrument(report, main, "scrape_boards", "scrape (all boards)",
+                   lambda a: len(a[0]), lambda out: len(out[0])),
+        instrument(report, title_filter.TitleMatcher, "filter", "title filter",
+                   lambda a: len(a[1]), lambda out: len(out[0])),
+        instrument(report, enrich, "enrich_jobs", "detail-page enrichment",
+                   first_len, lambda out: sum(out.values())),
+        instrument(report, normalize, "normalize_jobs", "description clean-up",
+                   first_len, lambda out: 0),
+        instrument(report, dedup.Deduper, "add", "dedup",
+                   lambda a: len(a[1]), len),
+        instrument(report, prerank, "select_candidates", "local pre-rank",
+                   first_len, lambda out: len(out[0])),
+        instrument(report, llm_ranker, "rank_jobs_with_llm", "rank",
+                   first_len, len),
+        instrument(report, main, "save_results", "save results",
+                   first_len, lambda out: 0),
+    ]
+
+    workdir = tempfile.mkdtemp(prefix="jobbench-")
+    cwd = os.getcwd()
+    try:
+        os.makedirs(os.path.join(workdir, "data"))
+        shutil.copy(os.path.join(ROOT, "data", "resume.txt"), os.path.join(workdir, "data"))
+        with open(os.path.join(workdir, "boards.yaml"), "w") as f:
+            yaml.safe_dump({"companies": boards}, f)
+        os.chdir(workdir)
+        with report.measure("main() total"):
+            main.main()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+        for u in undo:
+            u()
+
+
+def parse_args():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--jobs", type=int, default=200, help="postings per board")
+    ap.add_argument("--boards", type=int, default=2, help="boards per ATS type")
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds added to each response")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 429/503")
+    ap.add_argument("--llm-latency", type=float, default=0.0, help="seconds per fake LLM call")
+    ap.add_argument("--llm-malformed-rate", type=float, default=0.0,
+                    help="share of fake LLM answers cut short")
+    ap.add_argument("--only", choices=("scrapers", "main"), help="run one part only")
+    return ap.parse_args()
+
+
+def main_cli() -> None:
+    args = parse_args()
+    # keep the benchmark quiet and self-contained
+    os.environ.setdefault("LLM_CACHE", "false")
+    os.environ["LLM_BACKEND"] = "fake"   # llm_backends.FakeChatModel: no network, no API key
+    os.environ["FAKE_LLM_LATENCY"] = str(args.llm_latency)
+    os.environ["FAKE_LLM_MALFORMED_RATE"] = str(args.llm_malformed_rate)
+    # OpenAI-sized rpm/tpm would dominate the rank stage; set them to load-test the limiter
+    os.environ.setdefault("LLM_RPM", "1000000")
+    os.environ.setdefault("LLM_TPM", "1000000000")
+    for var in ("EMAIL_FROM", "EMAIL_TO"):
+        os.environ.pop(var, None)
+
+    ats = FakeATS(args.jobs, args.latency, args.error_rate).start()
+    import http_client
+    http_client.set_url_rewrite(ats.rewrite)
+    report = Report(ats)
+    tracemalloc.start()
+    boards = board_config(args.boards)
+    print(f"{len(boards)} boards x {args.jobs} postings, latency={args.latency}s, "
+          f"error rate={args.error_rate:.0%}")
+    try:
+        if args.only in (None, "scrapers"):
+            with redirect_stdout(io.StringIO()):   # scraper logging would drown the table
+                bench_scrapers(report, boards)
+            report.print("Scrapers (one board each)")
+        if args.only in (None, "main"):
+            with redirect_stdout(io.StringIO()):
+                bench_main(report, boards)
+            report.print("main() stages (batch mode)")
+    finally:
+        tracemalloc.stop()
+        http_client.set_url_rewrite(None)
+        ats.stop()
+    print(f"\nHTTP requests served: {ats.total_requests()} ({ats.errors} injected errors)")
+
+
+if __name__ == "__main__":
+    main_cli()
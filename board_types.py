@@ -0,0 +1,81 @@
+# board_types.py
+"""
+Registry of boards.yaml `type`s.
+
+Each type maps to an adapter that takes the boards.yaml entry plus the
+server-side search terms and yields jobs page by page. Adapters import
+their scraper module on first use, so a run only loads the scrapers (and
+their parsing dependencies) for the board types it actually has.
+
+New types register with @board_type:
+
+    @board_type("smartrecruiters", host="api.smartrecruiters.com")
+    def _smartrecruiters(b, search):
+        from smartrecruiters_scraper import scrape_smartrecruiters
+        yield scrape_smartrecruiters(b.get("org", ""), b["name"])
+
+`host` is the per-host concurrency key for types whose host isn't in the
+entry's url (shared ATS APIs).
+
+An adapter whose listing was cut short (a failed page or search query)
+raises models.PartialScrape after yielding the pages it did get.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from models import Job
+
+Adapter = Callable[[Dict[str, Any], Optional[List[str]]], Iterator[List[Job]]]
+
+BOARD_TYPES: Dict[str, Adapter] = {}
+FIXED_HOSTS: Dict[str, str] = {}
+
+
+def board_type(name: str, host: Optional[str] = None) -> Callable[[Adapter], Adapter]:
+    def register(adapter: Adapter) -> Adapter:
+        BOARD_TYPES[name] = adapter
+        if host:
+            FIXED_HOSTS[name] = host
+        return adapter
+    return register
+
+
+@board_type("greenhouse", host="boards-api.greenhouse.io")
+def _greenhouse(b, search):
+    from greenhouse_scraper import scrape_greenhouse
+    yield scrape_greenhouse(b.get("org", ""), b["name"])
+
+
+@board_type("lever", host="api.lever.co")
+def _lever(b, search):
+    from lever_scraper import scrape_lever
+    yield scrape_lever(b.get("org", ""), b["name"])
+
+
+@board_type("workday")
+def _workday(b, search):
+    from workday_scraper import iter_workday
+    yield from iter_workday(b.get("url", ""), b["name"], search=search, facets=b.get("facets"))
+
+
+@board_type("mcgrawhill")
+def _mcgrawhill(b, search):
+    from mcgraw_scraper import iter_mcgrawhill
+    yield from iter_mcgrawhill(b.get("url_api", ""), b["name"], search=search)
+
+
+@board_type("icims")
+def _icims(b, search):
+    from icims_scraper import scrape_icims
+    yield scrape_icims(b.get("url", ""), b["name"])
+
+
+@board_type("html")
+def _html(b, search):
+    from html_scraper import iter_html
+    yield from iter_html(b.get("url", ""), b["name"], b.get("org", ""), search=search)
+
+
+@board_type("savvas")
+def _savvas(b, search):
+    from html_scraper import scrape_savvas
+    yield scrape_savvas(b.get("url", ""), b["name"])
@@ -0,0 +1,241 @@
+# checkpoints.py
+"""
+Per-run stage checkpoints, so a failed or partial run can resume without
+re-scraping.
+
+Each run gets a directory under CHECKPOINT_DIR (default .cache/runs/<run id>):
+
+  run.json            manifest: which stages finished, QC counts, rank errors
+  scraped.parquet     jobs after the job store (only new/changed with INCREMENTAL)
+  selected.parquet    jobs sent to the LLM (filtered, cleaned, deduped, pre-ranked),
+                      with their local_score
+  duplicates.parquet  duplicate clusters (representative + members) for fan-out
+  ranked.parquet      LLM rows, before duplicate fan-out and MIN_MATCH_SCORE
+
+Stages run in STAGES order; each reads the previous stage's checkpoint, so
+`python main.py --resume latest --from rank` re-ranks saved jobs (e.g. after
+a prompt change) and `--from output` only re-applies MIN_MATCH_SCORE, saves
+and e-mails. Re-running a stage marks every later stage as not done.
+
+Jobs are written with pyarrow (appendable, so streaming mode can write page
+by page); LLM rows go through pandas. Raw source payloads are not saved.
+Both are imported on first use, so reading STAGES or a manifest stays cheap.
+"""
+import json
+import math
+import os
+import shutil
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+from models import Job
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+STAGES = ("scrape", "filter", "rank", "output")
+
+
+@lru_cache(maxsize=None)
+def job_schema() -> "pa.Schema":
+    import pyarrow as pa
+    return pa.schema([
+        ("company", pa.string()),
+        ("title", pa.string()),
+        ("location", pa.string()),
+        ("url", pa.string()),
+        ("description", pa.string()),
+        ("source_id", pa.string()),
+        ("local_score", pa.float64()),   # selected.parquet
+        ("cluster", pa.int64()),         # duplicates.parquet
+        ("representative", pa.bool_()),  # duplicates.parquet
+    ])
+
+
+def new_run_id() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _job_table(jobs: Sequence[Job], local_score=None, cluster=None, representative=None) -> "pa.Table":
+    import pyarrow as pa
+    n = len(jobs)
+    return pa.Table.from_pydict({
+        "company": [j.company for j in jobs],
+        "title": [j.title for j in jobs],
+        "location": [j.location for j in jobs],
+        "url": [j.url for j in jobs],
+        "description": [j.description for j in jobs],
+        "source_id": [j.source_id for j in jobs],
+        "local_score": local_score or [None] * n,
+        "cluster": cluster or [None] * n,
+        "representative": representative or [None] * n,
+    }, schema=job_schema())
+
+
+def read_job_file(path: str) -> Tuple[List[Job], Dict[Tuple[str, str, str], float]]:
+    """Jobs from a file written by JobWriter, and their local scores (empty unless saved with scores)."""
+    import pyarrow.parquet as pq
+    cols = pq.read_table(path).to_pydict()
+    jobs = [Job(c, t, loc, u, d, source_id=s or "") for c, t, loc, u, d, s in zip(
+        cols["company"], cols["title"], cols["location"], cols["url"],
+        cols["description"], cols["source_id"])]
+    scores = {(j.company, j.title, j.url): s
+              for j, s in zip(jobs, cols["local_score"]) if s is not None}
+    return jobs, scores
+
+
+class JobWriter:
+    """Appends job batches to one Parquet file (one row group per batch)."""
+
+    def __init__(self, path: str):
+        import pyarrow.parquet as pq
+        self.path = path
+        self.count = 0
+        self._writer = pq.ParquetWriter(path + ".tmp", job_schema(), compression="zstd")
+
+    def write(self, jobs: Sequence[Job], local_scores: Optional[Dict[Tuple[str, str, str], float]] = None,
+              **columns) -> None:
+        if not jobs:
+            return
+        if local_scores is not None:
+            columns["local_score"] = [local_scores.get((j.company, j.title, j.url)) for j in jobs]
+        self._writer.write_table(_job_table(jobs, **columns))
+        self.count += len(jobs)
+
+    def close(self) -> None:
+        self._writer.close()
+        os.replace(self.path + ".tmp", self.path)   # only complete files carry the final name
+
+
+class RunCheckpoints:
+    def __init__(self, root: str = ".cache/runs", run_id: Optional[str] = None):
+        self.root = root
+        self.run_id = run_id or new_run_id()
+        self.path = os.path.join(root, self.run_id)
+        os.makedirs(self.path, exist_ok=True)
+        self._manifest_path = os.path.join(self.path, "run.json")
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, encoding="utf-8") as f:
+                self.manifest: Dict[str, Any] = json.load(f)
+        else:
+            self.manifest = {"run_id": self.run_id, "stages": {}}
+            self._save()
+
+    @staticmethod
+    def runs(root: str = ".cache/runs") -> List[str]:
+        """Run IDs under `root`, oldest first."""
+        if not os.path.isdir(root):
+            return []
+        return sorted(d for d in os.listdir(root) if os.path.exists(os.path.join(root, d, "run.json")))
+
+    @classmethod
+    def open(cls, root: str, run_id: str) -> "RunCheckpoints":
+        """An existing run; `run_id` may be "latest"."""
+        runs = cls.runs(root)
+        if run_id == "latest":
+            if not runs:
+                raise FileNotFoundError(f"No checkpointed runs under {root}")
+            run_id = runs[-1]
+        elif run_id not in runs:
+            raise FileNotFoundError(f"No checkpointed run {run_id!r} under {root}")
+        return cls(root, run_id)
+
+    @staticmethod
+    def prune(root: str, keep: int) -> List[str]:
+        """Delete all but the `keep` newest runs; returns the deleted run IDs."""
+        old = RunCheckpoints.runs(root)[:-keep] if keep > 0 else []
+        for run_id in old:
+            shutil.rmtree(os.path.join(root, run_id), ignore_errors=True)
+        return old
+
+    # ---- manifest --------------------------------------------------------
+    def done(self, stage: str) -> bool:
+        return stage in self.manifest["stages"]
+
+    def info(self, stage: str) -> Dict[str, Any]:
+        return self.manifest["stages"].get(stage, {})
+
+    def next_stage(self) -> Optional[str]:
+        """First stage not finished (None if the run is complete)."""
+        return next((s for s in STAGES if not self.done(s)), None)
+
+    def mark(self, stage: str, **info) -> None:
+        """Record `stage` as finished; later stages become stale and are cleared."""
+        stages = self.manifest["stages"]
+        for later in STAGES[STAGES.index(stage) + 1:]:
+            stages.pop(later, None)
+        stages[stage] = {"finished": datetime.now(timezone.utc).isoformat(timespec="seconds"), **info}
+        self._save()
+
+    def _save(self) -> None:
+        with open(self._manifest_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(self._manifest_path + ".tmp", self._manifest_path)
+
+    # ---- jobs ------------------------------------------------------------
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.parquet")
+
+    def job_writer(self, name: str) -> JobWriter:
+        return JobWriter(self._file(name))
+
+    def save_jobs(self, name: str, jobs: Sequence[Job],
+                  local_scores: Optional[Dict[Tuple[str, str, str], float]] = None) -> None:
+        writer = self.job_writer(name)
+        writer.write(jobs, local_scores)
+        writer.close()
+
+    def save_clusters(self, clusters: Sequence[Tuple[Job, List[Job]]]) -> None:
+        """Duplicate clusters as (representative, members) pairs."""
+        writer = self.job_writer("duplicates")
+        for idx, (rep, members) in enumerate(clusters):
+            group = [rep, *members]
+            writer.write(group, cluster=[idx] * len(group),
+                         representative=[True] + [False] * len(members))
+        writer.close()
+
+    def load_jobs(self, name: str) -> Tuple[List[Job], Dict[Tuple[str, str, str], float]]:
+        """Jobs and their local scores (empty unless saved with scores)."""
+        path = self._file(name)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Run {self.run_id} has no {name} checkpoint")
+        return read_job_file(path)
+
+    def load_clusters(self) -> List[Tuple[Job, List[Job]]]:
+        path = self._file("duplicates")
+        if not os.path.exists(path):
+            return []   # saved without dedup
+        import pyarrow.parquet as pq
+        cols = pq.read_table(path).to_pydict()
+        clusters: List[Tuple[Job, List[Job]]] = []
+        for c, t, loc, u, d, s, rep in zip(cols["company"], cols["title"], cols["location"],
+                                           cols["url"], cols["description"], cols["source_id"],
+                                           cols["representative"]):
+            job = Job(c, t, loc, u, d, source_id=s or "")
+            if rep:
+                clusters.append((job, []))
+            else:
+                clusters[-1][1].append(job)
+        return clusters
+
+    # ---- LLM rows --------------------------------------------------------
+    def save_rows(self, rows: List[Dict[str, Any]]) -> None:
+        import pandas as pd
+        path = self._file("ranked")
+        pd.DataFrame(rows).to_parquet(path + ".tmp", engine="pyarrow", compression="zstd", index=False)
+        os.replace(path + ".tmp", path)
+
+    def load_rows(self) -> List[Dict[str, Any]]:
+        import pandas as pd
+        path = self._file("ranked")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Run {self.run_id} has no ranked checkpoint")
+        rows = pd.read_parquet(path, engine="pyarrow").to_dict("records")
+        for row in rows:
+            for k, v in row.items():
+                if hasattr(v, "tolist"):      # list columns come back as numpy arrays
+                    row[k] = v.tolist()
+                elif isinstance(v, float) and math.isnan(v):
+                    row[k] = None
+        return rows
@@ -0,0 +1,207 @@
+# dedup.py
+"""
+Duplicate and near-duplicate posting detection across boards.
+
+The same role often appears several times: once per location on Workday,
+on both a listing page and an API, or reposted under a slightly different
+title. Postings are clustered so only one representative per cluster is
+ranked, and its score is copied back to every member afterwards.
+
+Two postings are duplicates when they share an exact key (canonical URL of
+a posting page, or company + ATS job ID) or when the MinHash estimate of the Jaccard
+similarity of their title+description shingles reaches `threshold`.
+MinHash signatures are banded into LSH buckets, so each posting is
+compared only with the few representatives sharing a bucket, not with
+every posting seen so far. Near-duplicates must belong to the same company,
+so identical generic titles at two employers are never merged.
+
+Deduper is incremental: add() can be called once with every job or once
+per page while streaming.
+"""
+import re
+import zlib
+from collections import defaultdict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import numpy as np
+
+from models import Job
+
+NUM_PERM = 64
+BANDS = 16                 # 16 bands x 4 rows: candidate pairs from ~0.5 similarity up
+THRESHOLD = 0.8            # estimated Jaccard needed to merge
+_PRIME = (1 << 31) - 1
+_MIX = 1000003            # combines neighbouring word hashes into a shingle hash
+_rng = np.random.default_rng(1)   # fixed seed: same clusters on every run
+# multiply-shift hashing on uint64 (wrap-around is intended; no slow modulo)
+_PERM_A = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_PERM_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+
+TRACKING_PARAMS = re.compile(r"^(?:utm_\w+|gh_src|gh_jid_src|source|src|ref|lever-source\w*|trk)$",
+                             re.IGNORECASE)
+_WORD = re.compile(r"[a-z0-9]+")
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def canonical_url(url: str) -> str:
+    """URL without fragment, tracking parameters, case in the host, or a trailing slash."""
+    if not url:
+        return ""
+    parts = urlparse(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not TRACKING_PARAMS.match(k)]
+    return urlunparse((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"),
+                       "", urlencode(sorted(query)), ""))
+
+
+def company_key(company: str) -> str:
+    return _NON_ALNUM.sub("", (company or "").lower())
+
+
+@lru_cache(maxsize=200000)
+def _word_hash(word: str) -> int:
+    return zlib.crc32(word.encode("utf-8"))
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    """Distinct hashes of the text's word 3-grams (words + word pairs for short texts)."""
+    words = _WORD.findall(text.lower())
+    h = np.fromiter(map(_word_hash, words), dtype=np.int64, count=len(words))
+    if len(words) < 12:
+        # short texts (title only): words and pairs, so "II" vs "III" still differs
+        parts = [h, (h[:-1] * _MIX + h[1:]) % _PRIME]
+    else:
+        parts = [((h[:-2] * _MIX + h[1:-1]) % _PRIME * _MIX + h[2:]) % _PRIME]
+    return np.unique(np.concatenate(parts)).astype(np.uint64)
+
+
+def minhash(text: str) -> Optional[np.ndarray]:
+    """NUM_PERM-value MinHash signature of the text's shingles (None if it has none)."""
+    h = _shingle_hashes(text)
+    if not len(h):
+        return None
+    return ((_PERM_A[:, None] * h[None, :] + _PERM_B[:, None]) >> np.uint64(32)).min(axis=1)
+
+
+def _row_key(row: Dict[str, Any]) -> Tuple[str, str, str]:
+    return row["company"], row["title"], row["url"]
+
+
+class Deduper:
+    def __init__(self, threshold: float = THRESHOLD, bands: int = BANDS):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows_per_band = NUM_PERM // bands
+        self.representatives: List[Job] = []
+        self.members: List[List[Job]] = []          # per cluster, duplicates of the representative
+        self._signatures = np.zeros((64, NUM_PERM), dtype=np.uint64)   # row per cluster, grown as needed
+        self._exact: Dict[str, int] = {}
+        self._url_titles: Dict[str, str] = {}   # url key -> first title seen with it
+        self._listing_urls: set = set()        # url keys seen with several titles
+        self._buckets: Dict[Tuple[str, int, bytes], List[int]] = defaultdict(list)
+        self.exact_hits = 0
+        self.near_hits = 0
+
+    def _exact_keys(self, job: Job) -> List[str]:
+        keys = []
+        url = canonical_url(job.url)
+        if url.startswith("http"):
+            # a URL seen with different titles is a listing page (Savvas links every
+            # posting to it), not a posting page, so it can't identify a posting
+            key, title = f"url:{url}", _NON_ALNUM.sub("", (job.title or "").lower())
+            if self._url_titles.setdefault(key, title) != title:
+                self._listing_urls.add(key)
+            if key not in self._listing_urls:
+                keys.append(key)
+        if job.source_id:
+            keys.append(f"id:{company_key(job.company)}|{job.source_id}")
+        return keys
+
+    def _bands(self, company: str, sig: np.ndarray):
+        r = self.rows_per_band
+        for band in range(self.bands):
+            yield company, band, sig[band * r:(band + 1) * r].tobytes()
+
+    def _join(self, cluster: int, job: Job, keys: List[str]) -> None:
+        self.members[cluster].append(job)
+        for key in keys:
+            self._exact.setdefault(key, cluster)
+
+    def add(self, jobs: List[Job]) -> List[Job]:
+        """Cluster `jobs` with everything seen so far; returns the new representatives."""
+        new_reps: List[Job] = []
+        for job in jobs:
+            keys = self._exact_keys(job)
+            cluster = next((self._exact[k] for k in keys if k in self._exact), None)
+            if cluster is not None:
+                self.exact_hits += 1
+                self._join(cluster, job, keys)
+                continue
+
+            company = company_key(job.company)
+            sig = minhash(f"{job.title}\n{job.description or ''}")
+            if sig is not None:
+                candidates = {c for b in self._bands(company, sig) for c in self._buckets.get(b, ())}
+                if candidates:
+                    ids = np.fromiter(sorted(candidates), dtype=np.int64, count=len(candidates))
+                    sims = (self._signatures[ids] == sig).mean(axis=1)
+                    best = int(np.argmax(sims))   # first (oldest) cluster on ties
+                    if sims[best] >= self.threshold:
+                        self.near_hits += 1
+                        self._join(int(ids[best]), job, keys)
+                        continue
+
+            cluster = len(self.representatives)
+            self.representatives.append(job)
+            self.members.append([])
+            for key in keys:
+                self._exact[key] = cluster
+            if sig is not None:
+                if cluster >= len(self._signatures):
+                    self._signatures = np.concatenate([self._signatures, np.zeros_like(self._signatures)])
+                self._signatures[cluster] = sig
+                for b in self._bands(company, sig):
+                    self._buckets[b].append(cluster)
+            new_reps.append(job)
+        return new_reps
+
+    def clusters(self) -> List[Tuple[Job, List[Job]]]:
+        """(representative, duplicates) for every cluster that has duplicates."""
+        return [(rep, members) for rep, members in zip(self.representatives, self.members) if members]
+
+    @classmethod
+    def from_clusters(cls, clusters: List[Tuple[Job, List[Job]]]) -> "Deduper":
+        """A Deduper that can fan_out() saved clusters (see checkpoints.py)."""
+        deduper = cls()
+        for rep, members in clusters:
+            deduper.representatives.append(rep)
+            deduper.members.append(list(members))
+        return deduper
+
+    def summary(self) -> str:
+        dupes = self.exact_hits + self.near_hits
+        return (f"{len(self.representatives)} unique of {len(self.representatives) + dupes} "
+                f"({self.exact_hits} exact, {self.near_hits} near duplicates)")
+
+    def fan_out(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Rows for the representatives plus a copy for each of their duplicates
+        (with the duplicate's own company/title/location/url and `duplicate_of`
+        set to the representative's URL), each placed right after its
+        representative.
+        """
+        cluster_of = {(j.company, j.title, j.url): i for i, j in enumerate(self.representatives)}
+        out: List[Dict[str, Any]] = []
+        for row in rows:
+            out.append(row)
+            cluster = cluster_of.get(_row_key(row))
+            if cluster is None:
+                continue
+            for job in self.members[cluster]:
+                copy = dict(row)
+                copy.update(company=job.company, title=job.title, location=job.location,
+                            url=job.url, duplicate_of=row["url"])
+                out.append(copy)
+        return out
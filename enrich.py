@@ -0,0 +1,177 @@
+# enrich.py
+"""
+Detail-page enrichment for postings scraped from HTML listing pages.
+
+The HTML and iCIMS scrapers only see a title and a link, so they store a
+placeholder description and the LLM would score the title alone. For the
+postings that survive the title filter, this fetches the detail page on a
+bounded worker pool (with a per-host cap), extracts the main text and uses
+it as the description.
+
+Pages are cached on disk by URL together with their ETag / Last-Modified
+validators. Later runs send a conditional GET; a 304 reuses the cached text,
+so an unchanged posting is only downloaded once.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from html_parse import parse_html
+from http_client import http_get
+from models import Job
+
+# Descriptions set by scrapers that only saw a listing page
+PLACEHOLDER_DESCRIPTIONS = frozenset({
+    "Generic HTML job",
+    "Kahoot job",
+    "Nearpod job",
+    "Workday HTML job",
+    "(from iCIMS listing page)",
+})
+
+# Page chrome that never holds the posting itself
+NOISE_TAGS = ("script", "style", "noscript", "template", "svg", "nav", "header", "footer",
+              "aside", "form", "iframe")
+MAIN_SELECTORS = ("main", "article", "[role=main]", "#content", ".job-description")
+MIN_TEXT_CHARS = 200   # shorter extractions are treated as "nothing found"
+
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def needs_enrichment(job: Job) -> bool:
+    return bool(job.url) and job.url.startswith("http") and job.description in PLACEHOLDER_DESCRIPTIONS
+
+
+def extract_main_text(html: str) -> str:
+    """Visible text of the page's main content area (or body), one block per line."""
+    soup = parse_html(html)
+    for tag in soup(NOISE_TAGS):
+        tag.decompose()
+    for selector in MAIN_SELECTORS:
+        node = soup.select_one(selector)
+        if node is not None and len(node.get_text(strip=True)) >= MIN_TEXT_CHARS:
+            break
+    else:
+        node = soup.body or soup
+    text = node.get_text("\n", strip=True)
+    return _BLANK_LINES.sub("\n", text).strip()
+
+
+class DetailCache:
+    """SQLite store of extracted detail-page text keyed by URL, with HTTP validators."""
+
+    def __init__(self, path: str = ".cache/job_details.sqlite"):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS details ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " text TEXT NOT NULL,"
+            " checked REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, text FROM details WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "text": row[2]}
+
+    def put(self, url: str, text: str, etag: Optional[str], last_modified: Optional[str]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO details (url, etag, last_modified, text, checked)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, text, time.time()),
+            )
+            self._conn.commit()
+
+    def touch(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE details SET checked = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def evict(self, max_age_days: float = 30) -> int:
+        """Drop pages not checked for `max_age_days` (postings that went away)."""
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM details WHERE checked < ?", (cutoff,)).rowcount
+            self._conn.commit()
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def fetch_detail(url: str, cache: Optional[DetailCache] = None) -> Tuple[Optional[str], str]:
+    """
+    Main text of a detail page and how it was obtained: "fetched",
+    "revalidated" (304, cached text reused) or "failed".
+    """
+    cached = cache.get(url) if cache is not None else None
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    r = http_get(url, headers=headers, timeout=30)
+    if r.status_code == 304 and cached:
+        cache.touch(url)
+        return cached["text"], "revalidated"
+    if r.status_code != 200:
+        return None, "failed"
+
+    text = extract_main_text(r.text)
+    if cache is not None and text:
+        cache.put(url, text, r.headers.get("ETag"), r.headers.get("Last-Modified"))
+    return text or None, "fetched"
+
+
+def enrich_jobs(jobs: List[Job], cache: Optional[DetailCache] = None,
+                max_workers: int = 8, per_host: int = 4) -> Dict[str, int]:
+    """
+    Replace placeholder descriptions with detail-page text, in place.
+    At most `max_workers` pages are fetched at once, `per_host` per host.
+    Returns counts per outcome.
+    """
+    todo = [j for j in jobs if needs_enrichment(j)]
+    stats = {"fetched": 0, "revalidated": 0, "failed": 0}
+    if not todo:
+        return stats
+
+    host_slots: Dict[str, threading.Semaphore] = {}
+    slots_lock = threading.Lock()
+    stats_lock = threading.Lock()
+
+    def work(job: Job) -> None:
+        host = urlparse(job.url).netloc.lower()
+        with slots_lock:
+            slot = host_slots.setdefault(host, threading.Semaphore(max(1, per_host)))
+        with slot:
+            try:
+                text, outcome = fetch_detail(job.url, cache)
+            except Exception as e:
+                print(f"[WARN] Detail fetch failed for {job.url}: {e}")
+                text, outcome = None, "failed"
+        if text:
+            job.description = text
+        with stats_lock:
+            stats[outcome] += 1
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo)))) as pool:
+        list(pool.map(work, todo))
+    return stats
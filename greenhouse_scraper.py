@@ -0,0 +1,25 @@
+# greenhouse_scraper.py
+from typing import List
+from models import Job
+from http_client import http_get
+
+def scrape_greenhouse(org: str, name: str) -> List[Job]:
+    jobs = []
+    url = f"https://boards-api.greenhouse.io/v1/boards/{org}/jobs"
+    try:
+        r = http_get(url, timeout=30)
+        r.raise_for_status()
+        data = r.json()
+        for j in data.get("jobs", []):
+            jobs.append(Job(
+                company=name,
+                title=j.get("title", ""),
+                location=(j.get("location") or {}).get("name", ""),
+                url=j.get("absolute_url", ""),
+                description=j.get("content", ""),
+                raw=j,
+                source_id=str(j.get("id") or "")
+            ))
+    except Exception as e:
+        print(f"[ERROR] Greenhouse scrape failed for {name}: {e}")
+    return jobs
@@ -0,0 +1,45 @@
+# html_parse.py
+"""
+HTML parsing helpers shared by the HTML scrapers.
+
+Uses lxml's tree builder when lxml is installed (several times faster than
+the pure-Python "html.parser") and lets callers pass a SoupStrainer so only
+the tags a scraper reads are built into the tree. Embedded Next.js data is
+pulled out of the raw text with a regex, without building a DOM at all.
+"""
+import json
+import re
+from typing import Any, Dict, Optional
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+# Strainers for the tags each scraper reads
+LINKS = SoupStrainer("a", href=True)
+SAVVAS_TITLES = SoupStrainer("h2", attrs={"test-id": "job-title"})
+
+_NEXT_DATA = re.compile(
+    r"""<script\b[^>]*\bid\s*=\s*["']?__NEXT_DATA__["']?[^>]*>(.*?)</script\s*>""",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def parse_html(text: str, only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Parse `text` with the fastest available parser, optionally restricted to `only`."""
+    return BeautifulSoup(text, PARSER, parse_only=only)
+
+
+def extract_next_data(text: str) -> Optional[Dict[str, Any]]:
+    """The page's __NEXT_DATA__ JSON, or None if absent or not valid JSON."""
+    m = _NEXT_DATA.search(text)
+    if not m:
+        return None
+    try:
+        return json.loads(m.group(1))
+    except ValueError:
+        return None
@@ -1,33 +1,72 @@
-import requests
-from bs4 import BeautifulSoup
-from typing import List
-from models import Job
-import json
+from typing import Iterator, List, Optional
+from urllib.parse import urlencode, urlparse
+from models import Job, PartialScrape
+from http_client import http_get
+from html_parse import LINKS, SAVVAS_TITLES, extract_next_data, parse_html
 
-def scrape_html(url: str, name: str, org: str = "") -> List[Job]:
+# Careers hosts whose listing pages accept a keyword query parameter.
+SEARCH_PARAMS = {
+    "careers.smartrecruiters.com": "search",
+    "jobs.jobvite.com": "q",
+}
+
+
+def _search_urls(url: str, search: Optional[List[str]]) -> List[str]:
+    """One listing URL per search term if the host supports search, else [url]."""
+    param = SEARCH_PARAMS.get(urlparse(url).netloc.lower())
+    if not search or not param:
+        return [url]
+    sep = "&" if "?" in url else "?"
+    return [f"{url}{sep}{urlencode({param: term})}" for term in search]
+
+
+def scrape_html(url: str, name: str, org: str = "", search: Optional[List[str]] = None) -> List[Job]:
+    """List form of iter_html(); raises PartialScrape like it."""
+    return [job for page in iter_html(url, name, org, search) for job in page]
+
+
+def iter_html(url: str, name: str, org: str = "", search: Optional[List[str]] = None) -> Iterator[List[Job]]:
     """
-    Dispatcher for HTML-based scrapers.
+    Dispatcher for HTML-based scrapers. `search` is only used by boards whose
+    host supports a keyword query (SmartRecruiters, Jobvite); others ignore it.
+    Yields one list per listing page fetched.
     """
     if "kahoot" in url.lower():
-        return scrape_kahoot(url, name)
-    if "nearpod" in url.lower():
-        return scrape_nearpod(url, name)
-    if "workdayjobs.com" in url.lower():
-        return scrape_workday_html(url, name)
-    if "dayforcehcm.com" in url.lower() and "k12l" in url.lower():
-        return scrape_savvas(url, name)
-    return scrape_generic(url, name)
+        yield scrape_kahoot(url, name)
+    elif "nearpod" in url.lower():
+        yield scrape_nearpod(url, name)
+    elif "workdayjobs.com" in url.lower():
+        yield scrape_workday_html(url, name)
+    elif "dayforcehcm.com" in url.lower() and "k12l" in url.lower():
+        yield scrape_savvas(url, name)
+    else:
+        yield from iter_generic(url, name, search)
+
 
+def scrape_generic(url: str, name: str, search: Optional[List[str]] = None) -> List[Job]:
+    """List form of iter_generic(); raises PartialScrape like it."""
+    return [job for page in iter_generic(url, name, search) for job in page]
 
-def scrape_generic(url: str, name: str) -> List[Job]:
+
+def iter_generic(url: str, name: str, search: Optional[List[str]] = None) -> Iterator[List[Job]]:
     """
     Very broad fallback HTML scraper: finds any <a> with 'job' in the href.
+    With `search` on a supported host, fetches one result page per term and
+    yields each page's new jobs. A failed page doesn't stop the others, but
+    raises PartialScrape at the end.
     """
-    jobs = []
-    try:
-        r = requests.get(url, timeout=30)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
+    seen_urls = set()
+    failed = 0
+    for page_url in _search_urls(url, search):
+        jobs = []
+        try:
+            r = http_get(page_url, timeout=30)
+            r.raise_for_status()
+            soup = parse_html(r.text, LINKS)
+        except Exception as e:
+            print(f"[ERROR] HTML scrape failed for {name}: {e}")
+            failed += 1
+            continue
         for a in soup.find_all("a", href=True):
             if "job" in a["href"].lower():
                 title = a.get_text(strip=True)
@@ -36,6 +75,9 @@ def scrape_generic(url: str, name: str) -> List[Job]:
                 job_url = a["href"]
                 if not job_url.startswith("http"):
                     job_url = url.rstrip("/") + "/" + job_url.lstrip("/")
+                if job_url in seen_urls:
+                    continue
+                seen_urls.add(job_url)
                 jobs.append(Job(
                     company=name,
                     title=title,
@@ -44,10 +86,11 @@ def scrape_generic(url: str, name: str) -> List[Job]:
                     description="Generic HTML job",
                     raw={"href": a["href"]}
                 ))
-        print(f"[INFO] Scraped {len(jobs)} jobs from {name} (generic HTML)")
-    except Exception as e:
-        print(f"[ERROR] HTML scrape failed for {name}: {e}")
-    return jobs
+        if jobs:
+            yield jobs
+    print(f"[INFO] Scraped {len(seen_urls)} jobs from {name} (generic HTML)")
+    if failed:
+        raise PartialScrape(f"{failed} listing page(s) failed")
 
 
 def scrape_kahoot(url: str, name: str) -> List[Job]:
@@ -56,9 +99,9 @@ def scrape_kahoot(url: str, name: str) -> List[Job]:
     """
     jobs = []
     try:
-        r = requests.get(url, timeout=30)
+        r = http_get(url, timeout=30)
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
+        soup = parse_html(r.text, LINKS)
         for a in soup.select("a[href*='careers/job']"):
             title = a.get_text(strip=True)
             job_url = a["href"]
@@ -84,9 +127,9 @@ def scrape_nearpod(url: str, name: str) -> List[Job]:
     """
     jobs = []
     try:
-        r = requests.get(url, timeout=30)
+        r = http_get(url, timeout=30)
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
+        soup = parse_html(r.text, LINKS)
         for a in soup.select("a[href*='/jobs/']"):
             title = a.get_text(strip=True)
             job_url = a["href"]
@@ -113,9 +156,10 @@ def scrape_workday_html(url: str, name: str) -> List[Job]:
     """
     jobs = []
     try:
-        r = requests.get(url, timeout=30)
+        r = http_get(url, timeout=30)
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
+        # full tree: the location lives in a sibling of the link's parent
+        soup = parse_html(r.text)
 
         # Workday uses <a data-automation-id="jobTitle"> for job links
         for a in soup.select("a[data-automation-id='jobTitle']"):
@@ -145,12 +189,6 @@ def scrape_workday_html(url: str, name: str) -> List[Job]:
     return jobs
 
 
-import requests
-from bs4 import BeautifulSoup
-from typing import List
-from models import Job
-
-
 def scrape_savvas(url: str, name: str) -> List[Job]:
     """
     Scraper for Savvas Learning (DayforceHCM).
@@ -159,19 +197,15 @@ def scrape_savvas(url: str, name: str) -> List[Job]:
     jobs = []
     try:
         print(f"[DEBUG] Fetching Savvas careers page: {url}")
-        r = requests.get(url, timeout=30)
+        r = http_get(url, timeout=30)
         r.raise_for_status()
 
-        soup = BeautifulSoup(r.text, "html.parser")
-
-        # Find Next.js embedded JSON
-        next_data = soup.find("script", id="__NEXT_DATA__")
-        if not next_data:
+        # Pull the Next.js embedded JSON straight out of the text; no DOM needed
+        data = extract_next_data(r.text)
+        if data is None:
             print("[ERROR] Could not find __NEXT_DATA__ script in Savvas page")
             return jobs
 
-        data = json.loads(next_data.string)
-
         # Step 1: Navigate into pageProps.dehydratedState
         props = data.get("props", {})
         page_props = props.get("pageProps", {})
@@ -219,11 +253,13 @@ def scrape_savvas(url: str, name: str) -> List[Job]:
                         location=location,
                         url=job_url,
                         description=descr,
-                        raw=p
+                        raw=p,
+                        source_id=str(p.get("jobPostingId") or p.get("id") or title)
                     ))
 
         if not jobs:
             print("[WARN] No jobs found in Savvas JSON, falling back to HTML scrape")
+            soup = parse_html(r.text, SAVVAS_TITLES)
             for h2 in soup.select("h2[test-id='job-title']"):
                 title = h2.get_text(strip=True)
                 if not title:
@@ -234,7 +270,8 @@ def scrape_savvas(url: str, name: str) -> List[Job]:
                     location="Unknown",
                     url=url,
                     description="Scraped from HTML fallback",
-                    raw={"text": title}
+                    raw={"text": title},
+                    source_id=title   # every posting shares the listing URL; key them by title
                 ))
 
     except Exception as e:
@@ -0,0 +1,174 @@
+# http_client.py
+"""
+Shared HTTP layer for all scrapers.
+
+- one pooled keep-alive requests.Session per host
+- consistent User-Agent and gzip/brotli negotiation
+- tenacity retries with jittered exponential backoff on 429/5xx and
+  connection errors, honoring Retry-After when the server sends it
+
+After the last attempt the final response is returned as-is, so callers keep
+doing their own status-code checks. Every attempt and retry is counted in
+metrics.METRICS under the calling thread's board.
+"""
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from tenacity import (
+    RetryCallState,
+    Retrying,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+)
+
+from metrics import METRICS
+
+try:  # urllib3 only decodes "br" when a brotli package is installed
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+DEFAULT_TIMEOUT = 30
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 1.0         # seconds; doubled per attempt before jitter
+BACKOFF_CAP = 30.0         # longest jittered sleep
+RETRY_AFTER_CAP = 120.0    # never sleep longer than this, whatever the server says
+POOL_MAXSIZE = 16          # keep-alive connections kept per host
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+_url_rewrite: Optional[Callable[[str], str]] = None
+
+
+def set_url_rewrite(rewrite: Optional[Callable[[str], str]]) -> None:
+    """
+    Route every request through `rewrite(url)` (None restores direct access).
+    Used by the offline benchmarks to point all scrapers at a local server.
+    """
+    global _url_rewrite
+    _url_rewrite = rewrite
+
+
+def get_session(url: str) -> requests.Session:
+    """Return the pooled session for the URL's host, creating it on first use."""
+    host = urlparse(url).netloc.lower()
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({
+                "User-Agent": USER_AGENT,
+                "Accept-Encoding": ACCEPT_ENCODING,
+            })
+            _sessions[host] = session
+        return session
+
+
+def close_sessions() -> None:
+    """Close every pooled session (end of run / tests)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse Retry-After as either delta-seconds or an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _should_retry(response: requests.Response) -> bool:
+    return response.status_code in RETRY_STATUSES
+
+
+def _wait(retry_state: RetryCallState) -> float:
+    outcome = retry_state.outcome
+    if outcome is not None and not outcome.failed:
+        retry_after = _retry_after_seconds(outcome.result())
+        if retry_after is not None:
+            # small jitter so parallel workers don't all wake at once
+            return min(retry_after, RETRY_AFTER_CAP) + random.uniform(0, 1)
+    # "full jitter" exponential backoff
+    ceiling = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (retry_state.attempt_number - 1))
+    return random.uniform(0, ceiling)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    method, url = retry_state.args[:2]
+    outcome = retry_state.outcome
+    reason = outcome.exception() if outcome.failed else f"HTTP {outcome.result().status_code}"
+    sleep = retry_state.next_action.sleep if retry_state.next_action else 0
+    METRICS.record_retry()
+    print(f"[WARN] {method} {url} attempt {retry_state.attempt_number} failed ({reason}); "
+          f"retrying in {sleep:.1f}s")
+
+
+def _give_up(retry_state: RetryCallState):
+    # Return the last response (or re-raise the last exception) unchanged.
+    return retry_state.outcome.result()
+
+
+def _send(method: str, url: str, **kwargs) -> requests.Response:
+    nbytes = 0
+    try:
+        response = get_session(url).request(method, url, **kwargs)
+        nbytes = len(response.content)
+        return response
+    finally:
+        METRICS.record_http(nbytes)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """requests.request() on the pooled session for `url`, with retries."""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    if _url_rewrite is not None:
+        url = _url_rewrite(url)
+    retryer = Retrying(
+        stop=stop_after_attempt(MAX_ATTEMPTS),
+        wait=_wait,
+        retry=(
+            retry_if_result(_should_retry)
+            | retry_if_exception_type((requests.ConnectionError, requests.Timeout))
+        ),
+        before_sleep=_log_retry,
+        retry_error_callback=_give_up,
+    )
+    return retryer(_send, method, url, **kwargs)
+
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> requests.Response:
+    return request("POST", url, **kwargs)
@@ -1,9 +1,9 @@
 # icims_scraper.py
-import requests
 from typing import List
 from urllib.parse import urljoin
-from bs4 import BeautifulSoup
 from models import Job
+from http_client import http_get
+from html_parse import parse_html
 
 def scrape_icims(url: str, name: str) -> List[Job]:
     """
@@ -11,17 +11,12 @@ def scrape_icims(url: str, name: str) -> List[Job]:
     """
     jobs = []
     try:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            )
-        }
-        r = requests.get(url, headers=headers, timeout=30)
+        # browser User-Agent comes from the shared session
+        r = http_get(url, timeout=30)
         r.raise_for_status()
 
-        soup = BeautifulSoup(r.text, "html.parser")
+        # full tree: locations are looked up next to each link
+        soup = parse_html(r.text)
 
         # On McGraw Hill’s site, each job row is an <a> under a <div class="job-card__title"> (or similar).
         # Let’s look for links under job listing containers:
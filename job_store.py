@@ -0,0 +1,166 @@
+# job_store.py
+"""
+Persistent SQLite store of every posting we have seen.
+
+Each job is keyed by company + a stable per-source ID (Workday externalPath,
+Greenhouse/Lever IDs, McGraw Hill req_id, URL for HTML scrapers, title for
+Savvas postings that only link to the listing page) and keeps first/last
+seen timestamps plus a content hash, so a run can tell which postings are
+new, changed, unchanged or closed since the previous run.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Set
+
+from models import Job
+
+_WS = re.compile(r"\s+")
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def job_key(job: Job) -> str:
+    # the url fallback assumes one posting per url; scrapers whose postings share a
+    # listing page URL (Savvas) set source_id instead
+    return f"{job.company}|{job.source_id or job.url}"
+
+
+def content_hash(job: Job) -> str:
+    text = "\x1f".join(_WS.sub(" ", part or "").strip()
+                       for part in (job.title, job.location, job.url, job.description))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SyncResult:
+    new: List[Job] = field(default_factory=list)
+    changed: List[Job] = field(default_factory=list)
+    unchanged: List[Job] = field(default_factory=list)
+    closed: List[Dict[str, str]] = field(default_factory=list)   # rows of vanished postings
+    fresh: List[Job] = field(default_factory=list)   # new + changed, in scrape order
+
+    def summary(self) -> str:
+        return (f"{len(self.new)} new, {len(self.changed)} changed, "
+                f"{len(self.unchanged)} unchanged, {len(self.closed)} closed")
+
+
+class JobStore:
+    def __init__(self, path: str = ".cache/jobs.sqlite"):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # check_same_thread=False: the streaming pipeline syncs from its filter thread
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " key TEXT PRIMARY KEY,"
+            " company TEXT NOT NULL,"
+            " source_id TEXT,"
+            " title TEXT,"
+            " location TEXT,"
+            " url TEXT,"
+            " content_hash TEXT NOT NULL,"
+            " first_seen TEXT NOT NULL,"
+            " last_seen TEXT NOT NULL,"
+            " closed_at TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_company ON jobs(company)")
+        self._conn.commit()
+
+    def sync(self, jobs: Iterable[Job], scraped_companies: Iterable[str]) -> SyncResult:
+        """
+        Record this run's jobs and classify them against the store.
+
+        Open postings of a company in `scraped_companies` that were not seen
+        this run are marked closed. Pass only companies whose scrape fully
+        succeeded, so a failed or partly scraped board doesn't close the jobs
+        it missed. A closed posting seen again is re-opened with its original
+        first_seen.
+        """
+        started = now_iso()
+        result = self.observe(jobs)
+        result.closed = self.close_stale(scraped_companies, started)
+        return result
+
+    def observe(self, jobs: Iterable[Job]) -> SyncResult:
+        """
+        Record jobs and classify them as new/changed/unchanged, without
+        closing anything. Can be called once per page while streaming; finish
+        the run with close_stale().
+        """
+        now = now_iso()
+        result = SyncResult()
+        seen: Set[str] = set()
+        cur = self._conn.cursor()
+
+        for job in jobs:
+            key = job_key(job)
+            if key in seen:
+                continue
+            seen.add(key)
+            digest = content_hash(job)
+            row = cur.execute(
+                "SELECT content_hash, closed_at FROM jobs WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                cur.execute(
+                    "INSERT INTO jobs (key, company, source_id, title, location, url,"
+                    " content_hash, first_seen, last_seen, closed_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)",
+                    (key, job.company, job.source_id, job.title, job.location, job.url,
+                     digest, now, now),
+                )
+                result.new.append(job)
+                result.fresh.append(job)
+            elif row[1] is not None:
+                # re-opened: closed by mistake (a missed page) or re-posted; it keeps
+                # its first_seen and only counts as changed if its content did
+                cur.execute(
+                    "UPDATE jobs SET title = ?, location = ?, url = ?, content_hash = ?,"
+                    " last_seen = ?, closed_at = NULL WHERE key = ?",
+                    (job.title, job.location, job.url, digest, now, key),
+                )
+                if row[0] != digest:
+                    result.changed.append(job)
+                    result.fresh.append(job)
+                else:
+                    result.unchanged.append(job)
+            elif row[0] != digest:
+                cur.execute(
+                    "UPDATE jobs SET title = ?, location = ?, url = ?, content_hash = ?,"
+                    " last_seen = ? WHERE key = ?",
+                    (job.title, job.location, job.url, digest, now, key),
+                )
+                result.changed.append(job)
+                result.fresh.append(job)
+            else:
+                cur.execute("UPDATE jobs SET last_seen = ? WHERE key = ?", (now, key))
+                result.unchanged.append(job)
+
+        self._conn.commit()
+        return result
+
+    def close_stale(self, scraped_companies: Iterable[str], since: str) -> List[Dict[str, str]]:
+        """Close open postings of these companies not seen since `since` (ISO time)."""
+        now = now_iso()
+        closed = []
+        cur = self._conn.cursor()
+        for company in sorted(set(scraped_companies)):
+            stale = cur.execute(
+                "SELECT key, title, url FROM jobs"
+                " WHERE company = ? AND closed_at IS NULL AND last_seen < ?",
+                (company, since),
+            ).fetchall()
+            for key, title, url in stale:
+                cur.execute("UPDATE jobs SET closed_at = ? WHERE key = ?", (now, key))
+                closed.append({"company": company, "title": title, "url": url})
+        self._conn.commit()
+        return closed
+
+    def close(self) -> None:
+        self._conn.close()
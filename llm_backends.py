@@ -0,0 +1,173 @@
+# llm_backends.py
+"""
+Chat-model backends for the ranker.
+
+make_llm("openai") is the production model (ChatOpenAI). make_llm("fake")
+is a local stand-in for load tests and benchmarks: no network, no API key,
+and the same interface (a LangChain chat model, so `prompt | llm` works).
+
+The fake:
+  - answers MATCH_PROMPT with one JSON object and BATCH_PROMPT with a JSON
+    array keyed by job ID; scores are derived from the prompt text, so the
+    same posting always gets the same score
+  - supports bind_tools(), so with_structured_output() works: the answer
+    comes back as a tool call ({"results": [...]} for batches)
+  - returns malformed output for `malformed_rate` of calls (decided per
+    prompt and attempt, so a re-ask can succeed): truncated JSON as text,
+    or a tool call whose first entry lacks match_score
+  - sleeps `latency` seconds plus a per-completion-token delay
+  - counts prompt/completion tokens in `usage`
+  - enforces its own requests/min and tokens/min and raises a 429
+    (FakeRateLimitError) when a caller exceeds them
+"""
+import json
+import re
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from typing import Any, Dict, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+BACKENDS = ("openai", "fake")
+
+_JOB_HEADER = re.compile(r"^### ID: (\S+)$", re.MULTILINE)
+_WORD = re.compile(r"[a-z]{6,}")
+
+
+class FakeRateLimitError(Exception):
+    """Stand-in for openai.RateLimitError (the ranker retries on status_code 429)."""
+    status_code = 429
+
+
+def _tokens(text: str) -> int:
+    return len(text) // 4 + 1   # same estimate as llm_ranker.estimate_tokens
+
+
+class FakeChatModel(BaseChatModel):
+    model_name: str = "fake-llm"
+    latency: float = 0.2                   # seconds per call
+    latency_per_token: float = 0.0002      # extra seconds per completion token
+    malformed_rate: float = 0.0
+    rpm: Optional[float] = None            # None = no limit
+    tpm: Optional[float] = None
+
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _window: Any = PrivateAttr(default_factory=deque)   # (time, tokens) of calls in the last minute
+    _attempts: Any = PrivateAttr(default_factory=Counter)
+    usage: Dict[str, int] = {}
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.usage = {"calls": 0, "rate_limited": 0, "malformed": 0,
+                      "prompt_tokens": 0, "completion_tokens": 0}
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _admit(self, prompt_tokens: int) -> None:
+        """Record the call, or raise a 429 if it would exceed rpm/tpm."""
+        now = time.monotonic()
+        with self._lock:
+            while self._window and now - self._window[0][0] >= 60:
+                self._window.popleft()
+            used = sum(t for _, t in self._window)
+            if ((self.rpm is not None and len(self._window) + 1 > self.rpm)
+                    or (self.tpm is not None and used + prompt_tokens > self.tpm)):
+                self.usage["rate_limited"] += 1
+                raise FakeRateLimitError("Rate limit reached (fake backend)")
+            self._window.append((now, prompt_tokens))
+            self.usage["calls"] += 1
+            self.usage["prompt_tokens"] += prompt_tokens
+
+    def _malformed(self, prompt: str) -> bool:
+        if not self.malformed_rate:
+            return False
+        digest = zlib.crc32(prompt.encode("utf-8"))
+        with self._lock:
+            self._attempts[digest] += 1
+            attempt = self._attempts[digest]
+        roll = zlib.crc32(f"{digest}:{attempt}".encode()) / 0xFFFFFFFF
+        return roll < self.malformed_rate
+
+    @staticmethod
+    def _score(resume_words: set, job_text: str) -> Dict[str, Any]:
+        body = job_text.lstrip("\n").partition("\n")[2]   # skip the Company | Title | Location line
+        words = set(_WORD.findall(body.lower()))
+        shared = sorted(words & resume_words)
+        score = min(100, 20 + 5 * len(shared) + zlib.crc32(job_text.encode("utf-8")) % 20)
+        return {
+            "match_score": score,
+            "overlaps": shared[:3],
+            "gaps": sorted(words - resume_words)[:2],
+            "rationale": f"{len(shared)} résumé keywords appear in the posting.",
+            "remote_eligible": "remote" in words,
+        }
+
+    def _answer(self, prompt: str) -> Any:
+        parts = _JOB_HEADER.split(prompt)   # [preamble, id1, text1, id2, text2, ...]
+        if len(parts) > 1:   # BATCH_PROMPT
+            resume_words = set(_WORD.findall(parts[0].lower()))
+            return [{"id": job_id, **self._score(resume_words, text)}
+                    for job_id, text in zip(parts[1::2], parts[2::2])]
+        resume, _, job = prompt.rpartition("Job (")
+        return self._score(set(_WORD.findall(resume.lower())), job)
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None,
+                  **kwargs) -> ChatResult:
+        prompt = "\n".join(str(m.content) for m in messages)
+        prompt_tokens = _tokens(prompt)
+        self._admit(prompt_tokens)
+
+        answer = self._answer(prompt)
+        malformed = self._malformed(prompt)
+        if malformed:
+            with self._lock:
+                self.usage["malformed"] += 1
+        tools = kwargs.get("tools")
+        tool_calls = []
+        if tools:
+            if isinstance(answer, list):
+                answer = {"results": answer}
+            if malformed:   # schema-invalid arguments
+                (answer["results"][0] if "results" in answer else answer).pop("match_score", None)
+            text = json.dumps(answer)
+            tool_calls = [{"name": tools[0]["function"]["name"], "args": answer,
+                           "id": f"call_{zlib.crc32(text.encode()):08x}"}]
+        else:
+            text = json.dumps(answer)
+            if malformed:
+                text = text[: len(text) // 2]   # truncated JSON, as with a cut-off completion
+        completion_tokens = _tokens(text)
+        time.sleep(self.latency + self.latency_per_token * completion_tokens)
+
+        with self._lock:
+            self.usage["completion_tokens"] += completion_tokens
+        message = AIMessage(content="" if tool_calls else text, tool_calls=tool_calls, usage_metadata={
+            "input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        })
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def make_llm(backend: str = "openai", model: str = "gpt-4o-mini", **fake_options) -> BaseChatModel:
+    """
+    Chat model for `backend`. `fake_options` (latency, latency_per_token,
+    malformed_rate, rpm, tpm) only apply to the fake backend.
+    """
+    if backend == "openai":
+        from langchain_openai import ChatOpenAI
+        # no SDK retries: the ranker retries 429s, 5xx, 408/409 and connection errors itself
+        return ChatOpenAI(model=model, temperature=0, max_retries=0)
+    if backend == "fake":
+        return FakeChatModel(**{k: v for k, v in fake_options.items() if v is not None})
+    raise ValueError(f"Unknown LLM backend {backend!r}; expected one of {BACKENDS}")
@@ -0,0 +1,107 @@
+# llm_cache.py
+"""
+Disk-backed cache of LLM match results.
+
+Entries are keyed by a SHA-256 over everything that goes into the prompt:
+résumé text, normalized posting (company/title/location/description), the
+prompt template and the model name. Changing any of them is a cache miss.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+RESULT_KEYS = ("match_score", "overlaps", "gaps", "rationale", "remote_eligible")
+
+_WS = re.compile(r"\s+")
+
+
+def _normalize(text: Optional[str]) -> str:
+    return _WS.sub(" ", text or "").strip()
+
+
+def make_key(resume: str, company: str, title: str, location: Optional[str],
+             description: str, prompt_template: str, model: str) -> str:
+    h = hashlib.sha256()
+    for part in (resume, company, title, location, description, prompt_template, model):
+        h.update(_normalize(part).encode("utf-8"))
+        h.update(b"\x1f")  # field separator so ("ab","c") != ("a","bc")
+    return h.hexdigest()
+
+
+class MatchCache:
+    """
+    SQLite store of parsed match results with TTL and size-based eviction.
+
+    refresh=True ignores existing entries on read (forcing new LLM calls)
+    but still writes the fresh results back.
+    """
+
+    def __init__(self, path: str = ".cache/llm_matches.sqlite", ttl_days: float = 14,
+                 max_entries: int = 20000, refresh: bool = False):
+        self.path = path
+        self.ttl_seconds = ttl_days * 86400
+        self.max_entries = max_entries
+        self.refresh = refresh
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS matches ("
+            " key TEXT PRIMARY KEY,"
+            " result TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS matches_accessed ON matches(accessed)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            if self.refresh:
+                self.misses += 1
+                return None
+            row = self._conn.execute(
+                "SELECT result, created FROM matches WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE matches SET accessed = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        now = time.time()
+        payload = json.dumps({k: result[k] for k in RESULT_KEYS if k in result})
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO matches (key, result, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, payload, now, now),
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones beyond max_entries."""
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM matches WHERE created < ?", (cutoff,)).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM matches WHERE key IN ("
+                " SELECT key FROM matches ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
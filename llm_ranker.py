@@ -0,0 +1,402 @@
+# llm_ranker.py
+"""
+LLM ranking of filtered jobs against the résumé.
+
+Jobs are scored concurrently on a thread pool. A shared RateLimiter keeps
+requests/min and tokens/min under the account limits, 429s and transient
+errors (timeouts, connection errors, 5xx) are retried with jittered
+exponential backoff, and results come back in input order. Per-job failures
+are collected into `errors` when a list is passed in.
+
+With batch_size > 1 one prompt carries the résumé once plus several postings
+and the model returns a JSON array keyed by job ID. Entries the model drops
+or garbles are re-asked (a fully garbled batch is split in half) before the
+job is given up on.
+
+Answers go through match_schema: near-valid JSON is repaired locally and
+validated against the JobMatch schema, and only answers (or batch entries)
+that still don't fit are re-asked, up to PARSE_RETRIES / BATCH_RETRIES times.
+With structured=True the schema is also bound to the model through its
+native structured output (with_structured_output), so malformed answers
+become rare in the first place.
+"""
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.prompts import PromptTemplate
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from llm_backends import make_llm
+from llm_cache import MatchCache, make_key
+from match_schema import BatchAnswer, JobMatch, repair_json, validate_batch, validate_match
+from metrics import METRICS
+from models import Job
+from rate_limit import RateLimiter
+
+LLM_MODEL = "gpt-4o-mini"
+
+MATCH_PROMPT = """
+You are a career-matching assistant. Compare this résumé to the job posting.
+
+Return ONLY valid JSON with keys:
+- match_score (0-100, integer)
+- overlaps (list of bullet points)
+- gaps (list of bullet points)
+- rationale (string, 1–2 sentences)
+- remote_eligible (true/false)
+
+Résumé:
+{resume}
+
+Job (Company: {company} | Title: {title} | Location: {location}):
+{job}
+"""
+
+BATCH_PROMPT = """
+You are a career-matching assistant. Compare this résumé to EACH job posting below.
+
+Return ONLY a valid JSON array with exactly one object per job, each with keys:
+- id (the job's ID exactly as given)
+- match_score (0-100, integer)
+- overlaps (list of bullet points)
+- gaps (list of bullet points)
+- rationale (string, 1–2 sentences)
+- remote_eligible (true/false)
+
+Résumé:
+{resume}
+
+Jobs:
+{jobs}
+"""
+
+COMPLETION_TOKENS_ESTIMATE = 300   # reserved per job in the tokens/min bucket
+RATE_LIMIT_ATTEMPTS = 6            # tries per call on 429s and transient errors
+BATCH_TOKEN_BUDGET = 16000         # max estimated prompt tokens per batched call
+BATCH_RETRIES = 2                  # re-asks for jobs missing from a batch answer
+PARSE_RETRIES = 2                  # re-asks for a single-job answer that can't be parsed
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English)."""
+    return len(text) // 4 + 1
+
+
+def _is_rate_limited(e: BaseException) -> bool:
+    return getattr(e, "status_code", None) == 429 or type(e).__name__ == "RateLimitError"
+
+
+def _is_retryable(e: BaseException) -> bool:
+    """
+    429s plus what the OpenAI SDK's own retries covered before we turned them
+    off: connection errors, timeouts, 408, 409 and 5xx.
+    """
+    if _is_rate_limited(e):
+        return True
+    status = getattr(e, "status_code", None)
+    if isinstance(status, int) and (status in (408, 409) or status >= 500):
+        return True
+    # APITimeoutError subclasses APIConnectionError; match by name to avoid importing openai
+    return any(c.__name__ in ("APIConnectionError", "APITimeoutError") for c in type(e).__mro__)
+
+
+def _bind(llm, schema, structured: bool):
+    """`llm`, or `llm` bound to `schema` through the provider's native structured output."""
+    return llm.with_structured_output(schema, include_raw=True) if structured else llm
+
+
+def _answer(output) -> Tuple[Any, str]:
+    """
+    (data already parsed by the provider or None, raw answer text) from a
+    chain's output: a chat message, or with structured output
+    {"raw": message, "parsed": model or None, "parsing_error": ...}.
+    """
+    if not (isinstance(output, dict) and "raw" in output):
+        return None, output.content if hasattr(output, "content") else str(output)
+    if output.get("parsed") is not None:
+        return output["parsed"].model_dump(), ""
+    message = output["raw"]
+    calls = getattr(message, "tool_calls", None) or []
+    if calls:   # arguments parsed but failed validation; keep the valid parts
+        return calls[0]["args"], json.dumps(calls[0]["args"])
+    invalid = getattr(message, "invalid_tool_calls", None) or []
+    if invalid:
+        return None, invalid[0].get("args") or ""
+    return None, message.content
+
+
+def _match_row(job: Job, parsed: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "company": job.company,
+        "title": job.title,
+        "location": job.location,
+        "url": job.url,
+        "match_score": parsed.get("match_score", 0),
+        "overlaps": parsed.get("overlaps", []),
+        "gaps": parsed.get("gaps", []),
+        "rationale": parsed.get("rationale", ""),
+        "remote_eligible": parsed.get("remote_eligible", False),
+    }
+
+
+def _error(job: Job, stage: str, e: Exception, raw_output: str = "") -> Dict[str, Any]:
+    return {
+        "company": job.company,
+        "title": job.title,
+        "url": job.url,
+        "stage": stage,
+        "error": f"{type(e).__name__}: {e}",
+        "raw_output": raw_output,
+    }
+
+
+def _invoke(chain, inputs: Dict[str, Any], limiter: Optional[RateLimiter],
+            template: str = MATCH_PROMPT, n_jobs: int = 1):
+    """chain.invoke() under the rate limiter, retrying 429s and transient errors with backoff."""
+    prompt_tokens = estimate_tokens(template.format(**inputs))
+    cost = prompt_tokens + COMPLETION_TOKENS_ESTIMATE * n_jobs
+
+    def call():
+        if limiter is not None:
+            METRICS.count_llm("limiter_wait_s", limiter.acquire(cost))
+        start = time.perf_counter()
+        try:
+            output = chain.invoke(inputs)
+        except Exception as e:
+            if _is_rate_limited(e):
+                METRICS.count_llm("rate_limited")
+            raise
+        message = output["raw"] if isinstance(output, dict) and "raw" in output else output
+        usage = getattr(message, "usage_metadata", None) or {}
+        METRICS.record_llm_call(
+            time.perf_counter() - start,
+            usage.get("input_tokens", prompt_tokens),
+            usage.get("output_tokens", estimate_tokens(getattr(message, "content", str(message)))),
+            n_jobs,
+        )
+        return output
+
+    retryer = Retrying(
+        stop=stop_after_attempt(RATE_LIMIT_ATTEMPTS),
+        wait=wait_random_exponential(multiplier=2, max=60),
+        retry=retry_if_exception(_is_retryable),
+        reraise=True,
+    )
+    return retryer(call)
+
+
+def _rank_one(chain, job: Job, resume: str, cache: Optional[MatchCache],
+              limiter: Optional[RateLimiter],
+              model: str = LLM_MODEL) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Score one job. Returns (row, None) on success or (None, error)."""
+    key = None
+    if cache is not None:
+        key = make_key(resume, job.company, job.title, job.location,
+                       job.description, MATCH_PROMPT, model)
+        parsed = cache.get(key)
+        if parsed is not None:
+            return _match_row(job, parsed), None
+
+    inputs = {
+        "resume": resume,
+        "company": job.company,
+        "title": job.title,
+        "location": job.location,
+        "job": job.description
+    }
+    for _ in range(PARSE_RETRIES + 1):
+        try:
+            output = _invoke(chain, inputs, limiter)
+        except Exception as e:
+            return None, _error(job, "llm", e)
+
+        data, text = _answer(output)
+        try:
+            parsed = validate_match(data if data is not None else repair_json(text))
+            if parsed is not None:
+                break
+            last_error: Exception = ValueError("answer does not match the JobMatch schema")
+        except ValueError as e:
+            last_error = e
+        METRICS.count_llm("parse_failures")
+    else:
+        return None, _error(job, "parse", last_error, text)
+
+    if cache is not None:
+        cache.put(key, parsed)
+    return _match_row(job, parsed), None
+
+
+# -------------------------
+# Batched scoring
+# -------------------------
+def _format_job(job_id: str, job: Job) -> str:
+    return (f"### ID: {job_id}\n"
+            f"Company: {job.company} | Title: {job.title} | Location: {job.location}\n"
+            f"{job.description}\n")
+
+
+def _make_batches(items: List[Tuple[str, Job]], resume: str, batch_size: int,
+                  token_budget: int) -> List[List[Tuple[str, Job]]]:
+    """Greedily pack (id, job) pairs into batches of <= batch_size jobs and <= token_budget."""
+    base = estimate_tokens(BATCH_PROMPT.format(resume=resume, jobs=""))
+    batches: List[List[Tuple[str, Job]]] = []
+    current: List[Tuple[str, Job]] = []
+    used = base
+    for job_id, job in items:
+        cost = estimate_tokens(_format_job(job_id, job))
+        if current and (len(current) >= batch_size or used + cost > token_budget):
+            batches.append(current)
+            current, used = [], base
+        current.append((job_id, job))
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _rank_batch(chain, batch: List[Tuple[str, Job]], resume: str,
+                limiter: Optional[RateLimiter]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Score one batch. Returns (id -> parsed result, id -> error). Missing or
+    garbled entries are re-asked up to BATCH_RETRIES times; a chunk that comes
+    back with nothing usable is split in half first.
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    failures: Dict[str, Dict[str, Any]] = {}
+    attempts = {job_id: 0 for job_id, _ in batch}
+    queue = deque([batch])
+
+    while queue:
+        chunk = queue.popleft()
+        inputs = {"resume": resume, "jobs": "\n".join(_format_job(i, j) for i, j in chunk)}
+        try:
+            output = _invoke(chain, inputs, limiter, BATCH_PROMPT, len(chunk))
+        except Exception as e:
+            for job_id, job in chunk:
+                failures[job_id] = _error(job, "llm", e)
+            continue
+
+        data, text = _answer(output)
+        try:
+            got = validate_batch(data if data is not None else repair_json(text))
+            last_error: Exception = ValueError("missing from batch answer or not matching the schema")
+        except ValueError as e:
+            got, last_error = {}, e
+
+        for job_id, _ in chunk:
+            if job_id in got:
+                results[job_id] = got[job_id]
+        missing = [(i, j) for i, j in chunk if i not in got]
+        if missing:
+            METRICS.count_llm("parse_failures", len(missing))
+        retry = []
+        for job_id, job in missing:
+            attempts[job_id] += 1
+            if attempts[job_id] > BATCH_RETRIES:
+                failures[job_id] = _error(job, "parse", last_error, text)
+            else:
+                retry.append((job_id, job))
+        if not retry:
+            continue
+        if len(retry) == len(chunk) and len(chunk) > 1:
+            mid = len(chunk) // 2
+            queue.extend([retry[:mid], retry[mid:]])
+        else:
+            queue.append(retry)
+
+    return results, failures
+
+
+def _rank_batched(llm, jobs: List[Job], resume: str, cache: Optional[MatchCache],
+                  concurrency: int, limiter: Optional[RateLimiter], batch_size: int,
+                  token_budget: int,
+                  structured: bool = False) -> List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+    chain = PromptTemplate.from_template(BATCH_PROMPT) | _bind(llm, BatchAnswer, structured)
+    model = getattr(llm, "model_name", LLM_MODEL)
+    outcomes: List[Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]] = [(None, None)] * len(jobs)
+    keys: Dict[str, str] = {}
+    todo: List[Tuple[str, Job]] = []
+
+    for idx, job in enumerate(jobs):
+        job_id = f"job-{idx}"
+        if cache is not None:
+            keys[job_id] = make_key(resume, job.company, job.title, job.location,
+                                    job.description, BATCH_PROMPT, model)
+            parsed = cache.get(keys[job_id])
+            if parsed is not None:
+                outcomes[idx] = (_match_row(job, parsed), None)
+                continue
+        todo.append((job_id, job))
+
+    batches = _make_batches(todo, resume, batch_size, token_budget)
+    print(f"[INFO] Ranking {len(todo)} jobs in {len(batches)} batched calls")
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        answers = list(pool.map(lambda b: _rank_batch(chain, b, resume, limiter), batches))
+
+    for batch, (results, failures) in zip(batches, answers):
+        for job_id, job in batch:
+            idx = int(job_id.split("-")[1])
+            if job_id in results:
+                if cache is not None:
+                    cache.put(keys[job_id], results[job_id])
+                outcomes[idx] = (_match_row(job, results[job_id]), None)
+            else:
+                outcomes[idx] = (None, failures.get(job_id) or _error(job, "parse", ValueError("no result")))
+    return outcomes
+
+
+def rank_jobs_with_llm(jobs: List[Job], resume: str,
+                       cache: Optional[MatchCache] = None,
+                       concurrency: int = 1,
+                       limiter: Optional[RateLimiter] = None,
+                       errors: Optional[List[Dict[str, Any]]] = None,
+                       batch_size: int = 1,
+                       batch_token_budget: int = BATCH_TOKEN_BUDGET,
+                       llm=None,
+                       structured: bool = False) -> List[Dict[str, Any]]:
+    """
+    Score `jobs` with the LLM, `concurrency` calls at a time.
+
+    batch_size > 1 switches to batched prompts: up to `batch_size` postings
+    (and at most `batch_token_budget` estimated prompt tokens) per call.
+
+    Rows are returned in input order (failed jobs are omitted). If `errors`
+    is a list, one dict per failed job is appended to it; otherwise failures
+    are printed.
+
+    `llm` is any LangChain chat model (see llm_backends.make_llm); the
+    default is OpenAI's LLM_MODEL. Cache keys include its model_name, so a
+    fake backend never answers for the real one. structured=True binds the
+    JobMatch / BatchAnswer schema via the model's native structured output.
+    """
+    if llm is None:
+        llm = make_llm("openai", LLM_MODEL)
+    model = getattr(llm, "model_name", LLM_MODEL)
+
+    if batch_size > 1:
+        outcomes = _rank_batched(llm, jobs, resume, cache, concurrency, limiter,
+                                 batch_size, batch_token_budget, structured)
+    else:
+        prompt = PromptTemplate.from_template(MATCH_PROMPT)
+
+        chain = prompt | _bind(llm, JobMatch, structured)  # RunnableSequence replaces LLMChain
+
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            outcomes = list(pool.map(lambda j: _rank_one(chain, j, resume, cache, limiter, model), jobs))
+
+    results = []
+    for row, err in outcomes:
+        if row is not None:
+            results.append(row)
+        elif errors is not None:
+            errors.append(err)
+        else:
+            print(f"[ERROR] {err['stage']} failed for {err['title']} @ {err['company']}: {err['error']}")
+
+    if cache is not None:
+        print(f"[INFO] LLM cache: {cache.hits} hits, {cache.misses} misses")
+    return results
@@ -1,19 +1,23 @@
 import os
-import smtplib
-import json
-import requests
-import pandas as pd
-from dataclasses import dataclass
-from typing import Any, Dict, Optional, List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, List, Tuple
+from urllib.parse import urlparse
 from dotenv import load_dotenv
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import PromptTemplate
-from langchain.chains.llm import LLMChain
+# Only light modules load at import time. Scrapers load per board type
+# (board_types.py); langchain, numpy, pandas, pyarrow and SMTP load inside
+# the stage that needs them, so `python main.py scrape` never pays for the
+# LLM stack. benchmarks/import_time.py keeps this under a budget.
+from models import Job, PartialScrape, set_raw_mode
+from title_filter import TitleMatcher
+from job_store import JobStore, now_iso
+from board_types import BOARD_TYPES, FIXED_HOSTS
+from metrics import METRICS
+from checkpoints import STAGES, RunCheckpoints
 
-from models import Job
+if TYPE_CHECKING:
+    from dedup import Deduper
 
 load_dotenv()  # load .env config
 
@@ -26,42 +30,125 @@ SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASS = os.getenv("SMTP_PASS")
 ONLY_US_ROLES = os.getenv("ONLY_US_ROLES")  # e.g., "true"/"false"
 MIN_MATCH_SCORE = os.getenv("MIN_MATCH_SCORE")  # string, cast later if needed
+SCRAPE_MAX_WORKERS = os.getenv("SCRAPE_MAX_WORKERS")  # global cap on boards in flight
+SCRAPE_PER_HOST = os.getenv("SCRAPE_PER_HOST")  # cap on boards in flight per host
+LLM_CACHE = os.getenv("LLM_CACHE")  # "false" disables the match cache
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH") or ".cache/llm_matches.sqlite"
+LLM_CACHE_TTL_DAYS = os.getenv("LLM_CACHE_TTL_DAYS")
+LLM_CACHE_MAX_ENTRIES = os.getenv("LLM_CACHE_MAX_ENTRIES")
+LLM_CACHE_REFRESH = os.getenv("LLM_CACHE_REFRESH")  # "true" forces fresh LLM calls
+LLM_CONCURRENCY = os.getenv("LLM_CONCURRENCY")  # parallel LLM calls
+LLM_RPM = os.getenv("LLM_RPM")  # requests/min limit for the model
+LLM_TPM = os.getenv("LLM_TPM")  # tokens/min limit for the model
+LLM_BATCH_SIZE = os.getenv("LLM_BATCH_SIZE")  # >1 scores several postings per prompt
+LLM_BATCH_TOKEN_BUDGET = os.getenv("LLM_BATCH_TOKEN_BUDGET")  # prompt token cap per batch
+LLM_STRUCTURED = os.getenv("LLM_STRUCTURED")  # "true" -> schema-bound answers via native structured output
+LLM_BACKEND = os.getenv("LLM_BACKEND")  # openai | fake (local stand-in for load tests)
+FAKE_LLM_LATENCY = os.getenv("FAKE_LLM_LATENCY")  # seconds per fake call
+FAKE_LLM_MALFORMED_RATE = os.getenv("FAKE_LLM_MALFORMED_RATE")  # share of fake answers cut short (0-1)
+FAKE_LLM_RPM = os.getenv("FAKE_LLM_RPM")  # fake server's requests/min before it returns 429
+FAKE_LLM_TPM = os.getenv("FAKE_LLM_TPM")  # fake server's tokens/min before it returns 429
+PRERANK = os.getenv("PRERANK")  # "false" skips the local similarity stage
+PRERANK_TOP_K = os.getenv("PRERANK_TOP_K")  # max jobs sent on to the LLM
+PRERANK_MIN_SCORE = os.getenv("PRERANK_MIN_SCORE")  # min résumé similarity (0-1); per-page IDF when streaming, see prerank.py
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH") or ".cache/jobs.sqlite"
+INCREMENTAL = os.getenv("INCREMENTAL")  # "true" -> only new/changed postings go downstream
+ENRICH = os.getenv("ENRICH")  # "false" skips detail-page fetches for HTML postings
+ENRICH_WORKERS = os.getenv("ENRICH_WORKERS")  # detail pages fetched at once
+ENRICH_PER_HOST = os.getenv("ENRICH_PER_HOST")  # detail pages fetched at once per host
+ENRICH_CACHE_PATH = os.getenv("ENRICH_CACHE_PATH") or ".cache/job_details.sqlite"
+DESCRIPTION_MAX_TOKENS = os.getenv("DESCRIPTION_MAX_TOKENS")  # per-posting cap sent to the LLM; 0 = no cap
+DEDUP = os.getenv("DEDUP")  # "false" ranks duplicate postings separately
+DEDUP_THRESHOLD = os.getenv("DEDUP_THRESHOLD")  # title+description similarity (0-1) to merge
+JOB_RAW = os.getenv("JOB_RAW")  # drop | keep | spill: what to do with each posting's source payload
+STREAMING = os.getenv("STREAMING")  # "true" -> rank jobs while boards are still scraping
+STREAM_QUEUE_SIZE = os.getenv("STREAM_QUEUE_SIZE")  # pages buffered between stages
+STREAM_CHUNK_SIZE = os.getenv("STREAM_CHUNK_SIZE")  # jobs per ranking chunk
+METRICS_PATH = os.getenv("METRICS_PATH") or "output/metrics.json"
+CHECKPOINTS = os.getenv("CHECKPOINTS")  # "false" -> don't save stage outputs for --resume
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR") or ".cache/runs"
+CHECKPOINT_KEEP = os.getenv("CHECKPOINT_KEEP")  # checkpointed runs kept on disk
+SHARD_DIR = os.getenv("SHARD_DIR") or ".cache/shards"  # where `scrape --shard-*` writes and `merge` reads
+POLL_MIN_HOURS = os.getenv("POLL_MIN_HOURS")  # daemon: shortest per-board poll interval
+POLL_MAX_HOURS = os.getenv("POLL_MAX_HOURS")  # daemon: longest per-board poll interval
+POLL_START_HOURS = os.getenv("POLL_START_HOURS")  # daemon: interval for boards without history or poll_hours
+POLL_MAX_BACKOFF_HOURS = os.getenv("POLL_MAX_BACKOFF_HOURS")  # daemon: cap on retry delay for failing boards
+DIGEST_EVERY_HOURS = os.getenv("DIGEST_EVERY_HOURS")  # daemon: how often new matches are saved and e-mailed
+DAEMON_BATCH_SECONDS = os.getenv("DAEMON_BATCH_SECONDS")  # daemon: wait to batch new postings before ranking
+DAEMON_STATE_PATH = os.getenv("DAEMON_STATE_PATH") or ".cache/daemon.json"
 
 # Convert certain vars to expected types
 SMTP_PORT = int(SMTP_PORT) if SMTP_PORT else None
 MIN_MATCH_SCORE = float(MIN_MATCH_SCORE) if MIN_MATCH_SCORE else None
 ONLY_US_ROLES = ONLY_US_ROLES.lower() == "true" if ONLY_US_ROLES else False
+SCRAPE_MAX_WORKERS = int(SCRAPE_MAX_WORKERS) if SCRAPE_MAX_WORKERS else 8
+SCRAPE_PER_HOST = int(SCRAPE_PER_HOST) if SCRAPE_PER_HOST else 2
+LLM_CACHE = LLM_CACHE.lower() != "false" if LLM_CACHE else True
+LLM_CACHE_TTL_DAYS = float(LLM_CACHE_TTL_DAYS) if LLM_CACHE_TTL_DAYS else 14.0
+LLM_CACHE_MAX_ENTRIES = int(LLM_CACHE_MAX_ENTRIES) if LLM_CACHE_MAX_ENTRIES else 20000
+LLM_CACHE_REFRESH = LLM_CACHE_REFRESH.lower() == "true" if LLM_CACHE_REFRESH else False
+INCREMENTAL = INCREMENTAL.lower() == "true" if INCREMENTAL else False
+LLM_CONCURRENCY = int(LLM_CONCURRENCY) if LLM_CONCURRENCY else 8
+LLM_RPM = float(LLM_RPM) if LLM_RPM else 500.0
+LLM_TPM = float(LLM_TPM) if LLM_TPM else 200000.0
+LLM_BATCH_SIZE = int(LLM_BATCH_SIZE) if LLM_BATCH_SIZE else 1
+LLM_BATCH_TOKEN_BUDGET = int(LLM_BATCH_TOKEN_BUDGET) if LLM_BATCH_TOKEN_BUDGET else 16000
+LLM_STRUCTURED = LLM_STRUCTURED.lower() == "true" if LLM_STRUCTURED else False
+LLM_BACKEND = LLM_BACKEND.lower() if LLM_BACKEND else "openai"
+FAKE_LLM_LATENCY = float(FAKE_LLM_LATENCY) if FAKE_LLM_LATENCY else None
+FAKE_LLM_MALFORMED_RATE = float(FAKE_LLM_MALFORMED_RATE) if FAKE_LLM_MALFORMED_RATE else None
+FAKE_LLM_RPM = float(FAKE_LLM_RPM) if FAKE_LLM_RPM else None
+FAKE_LLM_TPM = float(FAKE_LLM_TPM) if FAKE_LLM_TPM else None
+PRERANK = PRERANK.lower() != "false" if PRERANK else True
+PRERANK_TOP_K = int(PRERANK_TOP_K) if PRERANK_TOP_K else 150
+PRERANK_MIN_SCORE = float(PRERANK_MIN_SCORE) if PRERANK_MIN_SCORE else None
+ENRICH = ENRICH.lower() != "false" if ENRICH else True
+ENRICH_WORKERS = int(ENRICH_WORKERS) if ENRICH_WORKERS else 8
+ENRICH_PER_HOST = int(ENRICH_PER_HOST) if ENRICH_PER_HOST else 4
+DESCRIPTION_MAX_TOKENS = int(DESCRIPTION_MAX_TOKENS) if DESCRIPTION_MAX_TOKENS else 1200
+DEDUP = DEDUP.lower() != "false" if DEDUP else True
+DEDUP_THRESHOLD = float(DEDUP_THRESHOLD) if DEDUP_THRESHOLD else 0.8
+JOB_RAW = JOB_RAW.lower() if JOB_RAW else "drop"
+STREAMING = STREAMING.lower() == "true" if STREAMING else False
+STREAM_QUEUE_SIZE = int(STREAM_QUEUE_SIZE) if STREAM_QUEUE_SIZE else 8
+STREAM_CHUNK_SIZE = int(STREAM_CHUNK_SIZE) if STREAM_CHUNK_SIZE else 16
+CHECKPOINTS = CHECKPOINTS.lower() != "false" if CHECKPOINTS else True
+CHECKPOINT_KEEP = int(CHECKPOINT_KEEP) if CHECKPOINT_KEEP else 7
+POLL_MIN_HOURS = float(POLL_MIN_HOURS) if POLL_MIN_HOURS else 1.0
+POLL_MAX_HOURS = float(POLL_MAX_HOURS) if POLL_MAX_HOURS else 24.0
+POLL_START_HOURS = float(POLL_START_HOURS) if POLL_START_HOURS else 6.0
+POLL_MAX_BACKOFF_HOURS = float(POLL_MAX_BACKOFF_HOURS) if POLL_MAX_BACKOFF_HOURS else 48.0
+DIGEST_EVERY_HOURS = float(DIGEST_EVERY_HOURS) if DIGEST_EVERY_HOURS else 24.0
+DAEMON_BATCH_SECONDS = float(DAEMON_BATCH_SECONDS) if DAEMON_BATCH_SECONDS else 60.0
 
 # -------------------------
-# Job dataclass
+# Baseline filter
 # -------------------------
-@dataclass
-class Job:
-    company: str
-    title: str
-    location: Optional[str]
-    url: str
-    description: str
-    raw: Dict[str, Any]
+TITLE_MATCHER = TitleMatcher.from_config()  # defaults; main() rebuilds from boards.yaml
 
 
-# -------------------------
-# Baseline filter
-# -------------------------
 def baseline_title_filter(job: Job) -> bool:
-    # Broad filter with smarter 'researcher' handling
-    KEYWORDS = [
-        "data","machine","ml","ai","analytics","insights","quant","science",
-        "research scientist","measurement","psychometric","assessment","statistician"
-    ]
-    title = job.title.lower()
-    if any(k in title for k in KEYWORDS):
-        return True
-    if "researcher" in title and any(x in title for x in [
-        "data","quant","ml","ai","analytics","psychometric","assessment"
-    ]):
-        return True
-    return False
+    # Word-boundary keyword match with smarter 'researcher' handling (see title_filter.py)
+    return TITLE_MATCHER.match(job.title)
+
+
+def board_search_terms(b: Dict[str, Any],
+                       default_terms: Optional[List[str]] = None) -> Optional[List[str]]:
+    """
+    Server-side search terms for a board, from its `search` key in boards.yaml:
+      search: true             -> `default_terms` (the title filter keywords)
+      search: [data, analytics] -> those terms
+      (absent/false)           -> None, fetch everything and filter locally
+    Scrapers whose source has no search ignore the terms.
+    """
+    search = b.get("search")
+    if not search:
+        return None
+    if search is True:
+        return list(default_terms or TITLE_MATCHER.search_terms())
+    if isinstance(search, str):
+        return [search]
+    return [str(t) for t in search]
 
 
 # -------------------------
@@ -73,164 +160,137 @@ def load_resume(path="data/resume.txt") -> str:
 
 
 # -------------------------
-# Greenhouse scraper
-# -------------------------
-def scrape_greenhouse(org: str, name: str) -> List[Job]:
-    jobs = []
-    url = f"https://boards-api.greenhouse.io/v1/boards/{org}/jobs"
-    try:
-        r = requests.get(url, timeout=30)
-        r.raise_for_status()
-        data = r.json()
-        for j in data.get("jobs", []):
-            jobs.append(Job(
-                company=name,
-                title=j.get("title", ""),
-                location=(j.get("location") or {}).get("name", ""),
-                url=j.get("absolute_url", ""),
-                description=j.get("content", ""),
-                raw=j
-            ))
-    except Exception as e:
-        print(f"[ERROR] Greenhouse scrape failed for {name}: {e}")
-    return jobs
-
-
-# -------------------------
-# Lever scraper
-# -------------------------
-def scrape_lever(org: str, name: str) -> List[Job]:
-    def safe_join(value):
-        """Normalize Lever fields into a comma-separated string."""
-        if isinstance(value, list):
-            return ", ".join([str(x) for x in value if x])
-        return str(value) if value else ""
-
-    jobs = []
-    url = f"https://api.lever.co/v0/postings/{org}?mode=json"
-    try:
-        r = requests.get(url, timeout=30)
-        r.raise_for_status()
-        for j in r.json():
-            categories = j.get("categories", {})
-
-            # normalize each category field
-            location = safe_join(categories.get("location"))
-            team = safe_join(categories.get("team"))
-            commitment = safe_join(categories.get("commitment"))
-
-            jobs.append(Job(
-                company=name,
-                title=j.get("text", ""),
-                location=", ".join([x for x in [location, team, commitment] if x]),
-                url=j.get("hostedUrl", ""),
-                description=j.get("descriptionPlain", ""),
-                raw=j
-            ))
-    except Exception as e:
-        print(f"[ERROR] Lever scrape failed for {name}: {e}")
-    return jobs
-
-
-
-# -------------------------
-# Workday scraper (dispatcher)
+# Board dispatch
 # -------------------------
-from workday_scraper import scrape_workday
+def iter_board(b: Dict[str, Any], default_search: Optional[List[str]] = None) -> Iterator[List[Job]]:
+    """
+    Run the scraper registered for a boards.yaml entry's type (board_types.py),
+    yielding jobs page by page where the scraper pages (Workday, McGraw Hill,
+    generic HTML search) and as one list otherwise. Raises PartialScrape,
+    after the pages it got, when the board was only partly scraped.
+    """
+    adapter = BOARD_TYPES.get(b["type"])
+    if adapter is None:
+        print(f"[WARN] Unknown board type '{b['type']}' for {b['name']}, skipping.")
+        return
+    yield from adapter(b, board_search_terms(b, default_search))
+
+
+def scrape_board(b: Dict[str, Any], default_search: Optional[List[str]] = None) -> List[Job]:
+    """Run the scraper matching a single boards.yaml entry; raises PartialScrape like iter_board()."""
+    return [job for page in iter_board(b, default_search) for job in page]
+
+
+def board_host(b: Dict[str, Any]) -> str:
+    """Host a board's requests go to; used as the per-host concurrency key."""
+    typ = b["type"]
+    if typ in FIXED_HOSTS:
+        return FIXED_HOSTS[typ]
+    url = b.get("url") or b.get("url_api") or ""
+    return urlparse(url).netloc.lower() or typ
 
-# -------------------------
-# HTML scraper (dispatcher)
-# -------------------------
-from html_scraper import scrape_html, scrape_savvas
-
-# -------------------------
-# Icims scraper (dispatcher)
-# -------------------------
-from icims_scraper import scrape_icims
 
 # -------------------------
-# McGraw Hill scraper (dispatcher)
+# Concurrent scraping engine
 # -------------------------
-from mcgraw_scraper import scrape_mcgrawhill
-
-# -------------------------
-# Rank jobs with LLM
-# -------------------------
-def rank_jobs_with_llm(jobs: List[Job], resume: str) -> List[Dict[str, Any]]:
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0)
-
-    prompt = PromptTemplate.from_template("""
-You are a career-matching assistant. Compare this résumé to the job posting.
-
-Return ONLY valid JSON with keys:
-- match_score (0-100, integer)
-- overlaps (list of bullet points)
-- gaps (list of bullet points)
-- rationale (string, 1–2 sentences)
-- remote_eligible (true/false)
-
-Résumé:
-{resume}
-
-Job (Company: {company} | Title: {title} | Location: {location}):
-{job}
-""")
-
-    chain = prompt | llm  # RunnableSequence replaces LLMChain
-
-    results = []
-    for job in jobs:
-        try:
-            output = chain.invoke({
-                "resume": resume,
-                "company": job.company,
-                "title": job.title,
-                "location": job.location,
-                "job": job.description
-            })
-
-            # With ChatOpenAI, output is a ChatMessage — get the text
-            text = output.content if hasattr(output, "content") else str(output)
-
-            # --- new step: clean markdown fences ---
-            text = text.strip()
-            if text.startswith("```"):
-                # remove leading/trailing triple backticks & optional "json"
-                text = text.strip("`")
-                if text.lower().startswith("json"):
-                    text = text[4:].strip()
-                # also remove trailing ``` if still present
-                if text.endswith("```"):
-                    text = text[:-3].strip()
-
+def scrape_boards(
+    boards: List[Dict[str, Any]],
+    max_workers: int = 8,
+    per_host: int = 2,
+    default_search: Optional[List[str]] = None,
+    on_page: Optional[Callable[[int, List[Job]], None]] = None,
+    collect: bool = True,
+) -> Tuple[List[Job], Dict[str, int]]:
+    """
+    Scrape all boards on a thread pool.
+
+    At most `max_workers` boards run at once, and at most `per_host` of them
+    target the same host, so shared ATS hosts (Greenhouse, Lever) are not
+    hammered. Boards waiting on a busy host never hold a worker slot.
+
+    Jobs and qc_report come back in boards.yaml order regardless of which
+    board finishes first, so output stays reproducible.
+
+    `on_page(board_index, jobs)` is called from the worker threads as each
+    page arrives; it may block, which holds that board's worker (backpressure).
+    With `collect=False` jobs are only handed to `on_page`, not kept.
+    """
+    max_workers = max(1, max_workers)
+    per_host = max(1, per_host)
+
+    pending: Dict[str, deque] = {}
+    for idx, b in enumerate(boards):
+        pending.setdefault(board_host(b), deque()).append(idx)
+    active: Dict[str, int] = {host: 0 for host in pending}
+    results: List[Optional[List[Job]]] = [None] * len(boards)
+    counts: List[int] = [0] * len(boards)
+
+    def run_board(idx: int) -> List[Job]:
+        kept: List[Job] = []
+        with METRICS.board(boards[idx]["name"]) as m:
             try:
-                parsed = json.loads(text)
-            except Exception as e:
-                print(f"[ERROR] JSON parse failed for {job.title} @ {job.company}: {e}")
-                print("Raw output:\n", text)
-                continue  # skip this job
-
-            results.append({
-                "company": job.company,
-                "title": job.title,
-                "location": job.location,
-                "url": job.url,
-                "match_score": parsed.get("match_score", 0),
-                "overlaps": parsed.get("overlaps", []),
-                "gaps": parsed.get("gaps", []),
-                "rationale": parsed.get("rationale", ""),
-                "remote_eligible": parsed.get("remote_eligible", False),
-            })
-        except Exception as e:
-            print(f"[ERROR] LLM failed for {job.title} @ {job.company}: {e}")
-
-    return results
+                for page in iter_board(boards[idx], default_search):
+                    counts[idx] += len(page)
+                    m["jobs"] = counts[idx]
+                    if on_page is not None and page:
+                        on_page(idx, page)
+                    if collect:
+                        kept.extend(page)
+            except PartialScrape as e:
+                print(f"[WARN] {boards[idx]['name']}: only partly scraped ({e}); "
+                      f"keeping its {counts[idx]} jobs, closing none of its postings")
+                counts[idx] = 0  # partial board: don't let the job store close its postings
+        return kept
+
+    def next_board() -> Optional[int]:
+        # lowest board index whose host still has a free slot
+        ready = [q[0] for host, q in pending.items() if q and active[host] < per_host]
+        return min(ready) if ready else None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        running = {}
+        done_count = 0
+        while True:
+            while len(running) < max_workers:
+                idx = next_board()
+                if idx is None:
+                    break
+                host = board_host(boards[idx])
+                pending[host].popleft()
+                active[host] += 1
+                running[pool.submit(run_board, idx)] = idx
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                idx = running.pop(fut)
+                b = boards[idx]
+                active[board_host(b)] -= 1
+                try:
+                    jobs = fut.result()
+                except Exception as e:
+                    print(f"[ERROR] Scrape failed for {b['name']}: {e}")
+                    jobs = []
+                    counts[idx] = 0  # partial board: don't let the job store close its postings
+                results[idx] = jobs
+                done_count += 1
+                print(f"[INFO] {b['name']}: {counts[idx]} jobs ({done_count}/{len(boards)} boards done)")
+
+    all_jobs: List[Job] = []
+    qc_report: Dict[str, int] = {}
+    for b, jobs, count in zip(boards, results, counts):
+        all_jobs.extend(jobs or [])
+        qc_report[b["name"]] = count
+    return all_jobs, qc_report
 
 
 # -------------------------
 # Save results
 # -------------------------
 def save_results(rows: List[Dict[str, Any]]):
+    import pandas as pd
     os.makedirs("output", exist_ok=True)
     df = pd.DataFrame(rows)
     df.to_csv("output/matches.csv", index=False)
@@ -254,9 +314,12 @@ def make_markdown(rows: List[Dict[str, Any]]) -> str:
 # -------------------------
 # Email digest
 # -------------------------
-from email.utils import formataddr
-
 def send_email_digest(rows: List[Dict[str, Any]]):
+    import smtplib
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    from email.utils import formataddr
+
     top = sorted(rows, key=lambda x: x["match_score"], reverse=True)[:75]
 
     msg = MIMEMultipart("alternative")
@@ -292,69 +355,579 @@ def send_email_digest(rows: List[Dict[str, Any]]):
 # -------------------------
 # Orchestrator
 # -------------------------
-def main():
+def scrape_stage(boards, matcher, store, merge: bool = False) -> Tuple[List[Job], Dict[str, int]]:
+    """
+    Scrape every board (or, with `merge`, combine the shards in SHARD_DIR)
+    and sync the job store. Returns the jobs to pass on (only new/changed
+    ones with INCREMENTAL) and the per-board QC counts.
+    """
+    if merge:
+        from shards import import_workday_caches, merge_shards
+        with METRICS.stage("merge shards", len(boards)) as m:
+            try:
+                merged = merge_shards(SHARD_DIR, boards)
+            except (FileNotFoundError, ValueError) as e:
+                raise SystemExit(f"[ERROR] {e}")
+            m["out"] = len(merged.jobs)
+        print(f"[INFO] Shards: {merged.summary()}")
+        tenants = import_workday_caches(SHARD_DIR)
+        if tenants:
+            print(f"[INFO] Workday cache: {tenants} tenant updates from the shards")
+        if merged.missing:
+            print(f"[WARN] Boards of shards {merged.missing} were not scraped; their postings stay open")
+        all_jobs, qc_report = merged.jobs, merged.qc_report
+    else:
+        with METRICS.stage("scrape", len(boards)) as m:
+            all_jobs, qc_report = scrape_boards(
+                boards, max_workers=SCRAPE_MAX_WORKERS, per_host=SCRAPE_PER_HOST,
+                default_search=matcher.search_terms(),
+            )
+            m["out"] = len(all_jobs)
+
+    # --- Job store: new / changed / closed since last run ---
+    with METRICS.stage("job store", len(all_jobs)) as m:
+        sync = store.sync(all_jobs, [c for c, n in qc_report.items() if n > 0])
+        m["out"] = len(sync.fresh)
+    print(f"[INFO] Job store: {sync.summary()}")
+    if INCREMENTAL:
+        all_jobs = sync.fresh
+    return all_jobs, qc_report
+
+
+def scrape_shard(boards, matcher, index: int, count: int) -> None:
+    """Scrape one shard of the boards into SHARD_DIR for a later `merge` (see shards.py)."""
+    from shards import shard_boards, write_shard
+    mine = shard_boards(boards, index, count)
+    print(f"[INFO] Shard {index} of {count}: {len(mine)} of {len(boards)} boards")
+    with METRICS.stage("scrape", len(mine)) as m:
+        jobs, qc_report = scrape_boards(
+            mine, max_workers=SCRAPE_MAX_WORKERS, per_host=SCRAPE_PER_HOST,
+            default_search=matcher.search_terms(),
+        )
+        m["out"] = len(jobs)
+    path = write_shard(SHARD_DIR, index, count, jobs, qc_report)
+    print(f"[INFO] Shard {index} of {count}: {len(jobs)} jobs written to {path}")
+    print(METRICS.summary_table(METRICS.write(METRICS_PATH)))
+
+
+def select_stage(all_jobs, matcher, resume, prepare, local_scores) -> List[Job]:
+    """Filter, clean up and pre-rank the whole set; returns the jobs to send to the LLM."""
+    with METRICS.stage("title filter", len(all_jobs)) as m:
+        filtered, rule_hits = matcher.filter(all_jobs)
+        m["out"] = len(filtered)
+    print(f"[INFO] {len(filtered)} jobs passed baseline filter out of {len(all_jobs)}")
+    for rule, hits in rule_hits.items():
+        print(f"[INFO]   {rule}: {hits}")
+
+    filtered = prepare(filtered)
+
+    # --- Local similarity pre-ranking ---
+    if PRERANK:
+        from prerank import select_candidates
+        with METRICS.stage("local pre-rank", len(filtered)) as m:
+            candidates, scores = select_candidates(
+                filtered, resume, top_k=PRERANK_TOP_K, min_score=PRERANK_MIN_SCORE
+            )
+            m["out"] = len(candidates)
+        local_scores.update({(j.company, j.title, j.url): s for j, s in zip(candidates, scores)})
+        print(f"[INFO] {len(candidates)} of {len(filtered)} jobs kept by local pre-ranking")
+        filtered = candidates
+
+    return filtered
+
+
+def checkpoint_selection(run: RunCheckpoints, count: int, deduper: Optional["Deduper"]) -> None:
+    """Save duplicate clusters and mark the filter stage done (selected jobs are already written)."""
+    run.save_clusters(deduper.clusters() if deduper is not None else [])
+    run.mark("filter", jobs=count)
+
+
+def stream_rank(boards, matcher, resume, store, prepare, rank, local_scores,
+                run: Optional[RunCheckpoints] = None, deduper: Optional["Deduper"] = None):
+    """
+    Scrape, filter and rank concurrently (see pipeline.py): postings are
+    ranked while other boards are still downloading, and only the current
+    pages and in-flight chunks are held in memory.
+
+    Pre-ranking only applies PRERANK_MIN_SCORE here; a top-K cut needs the
+    whole job set and is skipped. With `run`, scraped and selected jobs are
+    checkpointed page by page.
+    """
+    from pipeline import run_pipeline
+    from prerank import select_candidates
+    started = now_iso()
+    scraped = run.job_writer("scraped") if run is not None else None
+    selected = run.job_writer("selected") if run is not None else None
+    stats = {"new": 0, "changed": 0, "unchanged": 0}
+    rule_hits: Dict[str, int] = {}
+
+    def scrape(on_page):
+        with METRICS.stage("scrape", len(boards)) as m:
+            _, qc = scrape_boards(
+                boards, max_workers=SCRAPE_MAX_WORKERS, per_host=SCRAPE_PER_HOST,
+                default_search=matcher.search_terms(), on_page=on_page, collect=False,
+            )
+            m["out"] = sum(qc.values())
+        return qc
+
+    def select(page: List[Job]) -> List[Job]:
+        with METRICS.stage("job store", len(page)) as m:
+            sync = store.observe(page)
+            m["out"] = len(sync.fresh)
+        for k in stats:
+            stats[k] += len(getattr(sync, k))
+        if INCREMENTAL:
+            page = sync.fresh
+        if scraped is not None:
+            scraped.write(page)
+        with METRICS.stage("title filter", len(page)) as m:
+            kept, hits = matcher.filter(page)
+            m["out"] = len(kept)
+        for rule, n in hits.items():
+            rule_hits[rule] = rule_hits.get(rule, 0) + n
+        kept = prepare(kept)
+        if PRERANK and PRERANK_MIN_SCORE is not None and kept:
+            with METRICS.stage("local pre-rank", len(kept)) as m:
+                kept, scores = select_candidates(kept, resume, min_score=PRERANK_MIN_SCORE)
+                m["out"] = len(kept)
+            local_scores.update({(j.company, j.title, j.url): s for j, s in zip(kept, scores)})
+        if selected is not None:
+            selected.write(kept, local_scores)
+        return kept
+
+    result = run_pipeline(scrape, select, rank,
+                          queue_size=STREAM_QUEUE_SIZE, chunk_size=STREAM_CHUNK_SIZE)
+    if run is not None:
+        scraped.close()
+        selected.close()
+        run.mark("scrape", jobs=scraped.count, qc_report=result.qc_report)
+        checkpoint_selection(run, selected.count, deduper)
+
+    closed = store.close_stale([c for c, n in result.qc_report.items() if n > 0], started)
+    print(f"[INFO] Job store: {stats['new']} new, {stats['changed']} changed, "
+          f"{stats['unchanged']} unchanged, {len(closed)} closed")
+    print(f"[INFO] {result.selected} jobs selected for ranking out of {result.scraped}")
+    for rule, hits in sorted(rule_hits.items()):
+        print(f"[INFO]   {rule}: {hits}")
+    return result.rows, result.qc_report
+
+
+def make_prepare(details, deduper: Optional["Deduper"]) -> Callable[[List[Job]], List[Job]]:
+    def prepare(jobs: List[Job]) -> List[Job]:
+        """
+        Fill in placeholder descriptions from detail pages, clean and trim
+        every description, then keep one posting per duplicate cluster.
+        """
+        from enrich import enrich_jobs
+        from normalize import normalize_jobs
+        if details is not None:
+            with METRICS.stage("enrich", len(jobs)) as m:
+                stats = enrich_jobs(jobs, details, max_workers=ENRICH_WORKERS, per_host=ENRICH_PER_HOST)
+                m["out"] = stats["fetched"] + stats["revalidated"]
+            if any(stats.values()):
+                print(f"[INFO] Detail pages: {stats['fetched']} fetched, "
+                      f"{stats['revalidated']} unchanged (304), {stats['failed']} failed")
+        with METRICS.stage("normalize", len(jobs)) as m:
+            saved = normalize_jobs(jobs, DESCRIPTION_MAX_TOKENS)
+            m["out"] = len(jobs)
+        if saved:
+            print(f"[INFO] Description clean-up saved ~{saved} input tokens")
+        if deduper is None:
+            return jobs
+        with METRICS.stage("dedup", len(jobs)) as m:
+            jobs = deduper.add(jobs)
+            m["out"] = len(jobs)
+        return jobs
+    return prepare
+
+
+def make_rank(resume: str, cache, limiter, llm,
+              errors: List[Dict[str, Any]]) -> Callable[[List[Job]], List[Dict[str, Any]]]:
+    def rank(jobs: List[Job]) -> List[Dict[str, Any]]:
+        from llm_ranker import rank_jobs_with_llm
+        with METRICS.stage("llm rank", len(jobs)) as m:
+            rows = rank_jobs_with_llm(
+                jobs, resume, cache=cache,
+                concurrency=LLM_CONCURRENCY,
+                limiter=limiter,
+                errors=errors,
+                batch_size=LLM_BATCH_SIZE,
+                batch_token_budget=LLM_BATCH_TOKEN_BUDGET,
+                llm=llm,
+                structured=LLM_STRUCTURED,
+            )
+            m["out"] = len(rows)
+        return rows
+    return rank
+
+
+def make_llm_resources() -> Tuple[Any, Any, Any]:
+    """The match cache (None with LLM_CACHE=false), rate limiter and chat model for ranking."""
+    from llm_backends import make_llm
+    from llm_cache import MatchCache
+    from llm_ranker import LLM_MODEL
+    from rate_limit import RateLimiter
+    cache = None
+    if LLM_CACHE:
+        cache = MatchCache(LLM_CACHE_PATH, ttl_days=LLM_CACHE_TTL_DAYS,
+                           max_entries=LLM_CACHE_MAX_ENTRIES, refresh=LLM_CACHE_REFRESH)
+    limiter = RateLimiter(LLM_RPM, LLM_TPM)
+    llm = make_llm(LLM_BACKEND, LLM_MODEL, latency=FAKE_LLM_LATENCY,
+                   malformed_rate=FAKE_LLM_MALFORMED_RATE, rpm=FAKE_LLM_RPM, tpm=FAKE_LLM_TPM)
+    return cache, limiter, llm
+
+
+def main(run_id: Optional[str] = None, start: Optional[str] = None,
+         stop: str = "output", email: Optional[bool] = None,
+         shard: Optional[Tuple[int, int]] = None, merge: bool = False):
+    """
+    Run the pipeline. With `run_id` (a checkpointed run, or "latest") the run
+    continues from `start`, by default its first unfinished stage, reading
+    the previous stage's saved output instead of scraping again. The run ends
+    after the `stop` stage. `email` forces the digest on or off; by default
+    it is sent when EMAIL_FROM and EMAIL_TO are set.
+
+    `shard=(index, count)` only scrapes that shard of the boards into
+    SHARD_DIR; a later run with `merge` takes the shards in place of scraping.
+
+    Each stage's dependencies (scrapers, numpy, langchain, pandas, SMTP) are
+    imported only if that stage runs.
+    """
     import yaml
+    configured = bool(os.getenv("EMAIL_FROM") and os.getenv("EMAIL_TO"))
+    if email and not configured:
+        raise SystemExit("[ERROR] E-mail needs EMAIL_FROM, EMAIL_TO and the SMTP_* settings")
+    emailed = configured if email is None else email
+    METRICS.reset()
     with open("boards.yaml", "r") as f:
-        boards = yaml.safe_load(f)["companies"]
-
-    resume = load_resume()
-    all_jobs: List[Job] = []
-    qc_report = {}  # NEW
-
-    for b in boards:
-        name, typ = b["name"], b["type"]
-        org = b.get("org", "")
-        jobs = []
-
-        if typ == "greenhouse":
-            jobs = scrape_greenhouse(org, name)
-        elif typ == "lever":
-            jobs = scrape_lever(org, name)
-        elif typ == "workday":
-            jobs = scrape_workday(b.get("url", ""), name)
-        elif typ == "icims":
-            jobs = scrape_icims(b.get("url", ""), name)
-        elif typ == "html":
-            jobs = scrape_html(b.get("url", ""), name, org)
-        elif typ == "mcgrawhill":  # <-- NEW
-            jobs = scrape_mcgrawhill(b.get("url_api", ""), name)
-        elif typ == "savvas":
-            jobs = scrape_savvas(b.get("url", ""), name)
-
-        all_jobs.extend(jobs)
-        qc_report[name] = len(jobs)
+        config = yaml.safe_load(f)
+    boards = config["companies"]
+    matcher = TitleMatcher.from_config(config.get("filter"))
+    set_raw_mode(JOB_RAW)
+    if (shard or merge) and run_id:
+        raise SystemExit("[ERROR] Shards are scraped and merged in new runs, not resumed ones")
+    if shard is not None:
+        scrape_shard(boards, matcher, *shard)
+        return
+
+    run: Optional[RunCheckpoints] = None
+    if run_id:
+        try:
+            run = RunCheckpoints.open(CHECKPOINT_DIR, run_id)
+        except FileNotFoundError as e:
+            raise SystemExit(f"[ERROR] {e}")
+        start = start or run.next_stage() or "output"
+        before = STAGES[STAGES.index(start) - 1] if start != "scrape" else None
+        if before and not run.done(before):
+            raise SystemExit(f"[ERROR] Run {run.run_id} has no finished {before} stage to resume from")
+        print(f"[INFO] Resuming run {run.run_id} from the {start} stage")
+    elif CHECKPOINTS:
+        run = RunCheckpoints(CHECKPOINT_DIR)
+        RunCheckpoints.prune(CHECKPOINT_DIR, CHECKPOINT_KEEP)
+        print(f"[INFO] Run {run.run_id}: checkpoints in {run.path}")
+    elif stop != "output":
+        raise SystemExit(f"[ERROR] Stopping after the {stop} stage needs CHECKPOINTS=true")
+    stage = STAGES.index(start or "scrape")
+    todo = STAGES[stage:STAGES.index(stop) + 1]   # stages this call runs
+    if not todo:
+        raise SystemExit(f"[ERROR] Cannot stop at {stop} when starting from {STAGES[stage]}")
+
+    resume = load_resume() if "filter" in todo or "rank" in todo else ""
+    store = JobStore(JOB_STORE_PATH) if "scrape" in todo else None
+    cache = limiter = llm = None
+    if "rank" in todo:
+        cache, limiter, llm = make_llm_resources()
+    rank_errors: List[Dict[str, Any]] = []
+    local_scores: Dict[Tuple[str, str, str], float] = {}
+    details = deduper = None
+    if "filter" in todo:
+        from enrich import DetailCache
+        if ENRICH:
+            details = DetailCache(ENRICH_CACHE_PATH)
+        if DEDUP:
+            from dedup import Deduper
+            deduper = Deduper(threshold=DEDUP_THRESHOLD)
+
+    prepare = make_prepare(details, deduper)
+    rank = make_rank(resume, cache, limiter, llm, rank_errors)
+
+    if stage == 0 and "rank" in todo and STREAMING and not merge:
+        rows, qc_report = stream_rank(boards, matcher, resume, store, prepare, rank, local_scores,
+                                      run, deduper)
+    else:
+        if stage == 0:
+            jobs, qc_report = scrape_stage(boards, matcher, store, merge)
+            if run is not None:
+                run.save_jobs("scraped", jobs)   # before enrichment/clean-up edit them in place
+                run.mark("scrape", jobs=len(jobs), qc_report=qc_report)
+            if merge:
+                from shards import clear_shards
+                clear_shards(SHARD_DIR)   # merged; don't pick them up again next run
+        else:
+            qc_report = run.info("scrape").get("qc_report", {})
+        if stage == 1:
+            jobs, _ = run.load_jobs("scraped")
+            print(f"[INFO] Loaded {len(jobs)} scraped jobs from run {run.run_id}")
+
+        if "filter" in todo:
+            selected = select_stage(jobs, matcher, resume, prepare, local_scores)
+            if run is not None:
+                run.save_jobs("selected", selected, local_scores)
+                checkpoint_selection(run, len(selected), deduper)
+        elif stage == 2:
+            selected, scores = run.load_jobs("selected")
+            local_scores.update(scores)
+            print(f"[INFO] Loaded {len(selected)} selected jobs from run {run.run_id}")
+
+        if "rank" in todo:
+            rows = rank(selected)
+        elif stage == 3:
+            rows = run.load_rows()
+            print(f"[INFO] Loaded {len(rows)} ranked rows from run {run.run_id}")
+    if deduper is not None:
+        print(f"[INFO] Dedup: {deduper.summary()}")
+    if store is not None:
+        store.close()
+    if details is not None:
+        details.evict()
+        details.close()
+
+    if "rank" in todo:
+        for r in rows:
+            r["local_score"] = local_scores.get((r["company"], r["title"], r["url"]))
+        if run is not None:
+            run.save_rows(rows)
+            run.mark("rank", rows=len(rows), errors=rank_errors)
+    elif stage == 3:
+        rank_errors = run.info("rank").get("errors", [])
+    if rank_errors:
+        print(f"[WARN] {len(rank_errors)} jobs could not be ranked:")
+        for err in rank_errors:
+            print(f"  - {err['title']} @ {err['company']} ({err['stage']}): {err['error']}")
+    if getattr(llm, "usage", None):
+        print("[INFO] Fake LLM usage: " + ", ".join(f"{k}={v}" for k, v in llm.usage.items()))
+    if cache is not None:
+        METRICS.count_llm("cache_hits", cache.hits)
+        METRICS.count_llm("cache_misses", cache.misses)
+        cache.evict()
+        cache.close()
 
     # --- QC check ---
     for company, count in qc_report.items():
         if count == 0:
             print(f"[QC WARNING] {company} returned 0 jobs! Check scraper or URL.")
 
-    """for b in boards:
-        name, typ = b["name"], b["type"]
-        org = b.get("org", "")
-        if typ == "greenhouse":
-            all_jobs.extend(scrape_greenhouse(org, name))
-        elif typ == "lever":
-            all_jobs.extend(scrape_lever(org, name))
-        elif typ == "custom":
-            all_jobs.extend(scrape_workday(org, name))
-        elif typ == "html":
-            all_jobs.extend(scrape_html(b.get("url", ""), name, org))"""
-
-    filtered = [j for j in all_jobs if baseline_title_filter(j)]
-    print(f"[INFO] {len(filtered)} jobs passed baseline filter out of {len(all_jobs)}")
-
-    rows = rank_jobs_with_llm(filtered, resume)
+    if "output" not in todo:
+        print(METRICS.summary_table(METRICS.write(METRICS_PATH)))
+        print(f"[INFO] Stopped after the {stop} stage; continue with "
+              f"`python main.py --resume {run.run_id}`")
+        return
+
+    if stage >= 2 and DEDUP:
+        from dedup import Deduper
+        deduper = Deduper.from_clusters(run.load_clusters())   # clusters found by the original run
+    if deduper is not None:
+        rows = deduper.fan_out(rows)
+    if MIN_MATCH_SCORE is not None:
+        kept = [r for r in rows if (r.get("match_score") or 0) >= MIN_MATCH_SCORE]
+        print(f"[INFO] {len(kept)} of {len(rows)} matches at or above MIN_MATCH_SCORE={MIN_MATCH_SCORE:g}")
+        rows = kept
     print("LLM rows:", rows)
     # OR safer fallback (recommended):
     #if not rows:
      #   print("[WARN] Falling back to baseline filtered jobs")
       #  rows = filtered
-    save_results(rows)
+    with METRICS.stage("save results", len(rows)) as m:
+        save_results(rows)
+        m["out"] = len(rows)
+    print(METRICS.summary_table(METRICS.write(METRICS_PATH)))
 
-    if os.getenv("EMAIL_FROM") and os.getenv("EMAIL_TO"):
+    if emailed:
         send_email_digest(rows)
+    if run is not None:
+        run.mark("output", rows=len(rows), emailed=emailed)
+
+
+def daemon(duration: Optional[float] = None) -> None:
+    """
+    Long-running mode (see scheduler.py): each board is polled on its own
+    churn-adapted interval, new postings are ranked as soon as they are
+    found, and matches go out in a digest every DIGEST_EVERY_HOURS.
+    """
+    import threading
+    import yaml
+    from enrich import DetailCache
+    from scheduler import Scheduler
+    with open("boards.yaml", "r") as f:
+        config = yaml.safe_load(f)
+    boards = config["companies"]
+    matcher = TitleMatcher.from_config(config.get("filter"))
+    set_raw_mode(JOB_RAW)
+    default_search = matcher.search_terms()
+
+    resume = load_resume()
+    store = JobStore(JOB_STORE_PATH)
+    store_lock = threading.Lock()   # polls sync from several threads
+    cache, limiter, llm = make_llm_resources()
+    details = DetailCache(ENRICH_CACHE_PATH) if ENRICH else None
+
+    def poll(b: Dict[str, Any]) -> Tuple[List[Job], int]:
+        jobs: List[Job] = []
+        complete = True
+        try:
+            for page in iter_board(b, default_search):
+                jobs.extend(page)
+        except PartialScrape as e:
+            complete = False
+            print(f"[WARN] {b['name']}: only partly scraped ({e}); closing none of its postings")
+        if not jobs:
+            raise RuntimeError("returned 0 jobs")   # failed scrapers log and return nothing
+        with store_lock:
+            sync = store.sync(jobs, [b["name"]] if complete else [])
+        return sync.fresh, len(sync.new) + len(sync.changed) + len(sync.closed)
+
+    def process(jobs: List[Job]) -> Tuple[List[Dict[str, Any]], List[Job]]:
+        # postings found from now on spill to a fresh file; the previous one is
+        # deleted once this batch's jobs are gone, so JOB_RAW=spill stays bounded
+        set_raw_mode(JOB_RAW)
+        kept, _ = matcher.filter(jobs)
+        deduper = None
+        if DEDUP:
+            from dedup import Deduper
+            deduper = Deduper(threshold=DEDUP_THRESHOLD)
+        kept = make_prepare(details, deduper)(kept)
+        local_scores: Dict[Tuple[str, str, str], float] = {}
+        if PRERANK and PRERANK_MIN_SCORE is not None and kept:
+            from prerank import select_candidates
+            kept, scores = select_candidates(kept, resume, min_score=PRERANK_MIN_SCORE)
+            local_scores = {(j.company, j.title, j.url): s for j, s in zip(kept, scores)}
+        errors: List[Dict[str, Any]] = []
+        rows = make_rank(resume, cache, limiter, llm, errors)(kept) if kept else []
+        failed_keys = set()
+        for err in errors:
+            print(f"[WARN] Could not rank {err['title']} @ {err['company']} ({err['stage']}): {err['error']}")
+            failed_keys.add((err["company"], err["title"], err["url"]))
+        for r in rows:
+            r["local_score"] = local_scores.get((r["company"], r["title"], r["url"]))
+        if deduper is not None:
+            rows = deduper.fan_out(rows)
+            # a failed representative leaves its duplicates unranked too
+            for rep, members in deduper.clusters():
+                if (rep.company, rep.title, rep.url) in failed_keys:
+                    failed_keys.update((j.company, j.title, j.url) for j in members)
+        if MIN_MATCH_SCORE is not None:
+            rows = [r for r in rows if (r.get("match_score") or 0) >= MIN_MATCH_SCORE]
+        failed = [j for j in jobs if (j.company, j.title, j.url) in failed_keys]
+        print(f"[INFO] {len(jobs)} new postings: {len(kept) - len(errors)} ranked, {len(failed)} to retry, "
+              f"{len(rows)} matches for the next digest")
+        return rows, failed
+
+    def deliver(rows: List[Dict[str, Any]]) -> None:
+        save_results(rows)
+        if os.getenv("EMAIL_FROM") and os.getenv("EMAIL_TO"):
+            send_email_digest(rows)
+
+    scheduler = Scheduler(
+        boards, poll, process, deliver, board_host,
+        state_path=DAEMON_STATE_PATH,
+        min_interval=POLL_MIN_HOURS * 3600,
+        max_interval=POLL_MAX_HOURS * 3600,
+        start_interval=POLL_START_HOURS * 3600,
+        max_backoff=POLL_MAX_BACKOFF_HOURS * 3600,
+        digest_every=DIGEST_EVERY_HOURS * 3600,
+        batch_seconds=DAEMON_BATCH_SECONDS,
+        max_workers=SCRAPE_MAX_WORKERS,
+        per_host=SCRAPE_PER_HOST,
+    )
+    import asyncio
+    try:
+        asyncio.run(scheduler.run(duration))
+    finally:
+        store.close()
+        if details is not None:
+            details.evict()
+            details.close()
+        if cache is not None:
+            cache.evict()
+            cache.close()
+
+
+def list_runs() -> None:
+    for run_id in RunCheckpoints.runs(CHECKPOINT_DIR):
+        run = RunCheckpoints(CHECKPOINT_DIR, run_id)
+        done = [s for s in STAGES if run.done(s)]
+        scraped = run.info("scrape").get("jobs", "-")
+        ranked = run.info("rank").get("rows", "-")
+        print(f"{run_id}  stages done: {', '.join(done) or 'none':<28} scraped: {scraped:<6} ranked: {ranked}")
+
+
+# subcommand -> (stage it runs, e-mail override)
+COMMANDS = {
+    "scrape": ("scrape", None),
+    "filter": ("filter", None),
+    "rank": ("rank", None),
+    "report": ("output", False),
+    "email": ("output", True),
+}
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    import argparse
+    ap = argparse.ArgumentParser(
+        description="Scrape the boards in boards.yaml, rank postings against data/resume.txt "
+                    "and write/e-mail the matches. Without a command, runs every stage.")
+    ap.add_argument("--resume", metavar="RUN_ID",
+                    help='continue a checkpointed run ("latest" for the newest) instead of scraping')
+    ap.add_argument("--from", dest="start", choices=STAGES,
+                    help="stage to restart the resumed run from (default: its first unfinished stage)")
+    sub = ap.add_subparsers(dest="command", metavar="command")
+    scrape = sub.add_parser("scrape", help="scrape boards into a new checkpointed run, then stop")
+    scrape.add_argument("--shard-index", type=int, metavar="I",
+                        help="only scrape shard I (0-based) of the boards, into SHARD_DIR for `merge`")
+    scrape.add_argument("--shard-count", type=int, metavar="N", help="number of shards")
+    sub.add_parser("merge", help="combine the scraped shards in SHARD_DIR and run the remaining stages")
+    for name, text in (("filter", "filter, clean up and pre-rank a run's scraped jobs"),
+                       ("rank", "LLM-rank a run's selected jobs"),
+                       ("report", "write output/matches.* from a run's ranked rows (no e-mail)"),
+                       ("email", "write the report from a run's ranked rows and e-mail it")):
+        cmd = sub.add_parser(name, help=text)
+        cmd.add_argument("--run", default="latest", metavar="RUN_ID",
+                         help='checkpointed run to continue (default: "latest")')
+    sub.add_parser("runs", help="list checkpointed runs")
+    dmn = sub.add_parser("daemon", help="keep running: poll each board on its own interval, "
+                                        "rank new postings as they appear, send digests on a schedule")
+    dmn.add_argument("--for", dest="duration", type=float, metavar="SECONDS",
+                     help="stop after this many seconds (default: until interrupted)")
+    args = ap.parse_args(argv)
+    if args.command and (args.resume or args.start):
+        ap.error("--resume/--from apply to a full run; stage commands take --run")
+    if args.start and not args.resume:
+        ap.error("--from needs --resume")
+    shard = (getattr(args, "shard_index", None), getattr(args, "shard_count", None))
+    if (shard[0] is None) != (shard[1] is None):
+        ap.error("--shard-index and --shard-count go together")
+    if shard[1] is not None and not 0 <= shard[0] < shard[1]:
+        ap.error(f"--shard-index must be in 0..{shard[1] - 1}")
+    return args
+
+
+def cli(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if args.command == "runs":
+        list_runs()
+    elif args.command == "merge":
+        main(merge=True)
+    elif args.command == "daemon":
+        daemon(args.duration)
+    elif args.command == "scrape" and args.shard_count is not None:
+        main(shard=(args.shard_index, args.shard_count))
+    elif args.command:
+        stage, email = COMMANDS[args.command]
+        run_id = getattr(args, "run", None)
+        main(run_id, stage if run_id else None, stop=stage, email=email)
+    else:
+        main(args.resume, args.start)
 
 
 if __name__ == "__main__":
-    main()
+    cli()
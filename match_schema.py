@@ -0,0 +1,166 @@
+# match_schema.py
+"""
+Schema for LLM match results, and a tolerant parser for near-valid answers.
+
+JobMatch / BatchAnswer are what the model is asked for: with structured
+output (LLM_STRUCTURED=true) they are bound to the model via
+with_structured_output(); otherwise the prompt asks for the same JSON.
+
+Either way an answer can come back slightly broken: wrapped in markdown
+fences or prose, with trailing commas, Python literals, smart quotes, or cut
+off mid-array when the completion hits its limit. repair_json() fixes what
+it can locally (for a truncated array it keeps every complete entry), and
+validate_match() / validate_batch() keep the entries that fit the schema,
+so only the rest have to be re-asked.
+"""
+import json
+import re
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+MAX_CUTS = 64   # truncation points tried when closing a cut-off answer
+
+
+class JobMatch(BaseModel):
+    match_score: int = Field(description="0-100 fit of the résumé to the posting")
+    overlaps: List[str] = Field(description="résumé strengths the posting asks for")
+    gaps: List[str] = Field(description="requirements the résumé does not show")
+    rationale: str = Field(description="1-2 sentences")
+    remote_eligible: bool
+
+    @field_validator("match_score", mode="before")
+    @classmethod
+    def _clamp_score(cls, v):
+        if isinstance(v, str):
+            v = v.strip().rstrip("%")
+        try:
+            return max(0, min(100, round(float(v))))
+        except (TypeError, ValueError):
+            return v   # left for pydantic to reject
+
+    @field_validator("overlaps", "gaps", mode="before")
+    @classmethod
+    def _listify(cls, v):
+        if v is None:
+            return []
+        if isinstance(v, str):
+            return [s.strip(" -•") for s in v.split("\n") if s.strip(" -•")]
+        return v
+
+
+class BatchMatch(JobMatch):
+    id: str = Field(description="the job's ID exactly as given")
+
+    @field_validator("id", mode="before")
+    @classmethod
+    def _strip_id(cls, v):
+        return str(v).strip()
+
+
+class BatchAnswer(BaseModel):
+    results: List[BatchMatch]
+
+
+# -------------------------
+# Repair
+# -------------------------
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_PY_LITERAL = re.compile(r"\b(True|False|None)\b")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"'})
+
+
+def _scan(text: str):
+    """Open brackets, whether a string is open, and (position, closers needed) at each comma."""
+    stack: List[str] = []
+    in_str = escaped = False
+    cuts = []
+    for i, ch in enumerate(text):
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+        elif ch == ",":
+            cuts.append((i, "".join(reversed(stack))))
+    return stack, in_str, cuts
+
+
+def _loads(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return json.loads(_TRAILING_COMMA.sub(r"\1", text))
+
+
+def repair_json(text: str) -> Any:
+    """
+    Parse a model answer that is JSON or close to it. Raises ValueError when
+    nothing usable can be recovered.
+    """
+    text = _FENCE.sub("", text.strip()).translate(_SMART_QUOTES)
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    # skip any prose before the first object/array
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        raise ValueError("no JSON object or array in answer")
+    text = _PY_LITERAL.sub(lambda m: _PY_LITERALS[m.group(1)], text[min(starts):])
+    try:
+        return _loads(text)
+    except ValueError:
+        pass
+    stack, in_str, cuts = _scan(text)
+    # cut off: close the open string and brackets ...
+    try:
+        return _loads(text + ('"' if in_str else "") + "".join(reversed(stack)))
+    except ValueError:
+        pass
+    # ... or drop the incomplete tail back to the last complete element
+    for pos, closers in reversed(cuts[-MAX_CUTS:]):
+        try:
+            return _loads(text[:pos] + closers)
+        except ValueError:
+            continue
+    raise ValueError("could not repair JSON answer")
+
+
+# -------------------------
+# Validation
+# -------------------------
+def validate_match(data: Any) -> Optional[Dict[str, Any]]:
+    """The answer as a JobMatch dict, or None if it doesn't fit the schema."""
+    if isinstance(data, list) and len(data) == 1:
+        data = data[0]
+    try:
+        return JobMatch.model_validate(data).model_dump()
+    except ValidationError:
+        return None
+
+
+def validate_batch(data: Any) -> Dict[str, Dict[str, Any]]:
+    """Map job ID -> JobMatch dict for every entry that fits the schema."""
+    if isinstance(data, dict):
+        data = data.get("results") or data.get("jobs") or [data]
+    parsed: Dict[str, Dict[str, Any]] = {}
+    for item in data if isinstance(data, list) else []:
+        try:
+            entry = BatchMatch.model_validate(item).model_dump()
+        except ValidationError:
+            continue
+        parsed[entry.pop("id")] = entry
+    return parsed
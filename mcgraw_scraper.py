@@ -1,56 +1,146 @@
 # mcgraw_scraper.py
-import requests
-from typing import List
-from models import Job
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import quote_plus
+from models import Job, PartialScrape
+from http_client import http_get
 
-def scrape_mcgrawhill(url_api: str, name: str) -> List[Job]:
+PAGE_CAP = 50   # safety stop per listing; adjust if the board truly has tons of jobs
+
+
+def scrape_mcgrawhill(url_api: str, name: str, search: Optional[List[str]] = None) -> List[Job]:
     """
     Scraper for McGraw Hill careers API.
     Example API endpoint:
     https://careers.mheducation.com/api/jobs?sortBy=relevance&descending=false&internal=false
+
+    With `search`, each term is sent as the API's `keywords` parameter and the
+    results are merged by job URL, so only candidate roles are paged through.
+    Raises PartialScrape like iter_mcgrawhill().
+    """
+    jobs = [job for page in iter_mcgrawhill(url_api, name, search) for job in page]
+    print(f"[INFO] Scraped {len(jobs)} McGraw Hill jobs total")  # <-- QC summary
+    return jobs
+
+
+def iter_mcgrawhill(url_api: str, name: str, search: Optional[List[str]] = None) -> Iterator[List[Job]]:
+    """
+    Generator form of scrape_mcgrawhill(): yields each API page's new jobs.
+
+    Before searching, page 1 of the first term is compared with page 1 of the
+    unfiltered listing (one extra request). If they are the same, the API
+    ignored `keywords` and the full board is fetched once instead of once per
+    term; the local title filter does the narrowing.
+
+    A failed page ends its query; the other queries still run, then
+    PartialScrape is raised so the board's unseen postings stay open.
+    """
+    seen_urls = set()
+    queries = [f"{url_api}&keywords={quote_plus(term)}" for term in search] if search else []
+
+    partial = None
+    try:
+        first = None
+        if queries:
+            unfiltered = _get_page(url_api, 1)
+            first = _get_page(queries[0], 1)
+            if first and _urls(first) == _urls(unfiltered):
+                print(f"[WARN] {name}: API ignored keywords={search[0]!r}; fetching the full board instead.")
+                queries, first = [], unfiltered
+
+        for i, query_url in enumerate(queries or [url_api]):
+            try:
+                yield from _scrape_listing(query_url, name, seen_urls, first if i == 0 else None)
+            except PartialScrape as e:
+                partial = e
+    except PartialScrape:
+        raise
+    except Exception as e:
+        print(f"[ERROR] McGraw Hill scrape failed: {e}")
+        raise PartialScrape(str(e)) from e
+    if partial is not None:
+        raise partial
+
+
+def _get_page(url_api: str, page: int) -> List[Dict[str, Any]]:
+    """Postings (the unwrapped `data` dicts) on one page of an API listing."""
+    url = f"{url_api}&page={page}"
+    print(f"[DEBUG] Requesting McGraw Hill jobs ({url})")  # <-- QC print
+    r = http_get(url, timeout=30)
+    if r.status_code != 200:
+        print(f"[ERROR] McGraw Hill API request failed (page={page}): {r.status_code}")
+        raise PartialScrape(f"page {page} failed ({r.status_code})")
+    return [item.get("data", {}) for item in r.json().get("jobs", [])]  # <-- unwrap the nested dict
+
+
+def _job_url(data: Dict[str, Any]) -> Optional[str]:
+    return data.get("apply_url") or data.get("canonical_url")
+
+
+def _urls(items: List[Dict[str, Any]]) -> List[Optional[str]]:
+    return [_job_url(data) for data in items]
+
+
+def _scrape_listing(url_api: str, name: str, seen_urls: set,
+                    first: Optional[List[Dict[str, Any]]] = None) -> Iterator[List[Job]]:
+    """
+    Page through one API listing, yielding jobs not already seen. `first` is
+    page 1 when it was already fetched. Stops on an empty page, on a page
+    with no URL new to this listing (the API recycling pages), or at
+    PAGE_CAP (raising PartialScrape).
     """
-    jobs = []
+    query_urls = set()
     page = 1
 
     try:
         while True:
-            url = f"{url_api}&page={page}"
-            print(f"[DEBUG] Requesting McGraw Hill jobs (page={page})")  # <-- QC print
-            r = requests.get(url, timeout=30)
-            if r.status_code != 200:
-                print(f"[ERROR] McGraw Hill API request failed (page={page}): {r.status_code}")
-                break
-
-            data = r.json()
-            items = data.get("jobs", [])
+            items = first if page == 1 and first is not None else _get_page(url_api, page)
             if not items:
                 print(f"[DEBUG] No jobs returned on page {page}, stopping.")  # <-- QC print
                 break
 
-            for i, item in enumerate(items):
-                data = item.get("data", {})  # <-- unwrap the nested dict
-
+            jobs = []
+            fresh = 0
+            for i, data in enumerate(items):
                 title = data.get("title", "")
                 loc = data.get("full_location") or data.get("location_name", "")
-                job_url = data.get("apply_url") or data.get("canonical_url")
+                job_url = _job_url(data)
                 descr = data.get("description", "") or "No description."
 
+                if job_url:
+                    if job_url in query_urls:
+                        continue
+                    query_urls.add(job_url)
+                    fresh += 1
+                    if job_url in seen_urls:
+                        continue
+                    seen_urls.add(job_url)
+
                 jobs.append(Job(
                     company=name,
                     title=title,
                     location=loc,
                     url=job_url,
                     description=descr,
-                    raw=data
+                    raw=data,
+                    source_id=str(data.get("req_id") or data.get("slug") or "")
                 ))
 
                 if i < 3 and page == 1:
                     print(f"[DEBUG] Parsed job: {title} ({loc})")
 
+            if jobs:
+                yield jobs
+            # a page that adds nothing to this listing means the API is recycling pages
+            if fresh == 0:
+                print(f"[DEBUG] No new postings on page {page}, stopping.")
+                break
             page += 1
+            if page > PAGE_CAP:
+                print(f"[WARN] Hit page cap ({PAGE_CAP}) for {name}. Stopping to avoid overfetch.")
+                raise PartialScrape(f"page cap ({PAGE_CAP}) reached")
 
+    except PartialScrape:
+        raise
     except Exception as e:
         print(f"[ERROR] McGraw Hill scrape failed: {e}")
-
-    print(f"[INFO] Scraped {len(jobs)} McGraw Hill jobs total")  # <-- QC summary
-    return jobs
+        raise PartialScrape(str(e)) from e
@@ -0,0 +1,192 @@
+# metrics.py
+"""
+Run telemetry: per-board HTTP and job counts, per-stage timings and per-call
+LLM usage, collected in one process-wide Metrics object (`METRICS`).
+
+- scrape_boards() wraps each board in METRICS.board(name); http_client
+  attributes every request, byte and retry to the board of the calling
+  thread (requests made outside a board, e.g. detail pages, count under
+  "(other)"); scrapers that fan out to their own threads wrap the work in
+  METRICS.bind() so it stays on the board
+- pipeline steps are wrapped in METRICS.stage(name, items_in); repeated
+  calls (streaming chunks) add up, so a stage's seconds can exceed the
+  run's wall time when chunks overlap
+- llm_ranker records every model call: latency, tokens (from the response's
+  usage metadata, estimated when the backend reports none), 429 retries,
+  rate-limiter waits and parse failures
+
+At the end of a run main() writes output/metrics.json and prints
+summary_table(). Everything is thread-safe and costs a lock and a few
+additions per event.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+OTHER = "(other)"   # HTTP made outside any board (detail pages, ...)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.boards: Dict[str, Dict[str, Any]] = {}
+            self.stages: Dict[str, Dict[str, Any]] = {}
+            self.llm: Dict[str, Any] = {
+                "calls": 0, "jobs": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "rate_limited": 0, "limiter_wait_s": 0.0, "parse_failures": 0,
+                "cache_hits": 0, "cache_misses": 0,
+            }
+            self._latencies: List[float] = []
+
+    # ---- boards / HTTP ---------------------------------------------------
+    def _board_entry(self, name: str) -> Dict[str, Any]:
+        entry = self.boards.get(name)
+        if entry is None:
+            entry = self.boards[name] = {"wall_s": 0.0, "requests": 0, "bytes": 0,
+                                         "retries": 0, "jobs": 0, "error": None}
+        return entry
+
+    @contextmanager
+    def board(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Attribute this thread's HTTP to `name` and time the block."""
+        with self._lock:
+            entry = self._board_entry(name)
+        self._local.board = name
+        start = time.perf_counter()
+        try:
+            yield entry
+        except Exception as e:
+            entry["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self._local.board = None
+            with self._lock:
+                entry["wall_s"] += time.perf_counter() - start
+
+    def bind(self, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """`fn` with its HTTP attributed to the calling thread's board, for running on worker threads."""
+        board = getattr(self._local, "board", None)
+
+        def run(*args, **kwargs):
+            previous = getattr(self._local, "board", None)
+            self._local.board = board
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._local.board = previous
+        return run
+
+    def record_http(self, nbytes: int) -> None:
+        with self._lock:
+            entry = self._board_entry(getattr(self._local, "board", None) or OTHER)
+            entry["requests"] += 1
+            entry["bytes"] += nbytes
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self._board_entry(getattr(self._local, "board", None) or OTHER)["retries"] += 1
+
+    # ---- stages ----------------------------------------------------------
+    @contextmanager
+    def stage(self, name: str, items_in: int = 0) -> Iterator[Dict[str, Any]]:
+        """Time a pipeline step; the block sets result["out"] to the items it produced."""
+        result = {"out": 0}
+        start = time.perf_counter()
+        try:
+            yield result
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0,
+                                                      "items_in": 0, "items_out": 0})
+                entry["calls"] += 1
+                entry["seconds"] += elapsed
+                entry["items_in"] += items_in
+                entry["items_out"] += result["out"]
+
+    # ---- LLM -------------------------------------------------------------
+    def record_llm_call(self, seconds: float, prompt_tokens: int, completion_tokens: int,
+                        jobs: int = 1) -> None:
+        with self._lock:
+            self.llm["calls"] += 1
+            self.llm["jobs"] += jobs
+            self.llm["prompt_tokens"] += prompt_tokens
+            self.llm["completion_tokens"] += completion_tokens
+            self._latencies.append(seconds)
+
+    def count_llm(self, key: str, amount: float = 1) -> None:
+        """Bump an LLM counter: rate_limited, limiter_wait_s, parse_failures, cache_*."""
+        with self._lock:
+            self.llm[key] += amount
+
+    # ---- report ----------------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            lat = list(self._latencies)
+            llm = dict(self.llm)
+            llm.update({
+                "latency_s_mean": sum(lat) / len(lat) if lat else 0.0,
+                "latency_s_p50": _percentile(lat, 0.5),
+                "latency_s_p95": _percentile(lat, 0.95),
+                "latency_s_max": max(lat, default=0.0),
+            })
+            return {
+                "started": datetime.fromtimestamp(self.started, timezone.utc).isoformat(timespec="seconds"),
+                "wall_s": time.time() - self.started,
+                "boards": {k: dict(v) for k, v in self.boards.items()},
+                "stages": {k: dict(v) for k, v in self.stages.items()},
+                "llm": llm,
+            }
+
+    def write(self, path: str = "output/metrics.json") -> Dict[str, Any]:
+        data = self.to_dict()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return data
+
+    def summary_table(self, data: Optional[Dict[str, Any]] = None, top_boards: int = 15) -> str:
+        data = data or self.to_dict()
+        lines = [f"Run metrics ({data['wall_s']:.1f}s wall)", "",
+                 f"{'board':<32} {'wall s':>8} {'jobs':>6} {'requests':>9} {'retries':>8} {'KiB':>9}"]
+        boards = sorted(data["boards"].items(), key=lambda kv: kv[1]["wall_s"], reverse=True)
+        for name, b in boards[:top_boards]:
+            flag = "  !" if b["error"] else ""
+            lines.append(f"{name[:32]:<32} {b['wall_s']:>8.2f} {b['jobs']:>6} {b['requests']:>9} "
+                         f"{b['retries']:>8} {b['bytes'] / 1024:>9.0f}{flag}")
+        if len(boards) > top_boards:
+            lines.append(f"... {len(boards) - top_boards} more boards in metrics.json")
+
+        lines += ["", f"{'stage':<24} {'calls':>6} {'seconds':>9} {'in':>7} {'out':>7}"]
+        for name, s in data["stages"].items():
+            lines.append(f"{name:<24} {s['calls']:>6} {s['seconds']:>9.2f} "
+                         f"{s['items_in']:>7} {s['items_out']:>7}")
+
+        llm = data["llm"]
+        lines += ["", (f"LLM: {llm['calls']} calls for {llm['jobs']} jobs, "
+                       f"{llm['prompt_tokens']} prompt + {llm['completion_tokens']} completion tokens, "
+                       f"latency p50 {llm['latency_s_p50']:.2f}s / p95 {llm['latency_s_p95']:.2f}s, "
+                       f"{llm['rate_limited']} 429s, {llm['limiter_wait_s']:.1f}s limiter wait, "
+                       f"{llm['parse_failures']} parse failures, "
+                       f"cache {llm['cache_hits']} hits / {llm['cache_misses']} misses")]
+        return "\n".join(lines)
+
+
+METRICS = Metrics()
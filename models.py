@@ -1,15 +1,146 @@
 # models.py
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+"""
+Job record shared by every scraper.
+
+Jobs are plain __slots__ objects: no per-instance __dict__, and company /
+location strings are interned so thousands of postings from one board share
+a single copy. The source payload (`raw`) is the bulk of a posting's memory
+and nothing downstream needs it, so what happens to it is a process-wide
+policy (see set_raw_mode):
+
+  "drop"  (default) raw is discarded once the Job is built
+  "keep"  raw stays on the Job, as before
+  "spill" raw is appended to a JSON-lines file and read back on access
+
+A spill file without a configured path is a temp file, closed and deleted
+once no Job references it any more (or at exit at the latest).
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+RAW_MODES = ("drop", "keep", "spill")
+
+
+class PartialScrape(Exception):
+    """
+    Raised by a paging scraper after yielding the pages it got, when a later
+    page (or search query) failed: the board's jobs are usable, but postings
+    missing from them must not be taken as closed.
+    """
+
+
+def _release(file, temp_path: Optional[str]) -> None:
+    file.close()
+    if temp_path is not None:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+
+
+class RawSpill:
+    """
+    Append-only JSON-lines file of raw payloads, addressed by (offset, length).
+    Without a `path` the file is a temp file, deleted by close(), when the
+    spill is garbage collected, or at exit.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        temporary = path is None
+        if temporary:
+            fd, path = tempfile.mkstemp(prefix="jobs-raw-", suffix=".jsonl")
+            os.close(fd)
+        else:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._file = open(path, "w+b")
+        self._lock = threading.Lock()
+        # Jobs hold a reference to their spill, so this runs once the last of them is gone
+        self._release = weakref.finalize(self, _release, self._file, path if temporary else None)
+
+    def put(self, raw: Dict[str, Any]) -> Tuple[int, int]:
+        data = json.dumps(raw, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(data)
+        return offset, len(data)
+
+    def get(self, ref: Tuple[int, int]) -> Dict[str, Any]:
+        offset, length = ref
+        with self._lock:
+            self._file.flush()
+            self._file.seek(offset)
+            data = self._file.read(length)
+        return json.loads(data)
+
+    def close(self) -> None:
+        with self._lock:
+            self._release()
+
+
+_raw_mode = "drop"
+_spill: Optional[RawSpill] = None
+
+
+def set_raw_mode(mode: str, path: Optional[str] = None) -> None:
+    """Choose what new Jobs do with `raw`; `path` is the spill file for "spill"."""
+    global _raw_mode, _spill
+    if mode not in RAW_MODES:
+        raise ValueError(f"raw mode must be one of {RAW_MODES}, got {mode!r}")
+    # an earlier spill file stays open while Jobs still reference it, then is released
+    _spill = RawSpill(path) if mode == "spill" else None
+    _raw_mode = mode
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
 
-@dataclass
 class Job:
-    company: str
-    title: str
-    location: Optional[str]
-    url: str
-    description: str
-    raw: Dict[str, Any]
+    __slots__ = ("company", "title", "location", "url", "description", "source_id", "_raw")
+
+    def __init__(self, company: str, title: str, location: Optional[str], url: str,
+                 description: str, raw: Optional[Dict[str, Any]] = None, source_id: str = ""):
+        self.company = _intern(company)
+        self.title = title
+        self.location = _intern(location)
+        self.url = url
+        self.description = description
+        self.source_id = source_id   # stable per-source ID (ATS job ID); empty -> use url
+        self.raw = raw
+
+    @property
+    def raw(self) -> Optional[Dict[str, Any]]:
+        """Source payload, or None when dropped; spilled payloads are loaded on demand."""
+        stored = self._raw
+        if isinstance(stored, tuple):
+            spill, offset, length = stored
+            return spill.get((offset, length))
+        return stored
+
+    @raw.setter
+    def raw(self, value: Optional[Dict[str, Any]]) -> None:
+        if value is None or _raw_mode == "drop":
+            self._raw = None
+        elif _raw_mode == "spill" and _spill is not None:
+            self._raw = (_spill, *_spill.put(value))
+        else:
+            self._raw = value
+
+    def __eq__(self, other):
+        if not isinstance(other, Job):
+            return NotImplemented
+        return ((self.company, self.title, self.location, self.url, self.description, self.source_id)
+                == (other.company, other.title, other.location, other.url, other.description,
+                    other.source_id))
+
+    __hash__ = None   # mutable, like the dataclass it replaces
 
     def __repr__(self):
         return f"<Job {self.title} at {self.company}>"
@@ -0,0 +1,134 @@
+# pipeline.py
+"""
+Streaming pipeline: scrape -> filter -> rank -> sink.
+
+Stages run concurrently and hand work over bounded queues, so ranking starts
+on the first matching posting while other boards are still downloading.
+When the LLM falls behind, the queues fill up and block the filter stage,
+which in turn blocks the scraper workers (backpressure), keeping memory flat
+however many boards there are.
+
+The stages are injected by the caller (see main.py):
+  scrape(on_page)  -> qc_report; calls on_page(board_index, jobs) per page
+  select(jobs)     -> jobs that should be ranked (filtering, store, pre-rank)
+  rank(jobs)       -> result rows for those jobs
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+from models import Job
+
+_DONE = object()
+
+
+@dataclass
+class PipelineResult:
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    qc_report: Dict[str, int] = field(default_factory=dict)
+    scraped: int = 0
+    selected: int = 0
+
+
+def run_pipeline(
+    scrape: Callable[[Callable[[int, List[Job]], None]], Dict[str, int]],
+    select: Callable[[List[Job]], List[Job]],
+    rank: Callable[[List[Job]], List[Dict[str, Any]]],
+    queue_size: int = 8,
+    chunk_size: int = 16,
+    flush_seconds: float = 2.0,
+    rank_workers: int = 2,
+) -> PipelineResult:
+    """
+    Run the stages concurrently until every board is scraped and every
+    selected job is ranked.
+
+    Pages wait in a queue of `queue_size` pages, selected jobs in a queue of
+    `queue_size * chunk_size` jobs. Jobs are ranked in chunks of
+    `chunk_size` (or whatever has arrived after `flush_seconds`), with at
+    most `rank_workers` chunks in flight. Rows come back ordered by board
+    then scrape order, so output is reproducible.
+    """
+    pages: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    selected: "queue.Queue" = queue.Queue(maxsize=queue_size * chunk_size)
+    result = PipelineResult()
+    order: Dict[Tuple[str, str, str], Tuple[int, int]] = {}
+    failures: List[BaseException] = []
+
+    def scrape_stage():
+        try:
+            result.qc_report = scrape(lambda idx, page: pages.put((idx, page)))
+        except BaseException as e:
+            failures.append(e)
+        finally:
+            pages.put(_DONE)
+
+    def select_stage():
+        seq: Dict[int, int] = {}
+        try:
+            while True:
+                item = pages.get()
+                if item is _DONE:
+                    break
+                idx, page = item
+                result.scraped += len(page)
+                for job in select(page):
+                    n = seq.get(idx, 0)
+                    seq[idx] = n + 1
+                    order.setdefault((job.company, job.title, job.url), (idx, n))
+                    result.selected += 1
+                    selected.put(job)
+        except BaseException as e:
+            failures.append(e)
+            # keep draining so the scraper never blocks on a full queue
+            while pages.get() is not _DONE:
+                pass
+        finally:
+            selected.put(_DONE)
+
+    threads = [threading.Thread(target=scrape_stage, name="pipeline-scrape", daemon=True),
+               threading.Thread(target=select_stage, name="pipeline-select", daemon=True)]
+    for t in threads:
+        t.start()
+
+    # Rank stage runs here; a semaphore caps chunks in flight so a slow LLM
+    # pushes back on the queues instead of piling up futures.
+    in_flight = threading.Semaphore(max(1, rank_workers))
+    futures = []
+    with ThreadPoolExecutor(max_workers=max(1, rank_workers)) as pool:
+        def submit(chunk: List[Job]):
+            in_flight.acquire()
+            fut = pool.submit(rank, chunk)
+            fut.add_done_callback(lambda _: in_flight.release())
+            futures.append(fut)
+
+        chunk: List[Job] = []
+        while True:
+            try:
+                item = selected.get(timeout=flush_seconds)
+            except queue.Empty:
+                if chunk:
+                    submit(chunk)
+                    chunk = []
+                continue
+            if item is _DONE:
+                break
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                submit(chunk)
+                chunk = []
+        if chunk:
+            submit(chunk)
+
+    for t in threads:
+        t.join()
+    if failures:
+        raise failures[0]
+
+    for fut in futures:
+        result.rows.extend(fut.result())
+    last = (float("inf"), 0)
+    result.rows.sort(key=lambda r: order.get((r["company"], r["title"], r["url"]), last))
+    return result
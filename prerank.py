@@ -0,0 +1,111 @@
+# prerank.py
+"""
+Offline similarity pre-ranking between the résumé and job postings.
+
+Each text is turned into a hashed TF-IDF vector (unigrams + bigrams, crc32
+feature hashing, sublinear tf, L2-normalized) and every job is scored against
+the résumé by summing over each posting's own terms (no dense matrix). No
+network and no model download: thousands of postings score in well under a
+second. Only the best candidates then go on to the LLM.
+
+IDF comes from the postings scored together. A batch run scores the whole
+job set at once; streaming mode and the daemon score one page or batch at a
+time, so the same posting can get a somewhat different score there, and a
+PRERANK_MIN_SCORE tuned on batch runs is only approximate in those modes.
+"""
+import re
+import zlib
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from models import Job
+
+N_FEATURES = 4096
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_TAG = re.compile(r"<[^>]+>")
+STOP_WORDS = frozenset("""
+a about all also an and any are as at be been but by can do for from has have
+how if in into is it its may more most not of on or our out over so such than
+that the their them there these they this to up us we what when which who will
+with within you your
+""".split())
+
+
+@lru_cache(maxsize=200000)
+def _word_hash(word: str) -> int:
+    # crc32 rather than hash(): stable across processes, so scores are reproducible
+    return zlib.crc32(word.encode("utf-8"))
+
+
+def _words(text: str) -> List[str]:
+    return [w for w in _TOKEN.findall(_TAG.sub(" ", text.lower())) if w not in STOP_WORDS]
+
+
+def _job_text(job: Job) -> str:
+    # title counted twice: it is the strongest signal and often the only one
+    return f"{job.title} {job.title} {job.description or ''}"
+
+
+def _vectorize(texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Hashed, IDF-weighted, L2-normalized term vectors in sparse form: parallel
+    arrays of (document, feature, weight), one entry per distinct term of a
+    document. Never builds the dense len(texts) x N_FEATURES matrix.
+    """
+    sizes, feats, counts = [], [], []
+    for text in texts:
+        words = _words(text)
+        hashes = np.fromiter(map(_word_hash, words), dtype=np.int64, count=len(words))
+        # unigrams + bigrams (neighbouring word hashes combined)
+        terms = np.concatenate([hashes, hashes[:-1] * 1000003 + hashes[1:]]) % N_FEATURES
+        f, c = np.unique(terms, return_counts=True)
+        sizes.append(len(f))
+        feats.append(f.astype(np.int32))
+        counts.append(c.astype(np.int32))
+    doc = np.repeat(np.arange(len(texts), dtype=np.int32), sizes)
+    feat = np.concatenate(feats)
+    count = np.concatenate(counts)
+
+    df = np.bincount(feat, minlength=N_FEATURES)   # (doc, feature) pairs are unique
+    idf = (np.log((1 + len(texts)) / (1 + df)) + 1.0).astype(np.float32)
+    weights = np.log1p(count, dtype=np.float32) * idf[feat]
+    norms = np.sqrt(np.bincount(doc, weights=weights * weights, minlength=len(texts))).astype(np.float32)
+    norms[norms == 0] = 1.0
+    weights /= norms[doc]
+    return doc, feat, weights
+
+
+def prerank_scores(jobs: List[Job], resume: str) -> np.ndarray:
+    """Cosine similarity of each job to the résumé (0..1), in input order."""
+    if not jobs:
+        return np.zeros(0, dtype=np.float32)
+    doc, feat, weights = _vectorize([resume] + [_job_text(j) for j in jobs])
+    resume_vec = np.zeros(N_FEATURES, dtype=np.float32)
+    is_resume = doc == 0
+    resume_vec[feat[is_resume]] = weights[is_resume]
+    # each job's dot product with the résumé, summed over its own terms only
+    scores = np.bincount(doc, weights=weights * resume_vec[feat], minlength=len(jobs) + 1)
+    return scores[1:].astype(np.float32)
+
+
+def select_candidates(jobs: List[Job], resume: str, top_k: Optional[int] = None,
+                      min_score: Optional[float] = None) -> Tuple[List[Job], List[float]]:
+    """
+    Keep jobs scoring at least `min_score`, then at most the `top_k` best.
+    Returns (kept jobs, their scores), both in input order.
+    """
+    scores = prerank_scores(jobs, resume)
+    keep = np.ones(len(jobs), dtype=bool)
+    if min_score is not None:
+        keep &= scores >= min_score
+    if top_k is not None and keep.sum() > top_k:
+        candidates = np.flatnonzero(keep)
+        # stable sort so ties resolve by input order
+        best = candidates[np.argsort(-scores[candidates], kind="stable")[:top_k]]
+        keep[:] = False
+        keep[best] = True
+    idx = np.flatnonzero(keep)
+    return [jobs[i] for i in idx], [round(float(scores[i]), 4) for i in idx]
@@ -0,0 +1,52 @@
+# rate_limit.py
+"""
+Thread-safe token buckets for client-side rate limiting.
+"""
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Refills at `rate_per_minute` units per minute up to `capacity`
+    (default: one minute's worth). acquire() blocks until enough units are
+    available; requests larger than the capacity are clamped to it.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Take `amount` units, sleeping as needed. Returns seconds waited."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                sleep = (amount - self._tokens) / self.rate
+            time.sleep(sleep)
+            waited += sleep
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits for one API."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def acquire(self, tokens: float) -> float:
+        return self.requests.acquire(1) + self.tokens.acquire(tokens)
@@ -0,0 +1,282 @@
+# scheduler.py
+"""
+Daemon mode: poll each board on its own schedule instead of a daily sweep.
+
+Every board has a poll interval, bounded by POLL_MIN_HOURS and
+POLL_MAX_HOURS, that follows the churn it shows:
+
+  - a poll that finds new, changed or closed postings halves the interval,
+    so busy boards converge on hourly polls;
+  - a quiet poll stretches it by QUIET_GROWTH, so static boards drift
+    towards daily;
+  - a failed poll (error or no jobs) keeps the interval and retries after
+    interval x 2^failures, capped at POLL_MAX_BACKOFF_HOURS.
+
+A board's first poll only sets a baseline and does not change its interval.
+Each delay gets +/-10% jitter, so boards on the same host drift apart.
+Polls run on a thread pool with the same global and per-host caps as a
+normal scrape.
+
+New postings are queued as soon as a poll finds them. After a short
+gathering window they are filtered, ranked and added to the pending digest.
+Every DIGEST_EVERY_HOURS the digest is delivered (saved and e-mailed) and
+cleared.
+
+Intervals, failures, queued postings and the pending digest are kept in
+DAEMON_STATE_PATH, so a restart continues where the daemon stopped. Postings
+stay queued until they are ranked; the LLM cache makes re-ranking after a
+crash cheap. A posting that fails to rank is retried with the next batch (at
+the latest after POLL_MIN_HOURS) and dropped after MAX_RANK_ATTEMPTS tries.
+
+The scheduler only knows about callables; main.py supplies them:
+  poll(board) -> (fresh jobs, churn)     scrape + job store sync
+  process(jobs) -> (rows, failed jobs)   filter, clean up, rank
+  deliver(rows)                          save results, send the e-mail
+"""
+import asyncio
+import json
+import os
+import random
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from models import Job
+
+QUIET_GROWTH = 1.5   # interval multiplier after a poll without churn
+JITTER = 0.1
+MAX_RANK_ATTEMPTS = 3   # tries before a posting that keeps failing to rank is dropped
+
+
+@dataclass
+class BoardState:
+    interval: float          # seconds between polls while healthy
+    next_poll: float = 0.0   # epoch seconds
+    failures: int = 0        # consecutive failed polls
+    polls: int = 0
+    last_churn: int = 0
+
+
+def _jitter(seconds: float) -> float:
+    return seconds * random.uniform(1 - JITTER, 1 + JITTER)
+
+
+def _fmt(seconds: float) -> str:
+    return f"{seconds / 60:.0f} min" if seconds < 5400 else f"{seconds / 3600:.1f}h"
+
+
+def _job_key(job: Job) -> str:
+    return f"{job.company}|{job.title}|{job.url}"
+
+
+def _job_to_dict(job: Job) -> Dict[str, str]:
+    return {"company": job.company, "title": job.title, "location": job.location,
+            "url": job.url, "description": job.description, "source_id": job.source_id}
+
+
+class Scheduler:
+    def __init__(
+        self,
+        boards: List[Dict[str, Any]],
+        poll: Callable[[Dict[str, Any]], Tuple[List[Job], int]],
+        process: Callable[[List[Job]], Tuple[List[Dict[str, Any]], List[Job]]],
+        deliver: Callable[[List[Dict[str, Any]]], None],
+        host_of: Callable[[Dict[str, Any]], str],
+        state_path: str = ".cache/daemon.json",
+        min_interval: float = 3600.0,
+        max_interval: float = 86400.0,
+        start_interval: float = 6 * 3600.0,
+        max_backoff: float = 2 * 86400.0,
+        digest_every: float = 86400.0,
+        batch_seconds: float = 60.0,
+        max_workers: int = 8,
+        per_host: int = 2,
+    ):
+        self.boards = boards
+        self.poll, self.process, self.deliver, self.host_of = poll, process, deliver, host_of
+        self.state_path = state_path
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.start_interval = start_interval
+        self.max_backoff = max_backoff
+        self.digest_every = digest_every
+        self.batch_seconds = batch_seconds
+        self.max_workers = max(1, max_workers)
+        self.per_host = max(1, per_host)
+
+        self.states: Dict[str, BoardState] = {}
+        self.queued: List[Job] = []                # found, not ranked yet
+        self.attempts: Dict[str, int] = {}         # failed rank attempts per queued posting
+        self.pending: List[Dict[str, Any]] = []    # ranked, not delivered yet
+        self.next_digest = time.time() + digest_every
+        self._load()
+
+    # ---- state -----------------------------------------------------------
+    def _load(self) -> None:
+        saved: Dict[str, Any] = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                saved = json.load(f)
+        now = time.time()
+        known = saved.get("boards", {})
+        for b in self.boards:
+            if b["name"] in known:
+                self.states[b["name"]] = BoardState(**known[b["name"]])
+                continue
+            hours = b.get("poll_hours")   # optional starting interval in boards.yaml
+            interval = min(self.max_interval, max(self.min_interval,
+                                                  hours * 3600 if hours else self.start_interval))
+            # spread first polls over the shortest interval rather than sweeping every board at once
+            self.states[b["name"]] = BoardState(interval, next_poll=now + random.uniform(0, self.min_interval))
+        self.queued = [Job(**j) for j in saved.get("queued", [])]
+        self.attempts = saved.get("attempts", {})
+        self.pending = saved.get("pending", [])
+        self.next_digest = saved.get("next_digest", self.next_digest)
+
+    def save(self) -> None:
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        data = {
+            "boards": {name: asdict(st) for name, st in self.states.items()},
+            "queued": [_job_to_dict(j) for j in self.queued],
+            "attempts": self.attempts,
+            "pending": self.pending,
+            "next_digest": self.next_digest,
+        }
+        with open(self.state_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(self.state_path + ".tmp", self.state_path)
+
+    def succeeded(self, name: str, churn: int) -> float:
+        """Adapt the board's interval to a successful poll; returns the delay to its next poll."""
+        st = self.states[name]
+        if st.polls:   # the first poll only sets the baseline
+            if churn:
+                st.interval = max(self.min_interval, st.interval / 2)
+            else:
+                st.interval = min(self.max_interval, st.interval * QUIET_GROWTH)
+        st.polls += 1
+        st.failures = 0
+        st.last_churn = churn
+        delay = _jitter(st.interval)
+        st.next_poll = time.time() + delay
+        return delay
+
+    def failed(self, name: str) -> float:
+        """Back off after a failed poll; returns the delay to the retry."""
+        st = self.states[name]
+        st.failures += 1
+        delay = _jitter(min(self.max_backoff, st.interval * 2 ** st.failures))
+        st.next_poll = time.time() + delay
+        return delay
+
+    # ---- loops -----------------------------------------------------------
+    async def _board_loop(self, b: Dict[str, Any]) -> None:
+        loop = asyncio.get_running_loop()
+        name = b["name"]
+        host = self._hosts[self.host_of(b)]
+        while True:
+            await asyncio.sleep(max(0.0, self.states[name].next_poll - time.time()))
+            async with self._slots, host:
+                try:
+                    fresh, churn = await loop.run_in_executor(self._pool, self.poll, b)
+                    error = None
+                except Exception as e:
+                    error = e
+            if error is None:
+                delay = self.succeeded(name, churn)
+                if fresh:
+                    self.queued.extend(fresh)
+                    self._work.set()
+                print(f"[INFO] {name}: {len(fresh)} new/changed, churn {churn}; next poll in {_fmt(delay)}")
+            else:
+                delay = self.failed(name)
+                print(f"[WARN] {name}: poll failed ({error}); retry {self.states[name].failures} in {_fmt(delay)}")
+            self.save()
+
+    def _requeue(self, jobs: List[Job], failed: List[Job]) -> None:
+        """Drop a processed batch from the queue, keeping failed postings for another try."""
+        retry = []
+        for job in failed:
+            key = _job_key(job)
+            self.attempts[key] = self.attempts.get(key, 0) + 1
+            if self.attempts[key] < MAX_RANK_ATTEMPTS:
+                retry.append(job)
+            else:
+                print(f"[WARN] Giving up on {job.title} @ {job.company} after {MAX_RANK_ATTEMPTS} failed rank attempts")
+        self.queued[:len(jobs)] = retry
+        live = {_job_key(j) for j in self.queued}
+        self.attempts = {k: n for k, n in self.attempts.items() if k in live}
+
+    async def _process_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._work.wait()
+            await asyncio.sleep(self.batch_seconds)   # let other boards' finds join the batch
+            self._work.clear()
+            jobs = list(self.queued)
+            try:
+                rows, failed = await loop.run_in_executor(self._worker, self.process, jobs)
+            except Exception as e:
+                print(f"[ERROR] Ranking {len(jobs)} new postings failed: {e}; retrying later")
+                rows, failed = [], jobs
+            self._requeue(jobs, failed)
+            self.pending.extend(rows)
+            self.save()
+            if failed and self.queued:
+                # retry with the next poll's batch, or after the shortest poll interval
+                loop.call_later(self.min_interval, self._work.set)
+
+    async def _digest_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(max(0.0, self.next_digest - time.time()))
+            self.next_digest = time.time() + self.digest_every
+            rows = list(self.pending)
+            if rows:
+                try:
+                    await loop.run_in_executor(self._worker, self.deliver, rows)
+                    del self.pending[:len(rows)]
+                    print(f"[INFO] Digest sent with {len(rows)} matches")
+                except Exception as e:
+                    print(f"[ERROR] Digest failed: {e}; keeping {len(rows)} matches for the next one")
+            else:
+                print("[INFO] No new matches for this digest")
+            self.save()
+
+    async def run(self, duration: Optional[float] = None) -> None:
+        """Poll until SIGINT/SIGTERM, or for `duration` seconds."""
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):   # Windows, or not the main thread
+                pass
+        if duration is not None:
+            loop.call_later(duration, stop.set)
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._worker = ThreadPoolExecutor(max_workers=1)   # ranking and delivery, one at a time
+        self._slots = asyncio.Semaphore(self.max_workers)
+        self._hosts = {h: asyncio.Semaphore(self.per_host) for h in {self.host_of(b) for b in self.boards}}
+        self._work = asyncio.Event()
+        if self.queued:
+            self._work.set()
+        tasks = [asyncio.create_task(self._board_loop(b)) for b in self.boards]
+        tasks += [asyncio.create_task(self._process_loop()), asyncio.create_task(self._digest_loop())]
+        soonest = min((st.next_poll for st in self.states.values()), default=time.time())
+        print(f"[INFO] Daemon polling {len(self.boards)} boards; first poll in "
+              f"{_fmt(max(0.0, soonest - time.time()))}, digest every {_fmt(self.digest_every)}")
+        try:
+            await stop.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._worker.shutdown(wait=True, cancel_futures=True)
+            self.save()
+            print(f"[INFO] Daemon stopped; {len(self.queued)} postings queued, "
+                  f"{len(self.pending)} matches pending")
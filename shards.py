@@ -0,0 +1,125 @@
+# shards.py
+"""
+Process-sharded scraping, for board lists too large for one runner.
+
+`python main.py scrape --shard-index I --shard-count N` scrapes boards I,
+I+N, I+2N, ... of boards.yaml and writes them to SHARD_DIR (default
+.cache/shards):
+
+  shard-I-of-N.parquet   the shard's jobs, as scraped
+  shard-I-of-N.workday   Workday tenant cache entries the shard changed
+                         (see workday_cache.py), applied by `merge`
+  shard-I-of-N.json      index, count, job count and qc_report; written
+                         last, so a shard without it did not finish
+
+Shards can run as separate processes or as CI matrix jobs whose SHARD_DIR
+is gathered onto one machine. `python main.py merge` then reads every
+finished shard, puts the jobs back in boards.yaml order, and continues with
+the job store, filtering, ranking and output like a normal run. Each board
+belongs to exactly one shard, so merging only reorders: the merged jobs are
+the same as a single-process scrape's for any shard count.
+
+The partition is round-robin in boards.yaml order, so shard sizes differ by
+at most one board. SCRAPE_MAX_WORKERS and SCRAPE_PER_HOST apply per shard:
+N shards may send up to N x SCRAPE_PER_HOST requests at once to a shared
+ATS host.
+"""
+import glob
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Sequence
+
+from checkpoints import JobWriter, read_job_file
+from models import Job
+
+
+def shard_boards(boards: Sequence[Dict[str, Any]], index: int, count: int) -> List[Dict[str, Any]]:
+    """The boards shard `index` of `count` scrapes."""
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Shard index must be in 0..{count - 1}, got {index}")
+    return list(boards[index::count])
+
+
+def shard_path(root: str, index: int, count: int) -> str:
+    """Path of a shard's files, without the extension."""
+    return os.path.join(root, f"shard-{index}-of-{count}")
+
+
+def write_shard(root: str, index: int, count: int, jobs: Sequence[Job], qc_report: Dict[str, int]) -> str:
+    """Save a shard's jobs, Workday cache changes and qc_report; returns the jobs file."""
+    from workday_cache import export_changes
+    os.makedirs(root, exist_ok=True)
+    base = shard_path(root, index, count)
+    export_changes(base + ".workday")
+    writer = JobWriter(base + ".parquet")
+    writer.write(jobs)
+    writer.close()
+    info = {"index": index, "count": count, "jobs": writer.count, "qc_report": qc_report,
+            "finished": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    with open(base + ".json.tmp", "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=2)
+    os.replace(base + ".json.tmp", base + ".json")
+    return base + ".parquet"
+
+
+def read_shards(root: str) -> List[Dict[str, Any]]:
+    """Manifests of the finished shards under `root`, by index."""
+    shards = []
+    for path in glob.glob(os.path.join(root, "shard-*-of-*.json")):
+        with open(path, encoding="utf-8") as f:
+            shards.append(json.load(f))
+    counts = {s["count"] for s in shards}
+    if len(counts) > 1:
+        raise ValueError(f"Shards under {root} come from different shard counts: {sorted(counts)}")
+    return sorted(shards, key=lambda s: s["index"])
+
+
+def import_workday_caches(root: str) -> int:
+    """Apply the shards' Workday cache changes to this machine's cache; returns how many."""
+    from workday_cache import import_changes
+    return import_changes(sorted(glob.glob(os.path.join(root, "shard-*-of-*.workday"))))
+
+
+def clear_shards(root: str) -> None:
+    for path in glob.glob(os.path.join(root, "shard-*-of-*.*")):
+        os.remove(path)
+
+
+@dataclass
+class MergeResult:
+    jobs: List[Job] = field(default_factory=list)
+    qc_report: Dict[str, int] = field(default_factory=dict)
+    shards: int = 0
+    missing: List[int] = field(default_factory=list)   # shard indexes that never finished
+
+    def summary(self) -> str:
+        text = f"{len(self.jobs)} jobs from {self.shards} shards"
+        if self.missing:
+            text += f", shards {', '.join(map(str, self.missing))} missing"
+        return text
+
+
+def merge_shards(root: str, boards: Sequence[Dict[str, Any]]) -> MergeResult:
+    """
+    Combine the finished shards under `root` as if one process had scraped
+    `boards`: jobs and qc_report in boards.yaml order. Missing shards are
+    reported, not fatal; their boards are left out of qc_report so the job
+    store won't close their postings.
+    """
+    shards = read_shards(root)
+    if not shards:
+        raise FileNotFoundError(f"No finished shards under {root}")
+    count = shards[0]["count"]
+    result = MergeResult(shards=len(shards),
+                         missing=sorted(set(range(count)) - {s["index"] for s in shards}))
+
+    order = {b["name"]: i for i, b in enumerate(boards)}
+    qc: Dict[str, int] = {}
+    for s in shards:
+        result.jobs.extend(read_job_file(shard_path(root, s["index"], count) + ".parquet")[0])
+        qc.update(s["qc_report"])
+    result.jobs.sort(key=lambda j: order.get(j.company, len(order)))   # stable: keeps each board's order
+    result.qc_report = {name: qc[name] for name in sorted(qc, key=lambda n: order.get(n, len(order)))}
+    return result
@@ -0,0 +1,133 @@
+# title_filter.py
+"""
+Compiled job-title matcher (replaces the substring scans in
+baseline_title_filter).
+
+Rules come from the `filter:` section of boards.yaml:
+
+    filter:
+      keywords: [data, ai, quant*, ...]   # whole words; trailing * = prefix
+      researcher_with: [data, quant*, ...] # "researcher" + any of these
+      include: [...]                       # always accept
+      exclude: [...]                       # always reject (checked first)
+
+Terms are matched on word boundaries, so "ai" no longer hits "maintenance"
+and "data" no longer hits "update". Each rule list compiles to one regex
+with a named group per term, and a whole job list is matched in one
+finditer pass over the joined titles.
+"""
+import re
+from bisect import bisect_right
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from models import Job
+
+DEFAULT_FILTER: Dict[str, List[str]] = {
+    "keywords": [
+        "data", "machine", "ml", "ai", "analytics", "insight*", "quant*", "science*",
+        "research scientist", "measurement", "psychometric*", "assessment*", "statistician*",
+    ],
+    "researcher_with": [
+        "data", "quant*", "ml", "ai", "analytics", "psychometric*", "assessment*",
+    ],
+    "include": [],
+    "exclude": [],
+}
+
+
+def _compile(terms: Iterable[str]) -> Tuple[Optional["re.Pattern[str]"], List[str]]:
+    """One regex (for lowercased text) with a named group per term."""
+    terms = [t.strip().lower() for t in terms if t and t.strip()]
+    if not terms:
+        return None, []
+    parts = []
+    for i, term in enumerate(terms):
+        prefix = term.endswith("*")
+        body = r"[ \t]+".join(re.escape(w) for w in term.rstrip("*").split())
+        parts.append(rf"(?P<t{i}>{body}{r'[a-z0-9]*' if prefix else ''})")
+    # word boundaries hoisted out of the alternation so non-boundary positions fail fast
+    return re.compile(r"\b(?:" + "|".join(parts) + r")\b"), terms
+
+
+class TitleMatcher:
+    def __init__(self, keywords: Iterable[str], researcher_with: Iterable[str] = (),
+                 include: Iterable[str] = (), exclude: Iterable[str] = ()):
+        self._keywords, self.keywords = _compile(keywords)
+        self._researcher_with, self.researcher_with = _compile(researcher_with)
+        self._include, self.include = _compile(include)
+        self._exclude, self.exclude = _compile(exclude)
+        self._researcher = re.compile(r"\bresearchers?\b")
+
+    @classmethod
+    def from_config(cls, cfg: Optional[Dict[str, Any]] = None) -> "TitleMatcher":
+        """Build from a boards.yaml `filter:` dict; missing keys use DEFAULT_FILTER."""
+        cfg = {**DEFAULT_FILTER, **(cfg or {})}
+        return cls(cfg["keywords"], cfg["researcher_with"], cfg["include"], cfg["exclude"])
+
+    def search_terms(self) -> List[str]:
+        """
+        Keyword and include terms usable as server-side search queries, so a
+        searched board can still return every title the filter accepts.
+        Wildcards lose their *: quant* only reaches "quantitative" if the
+        ATS does its own prefix matching.
+        """
+        return list(dict.fromkeys(t.rstrip("*") for t in self.keywords + self.include))
+
+    @staticmethod
+    def _first_hits(pattern, terms: List[str], text: str, starts: List[int]) -> Dict[int, str]:
+        """title index -> first term of `pattern` found in it."""
+        hits: Dict[int, str] = {}
+        if pattern is None:
+            return hits
+        for m in pattern.finditer(text):
+            idx = bisect_right(starts, m.start()) - 1
+            if idx not in hits:
+                hits[idx] = terms[int(m.lastgroup[1:])]
+        return hits
+
+    def match_titles(self, titles: List[str]) -> List[Optional[str]]:
+        """
+        Rule hit by each title: "include:<term>", "keyword:<term>" or
+        "researcher" when accepted, "exclude:<term>" when rejected by an
+        exclude rule, None when nothing matched.
+        """
+        clean = [(t or "").replace("\n", " ").lower() for t in titles]
+        text = "\n".join(clean)
+        starts, pos = [], 0
+        for t in clean:
+            starts.append(pos)
+            pos += len(t) + 1
+
+        excluded = self._first_hits(self._exclude, self.exclude, text, starts)
+        included = self._first_hits(self._include, self.include, text, starts)
+        keyword = self._first_hits(self._keywords, self.keywords, text, starts)
+        researcher = {bisect_right(starts, m.start()) - 1 for m in self._researcher.finditer(text)}
+        # co-occurrence only matters for the (few) researcher titles
+        co_word = {i for i in researcher
+                   if self._researcher_with is not None and self._researcher_with.search(clean[i])}
+
+        rules: List[Optional[str]] = []
+        for i in range(len(clean)):
+            if i in excluded:
+                rules.append(f"exclude:{excluded[i]}")
+            elif i in included:
+                rules.append(f"include:{included[i]}")
+            elif i in keyword:
+                rules.append(f"keyword:{keyword[i]}")
+            elif i in researcher and i in co_word:
+                rules.append("researcher")
+            else:
+                rules.append(None)
+        return rules
+
+    def match(self, title: str) -> bool:
+        rule = self.match_titles([title])[0]
+        return rule is not None and not rule.startswith("exclude:")
+
+    def filter(self, jobs: List[Job]) -> Tuple[List[Job], Dict[str, int]]:
+        """Jobs whose title passes, in input order, plus hit counts per rule."""
+        rules = self.match_titles([j.title for j in jobs])
+        kept = [j for j, r in zip(jobs, rules) if r and not r.startswith("exclude:")]
+        counts = Counter(r for r in rules if r)
+        return kept, dict(sorted(counts.items()))
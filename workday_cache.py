@@ -0,0 +1,123 @@
+# workday_cache.py
+"""
+Persistent per-tenant Workday capability cache.
+
+Remembers, per host/site, which request shape a tenant accepted so later pages
+and later runs skip the probing round trips:
+
+    {
+      "amplify.wd1.myworkdayjobs.com/Amplify_Careers": {
+        "payload": "expanded",          # "lean" or "expanded"
+        "limit": 20,                    # largest accepted page size
+        "applied_facets": {},           # appliedFacets sent with expanded payloads
+        "facets": ["locations", ...],   # facetParameter names the tenant exposes
+        "updated": "2026-01-01T00:00:00+00:00"
+      }
+    }
+
+A sharded scrape (see shards.py) exports the entries each shard changed with
+export_changes(); `merge` applies them with import_changes(), so tenants
+learned or dropped in a shard reach the cache the next run restores.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Set
+from urllib.parse import urlparse
+
+CACHE_PATH = os.getenv("WORKDAY_CACHE_PATH") or ".cache/workday_tenants.json"
+
+_lock = threading.Lock()
+_entries: Dict[str, Dict[str, Any]] = {}
+_loaded = False
+_changed: Set[str] = set()   # keys stored or dropped by this process
+
+
+def tenant_key(base_url: str) -> str:
+    """host/site key for an API URL from _build_workday_api_url."""
+    parsed = urlparse(base_url)
+    site = parsed.path.rstrip("/").split("/")[-2]   # .../wday/cxs/TENANT/SITE/jobs
+    return f"{parsed.netloc.lower()}/{site}"
+
+
+def _load() -> None:
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            _entries.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"[WARN] Ignoring unreadable Workday cache {CACHE_PATH}: {e}")
+
+
+def _save() -> None:
+    os.makedirs(os.path.dirname(CACHE_PATH) or ".", exist_ok=True)
+    tmp = f"{CACHE_PATH}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(_entries, f, indent=2, sort_keys=True)
+    os.replace(tmp, CACHE_PATH)
+
+
+def get_tenant_caps(key: str) -> Dict[str, Any]:
+    """Copy of the cached capabilities for a tenant ({} if unknown)."""
+    with _lock:
+        _load()
+        return dict(_entries.get(key, {}))
+
+
+def put_tenant_caps(key: str, caps: Dict[str, Any]) -> None:
+    """Store capabilities that just worked; no write if nothing changed."""
+    with _lock:
+        _load()
+        current = {k: v for k, v in _entries.get(key, {}).items() if k != "updated"}
+        fresh = {k: v for k, v in caps.items() if k != "updated"}
+        if current == fresh:
+            return
+        _entries[key] = {**fresh, "updated": datetime.now(timezone.utc).isoformat()}
+        _changed.add(key)
+        _save()
+
+
+def invalidate_tenant_caps(key: str) -> None:
+    """Forget a tenant whose stored request shape stopped working."""
+    with _lock:
+        _load()
+        if _entries.pop(key, None) is not None:
+            print(f"[WARN] Dropped cached Workday capabilities for {key}")
+            _changed.add(key)
+            _save()
+
+
+def export_changes(path: str) -> int:
+    """Write the entries this process stored or dropped (null) to `path`; returns how many."""
+    with _lock:
+        changes: Dict[str, Optional[Dict[str, Any]]] = {key: _entries.get(key) for key in _changed}
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(changes, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+    return len(changes)
+
+
+def import_changes(paths: Iterable[str]) -> int:
+    """Apply files from export_changes() to the cache; the newest entry wins. Returns how many applied."""
+    applied = 0
+    with _lock:
+        _load()
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                changes = json.load(f)
+            for key, entry in changes.items():
+                if entry is None:
+                    applied += _entries.pop(key, None) is not None
+                elif entry.get("updated", "") > _entries.get(key, {}).get("updated", ""):
+                    _entries[key] = entry
+                    applied += 1
+        if applied:
+            _save()
+    return applied
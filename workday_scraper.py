@@ -1,8 +1,18 @@
 # workday_scraper.py
-import requests
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from urllib.parse import urlparse, urljoin
-from models import Job
+from models import Job, PartialScrape
+from http_client import http_post
+from metrics import METRICS
+from workday_cache import get_tenant_caps, invalidate_tenant_caps, put_tenant_caps, tenant_key
+
+# Page sizes tried on the first request, largest first. Most tenants cap
+# `limit` at 20 and answer 400 above that; the first size that returns 200
+# is used for every remaining page.
+LIMIT_CANDIDATES = (100, 50, 20)
+PAGE_CAP = 50          # safety stop; adjust if a tenant truly has tons of jobs
+PAGE_WORKERS = 4       # pages fetched concurrently in parallel mode
 
 def _build_workday_api_url(public_url: str) -> str:
     """
@@ -26,90 +36,300 @@ def _build_workday_api_url(public_url: str) -> str:
     return f"https://{host}/wday/cxs/{tenant}/{site}/jobs", host
 
 
-def scrape_workday(public_url: str, name: str) -> List[Job]:
+def _payload(variant: str, offset: int, limit: int, caps: Dict[str, Any],
+             query: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    if query:
+        # searchText/appliedFacets only exist in the expanded shape
+        return {"appliedFacets": query.get("appliedFacets") or caps.get("applied_facets", {}),
+                "limit": limit, "offset": offset, "searchText": query.get("searchText", "")}
+    if variant == "expanded":
+        return {"appliedFacets": caps.get("applied_facets", {}), "limit": limit,
+                "offset": offset, "searchText": ""}
+    return {"limit": limit, "offset": offset}
+
+
+def _post_page(base_url: str, name: str, offset: int, limit: int, caps: Dict[str, Any],
+               query: Optional[Dict[str, Any]] = None):
     """
-    Generic Workday scraper with:
-      - robust API URL building
-      - 422 auto-retry with expanded payload
-      - duplicate detection to avoid infinite loops
-      - page cap safety
-      - debug logging
+    POST one page using the payload variant in `caps` (lean by default).
+    On 422 the other variant is tried once; if it works, `caps` is updated so
+    later pages (and the persisted cache) go straight to it. Search queries
+    always use the expanded payload and are not retried.
     """
-    jobs: List[Job] = []
-    seen_ids = set()
-    page_cap = 50        # safety stop; adjust if a tenant truly has tons of jobs
-    offset, limit = 0, 20
-    pages = 0
+    variant = "expanded" if query else caps.get("payload", "lean")
+    payload = _payload(variant, offset, limit, caps, query)
+    print(f"[DEBUG] Requesting {name} jobs (offset={offset}, limit={limit})")
+    print(f"[DEBUG] POST {base_url} payload={payload}")
+    r = http_post(base_url, json=payload, timeout=30)
+    if query:
+        return r
 
-    try:
-        base_url, host = _build_workday_api_url(public_url)
+    if r.status_code == 422:
+        other = "lean" if variant == "expanded" else "expanded"
+        payload = _payload(other, offset, limit, caps)
+        print(f"[WARN] 422 from {name}. Retrying with {other} payload: {payload}")
+        r = http_post(base_url, json=payload, timeout=30)
+        if r.status_code == 200:
+            caps["payload"] = other
+    elif r.status_code == 200:
+        caps.setdefault("payload", variant)
+    return r
 
-        while True:
-            # Start with lean payload; some tenants require expanded payload.
-            payload = {"limit": limit, "offset": offset}
-            print(f"[DEBUG] Requesting {name} jobs (offset={offset}, limit={limit})")
-            print(f"[DEBUG] POST {base_url} payload={payload}")
-            r = requests.post(base_url, json=payload, timeout=30)
-
-            # Auto-retry on 422 with expanded payload
-            if r.status_code == 422:
-                payload = {"appliedFacets": {}, "limit": limit, "offset": offset, "searchText": ""}
-                print(f"[WARN] 422 from {name}. Retrying with expanded payload: {payload}")
-                r = requests.post(base_url, json=payload, timeout=30)
-
-            if r.status_code != 200:
-                # show a slice of body for easier debugging
-                body = r.text[:300].replace("\n", " ")
-                print(f"[ERROR] Workday request failed for {name}: {r.status_code} {body}")
-                break
 
-            data = r.json()
-            postings = data.get("jobPostings", [])
-            print(f"[DEBUG] {name}: received {len(postings)} postings at offset={offset}")
+def _page_postings(r, name: str, offset: int) -> Optional[List[Dict[str, Any]]]:
+    """Postings from a page response, or None if the request failed."""
+    if r.status_code != 200:
+        # show a slice of body for easier debugging
+        body = r.text[:300].replace("\n", " ")
+        print(f"[ERROR] Workday request failed for {name}: {r.status_code} {body}")
+        return None
+    postings = r.json().get("jobPostings", [])
+    print(f"[DEBUG] {name}: received {len(postings)} postings at offset={offset}")
+    return postings
 
-            if not postings:
-                break
 
-            new_jobs = 0
-            for i, p in enumerate(postings):
-                # Choose a stable unique key
-                job_id = p.get("externalPath") or p.get("id") or f"{p.get('title')}|{p.get('locationsText')}"
-                if job_id in seen_ids:
-                    continue
-                seen_ids.add(job_id)
-
-                title = p.get("title", "") or ""
-                location = p.get("locationsText", "") or ""
-                job_url = urljoin(f"https://{host}/", p.get("externalPath", ""))
-                descr = " • ".join(p.get("bulletFields", [])) or "No description."
-
-                jobs.append(Job(
-                    company=name,
-                    title=title,
-                    location=location,
-                    url=job_url,
-                    description=descr,
-                    raw=p
-                ))
-                new_jobs += 1
+def _collect(postings: List[Dict[str, Any]], host: str, name: str, offset: int,
+             seen_ids: Set[str], jobs: List[Job], query_ids: Set[str]) -> int:
+    """
+    Append postings not yet in `seen_ids` to `jobs`. Returns how many postings
+    were new to this query (`query_ids`), which drives the recycled-page stop
+    even when an earlier search term already yielded the same jobs.
+    """
+    new_jobs = 0
+    for i, p in enumerate(postings):
+        # Choose a stable unique key
+        job_id = p.get("externalPath") or p.get("id") or f"{p.get('title')}|{p.get('locationsText')}"
+        if job_id in query_ids:
+            continue
+        query_ids.add(job_id)
+        new_jobs += 1
+        if job_id in seen_ids:
+            continue
+        seen_ids.add(job_id)
+
+        title = p.get("title", "") or ""
+        location = p.get("locationsText", "") or ""
+        job_url = urljoin(f"https://{host}/", p.get("externalPath", ""))
+        descr = " • ".join(p.get("bulletFields", [])) or "No description."
+
+        jobs.append(Job(
+            company=name,
+            title=title,
+            location=location,
+            url=job_url,
+            description=descr,
+            raw=p,
+            source_id=job_id
+        ))
+
+        # Light QC for first page
+        if offset == 0 and i < 3:
+            print(f"[DEBUG] Parsed job: {title} ({location})")
+    return new_jobs
+
+
+def _first_page(base_url: str, name: str, caps: Dict[str, Any],
+                query: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Dict[str, Any]], int, int]:
+    """
+    Fetch offset 0 with the largest page size the tenant accepts, starting
+    from the cached size when there is one. Returns (response JSON or None,
+    accepted limit, status code of the last response).
+    """
+    candidates = list(LIMIT_CANDIDATES)
+    if caps.get("limit") in candidates:
+        candidates = candidates[candidates.index(caps["limit"]):]
+    for limit in candidates:
+        r = _post_page(base_url, name, 0, limit, caps, query)
+        if r.status_code == 200:
+            caps["limit"] = limit
+            return r.json(), limit, r.status_code
+        if limit != candidates[-1] and r.status_code in (400, 422):
+            print(f"[DEBUG] {name}: limit={limit} rejected ({r.status_code}), trying smaller page")
+            continue
+        _page_postings(r, name, 0)  # logs the failure
+        return None, limit, r.status_code
+    return None, candidates[-1], 0
+
+
+def _scrape_query(base_url: str, host: str, name: str, caps: Dict[str, Any],
+                  seen_ids: Set[str], parallel: bool, workers: int,
+                  query: Optional[Dict[str, Any]] = None):
+    """
+    Page through one listing (the full board, or one search query), yielding
+    each page's new jobs as a list. The generator's return value is
+    (first page's JSON or None if it failed, its status code). Raises
+    PartialScrape when a later page fails or the page cap cuts the listing
+    short.
+    """
+    query_ids: Set[str] = set()
+    if query:
+        print(f"[DEBUG] {name}: server-side query {query}")
+
+    data, limit, status = _first_page(base_url, name, caps, query)
+    if data is None:
+        return None, status
+
+    postings = data.get("jobPostings", [])
+    print(f"[DEBUG] {name}: received {len(postings)} postings at offset=0")
+    jobs: List[Job] = []
+    fresh = _collect(postings, host, name, 0, seen_ids, jobs, query_ids) if postings else 0
+    if jobs:
+        yield jobs
+    if fresh == 0:
+        return data, status
 
-                # Light QC for first page
-                if offset == 0 and i < 3:
-                    print(f"[DEBUG] Parsed job: {title} ({location})")
+    total = int(data.get("total") or 0)
+    # offsets still to fetch in parallel mode (page one already done)
+    offsets = list(range(limit, min(total, PAGE_CAP * limit), limit))
+    if total > PAGE_CAP * limit:
+        print(f"[WARN] {name} reports {total} jobs; page cap ({PAGE_CAP}) stops at {PAGE_CAP * limit}.")
 
+    if parallel and total and offsets:
+        print(f"[DEBUG] {name}: total={total}, fetching {len(offsets)} more pages "
+              f"({workers} at a time, limit={limit})")
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for start in range(0, len(offsets), workers):
+                wave = offsets[start:start + workers]
+                # bind: the pool's threads count their requests under this board
+                responses = list(pool.map(
+                    METRICS.bind(lambda o: _post_page(base_url, name, o, limit, caps, query)), wave
+                ))
+                for offset, r in zip(wave, responses):
+                    page = _page_postings(r, name, offset)
+                    if page is None:
+                        raise PartialScrape(f"page at offset {offset} failed")
+                    if not page:
+                        return data, status
+                    jobs = []
+                    fresh = _collect(page, host, name, offset, seen_ids, jobs, query_ids)
+                    if jobs:
+                        yield jobs
+                    # If this page produced no unique jobs, stop to avoid looping on recycled pages
+                    if fresh == 0:
+                        print(f"[DEBUG] No new unique postings at offset={offset}. Breaking.")
+                        return data, status
+        if total > PAGE_CAP * limit:
+            raise PartialScrape(f"page cap ({PAGE_CAP}) reached")
+    else:
+        # Sequential paging; bounded by total when the tenant reports one.
+        offset, pages = limit, 1
+        while not total or offset < total:
+            page = _page_postings(_post_page(base_url, name, offset, limit, caps, query), name, offset)
+            if page is None:
+                raise PartialScrape(f"page at offset {offset} failed")
+            if not page:
+                break
+            jobs = []
+            fresh = _collect(page, host, name, offset, seen_ids, jobs, query_ids)
+            if jobs:
+                yield jobs
             # If this page produced no unique jobs, stop to avoid looping on recycled pages
-            if new_jobs == 0:
+            if fresh == 0:
                 print(f"[DEBUG] No new unique postings at offset={offset}. Breaking.")
                 break
-
             offset += limit
             pages += 1
-            if pages >= page_cap:
-                print(f"[WARN] Hit page cap ({page_cap}) for {name}. Stopping to avoid overfetch.")
-                break
+            if pages >= PAGE_CAP:
+                print(f"[WARN] Hit page cap ({PAGE_CAP}) for {name}. Stopping to avoid overfetch.")
+                raise PartialScrape(f"page cap ({PAGE_CAP}) reached")
+    return data, status
 
-    except Exception as e:
-        print(f"[ERROR] Workday scrape failed for {name}: {e}")
 
+def scrape_workday(public_url: str, name: str, parallel: bool = True,
+                   workers: int = PAGE_WORKERS, search: Optional[List[str]] = None,
+                   facets: Optional[Dict[str, List[str]]] = None) -> List[Job]:
+    """List form of iter_workday(); raises PartialScrape like it."""
+    jobs = [job for page in iter_workday(public_url, name, parallel, workers, search, facets)
+            for job in page]
     print(f"[INFO] Scraped {len(jobs)} jobs from {name} (Workday)")
     return jobs
+
+
+def iter_workday(public_url: str, name: str, parallel: bool = True,
+                 workers: int = PAGE_WORKERS, search: Optional[List[str]] = None,
+                 facets: Optional[Dict[str, List[str]]] = None) -> Iterator[List[Job]]:
+    """
+    Generic Workday scraper, yielding new jobs page by page, with:
+      - robust API URL building
+      - largest accepted page size, probed on the first page
+      - 422 auto-retry with expanded payload
+      - per-tenant capability cache (payload shape, page size, facets)
+      - parallel paging driven by the `total` reported on page one
+      - optional server-side search (searchText per term, appliedFacets)
+      - duplicate detection to avoid infinite loops
+      - page cap safety
+      - debug logging
+
+    With parallel=True the remaining offsets are fetched `workers` pages at a
+    time. Each wave is still processed in offset order, so seen_ids dedup and
+    the stop on recycled pages behave as in the sequential mode; at most one
+    wave is over-fetched. Tenants that report no total fall back to
+    sequential paging.
+
+    `search` terms are sent one query each and merged by job ID; `facets`
+    (facetParameter -> IDs) go out as appliedFacets. If the tenant rejects a
+    search query, the full board is fetched instead (already-yielded jobs are
+    not repeated) and the local title filter does the narrowing.
+
+    If any page or query fails, the remaining queries still run and
+    PartialScrape is raised at the end, so the board's unseen postings are
+    not closed. Capabilities learned along the way (a payload switch on a
+    later page, say) are saved even then; cached ones are only dropped when
+    the tenant rejects the request shape (400/422), not on a timeout or 5xx.
+    """
+    seen_ids: Set[str] = set()
+    partial: Optional[PartialScrape] = None
+
+    if search:
+        queries = [{"searchText": term, "appliedFacets": facets or {}} for term in search]
+    elif facets:
+        queries = [{"searchText": "", "appliedFacets": facets}]
+    else:
+        queries = [None]
+
+    try:
+        base_url, host = _build_workday_api_url(public_url)
+        key = tenant_key(base_url)
+        cached = get_tenant_caps(key)
+        caps = dict(cached)
+
+        try:
+            for query in queries:
+                try:
+                    data, status = yield from _scrape_query(base_url, host, name, caps, seen_ids,
+                                                            parallel, workers, query)
+                except PartialScrape as e:
+                    partial = e
+                    continue
+                if data is None and query is not None:
+                    print(f"[WARN] {name} rejected server-side query; fetching full board instead.")
+                    query = None
+                    data, status = yield from _scrape_query(base_url, host, name, caps, seen_ids,
+                                                            parallel, workers)
+
+                if data is None:
+                    if cached and status in (400, 422):
+                        # Stored shape stopped working; re-probe next run.
+                        invalidate_tenant_caps(key)
+                        caps = {}
+                    raise PartialScrape(f"listing request failed ({status or 'no response'})")
+
+                caps["facets"] = sorted(
+                    f.get("facetParameter") for f in data.get("facets", []) if f.get("facetParameter")
+                ) or caps.get("facets", [])
+                caps.setdefault("applied_facets", {})
+
+                if query is None:
+                    break
+        finally:
+            # whatever worked is saved, even when a later page or query failed
+            if caps.get("limit"):
+                put_tenant_caps(key, caps)
+
+    except PartialScrape:
+        raise
+    except Exception as e:
+        print(f"[ERROR] Workday scrape failed for {name}: {e}")
+        raise PartialScrape(str(e)) from e
+    if partial is not None:
+        raise partial